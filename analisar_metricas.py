@@ -1,132 +1,579 @@
 """
 SCRIPT DE ANÁLISE DE MÉTRICAS - VERSÃO SIMPLIFICADA
 Calcula as 5 métricas essenciais: MAE, RMSE, QWK, Acurácia Exata, Acurácia Adjacente
+para a nota total e para cada uma das 5 competências
+
+As notas são carregadas uma vez em matrizes NumPy (n, 5) e todas as métricas
+das 6 escalas (total + C1..C5) saem de uma única passada vetorizada; o QWK
+é calculado pela matriz de confusão, sem scikit-learn.
+
+A nota total (real e predita) é a soma das 5 notas por competência, e não os
+campos nota_real / nota_final dos registros: as duas coincidem nos resultados
+do pipeline (nota_final é sempre recalculada como a soma) e, se a nota_real
+de um registro divergir da soma, matrizes_notas avisa.
 
 Compara:
 - RAG vs Ground Truth
 - Baseline vs Ground Truth
+- Com --arquivos: qualquer número de arquivos de resultados (modelos, variantes
+  de prompt, recuperação...) alinhados por (prompt_id, redacao_index)
 
 Uso:
     python analisar_metricas.py --prompt 3
     python analisar_metricas.py --prompt 6
     python analisar_metricas.py --prompt 3 --export resultados_prompt3.csv
+    python analisar_metricas.py --prompt 3 --variante-rag rag_trechos
+    python analisar_metricas.py --prompt 3 --reamostras 20000 --processos 4
+    python analisar_metricas.py --arquivos "resultados_experimento/resultados_prompt3_*.json" --export-metricas metricas.csv
 """
 
 import json
-import numpy as np
-import pandas as pd
 from pathlib import Path
 import argparse
-from sklearn.metrics import cohen_kappa_score, mean_absolute_error
+
+# numpy e pandas são importados nas funções que os usam: --help e erros de
+# argumento não pagam o tempo de importação dessas bibliotecas
+
+METRICAS = ('MAE', 'RMSE', 'QWK', 'Acurácia_Exata', 'Acurácia_Adjacente')
+
+# Colunas das matrizes de métricas: nota total e as 5 competências
+ESCALAS = ('Total', 'Comp1', 'Comp2', 'Comp3', 'Comp4', 'Comp5')
+
+COMPETENCIAS = [
+    'C1 (Gramática)',
+    'C2 (Estrutura)',
+    'C3 (Argumentação)',
+    'C4 (Coesão)',
+    'C5 (Proposta)',
+]
+
+# Notas em níveis de 40 pontos: 0-5 por competência, 0-25 na nota total
+PASSO_NIVEL = 40
+NIVEIS_TOTAL = 26
 
 
 def carregar_resultados(arquivo):
-    """Carrega arquivo JSON de resultados"""
+    """
+    Carrega arquivo JSON de resultados
+    
+    Raises:
+        ValueError: Se o arquivo não for JSON ou não for uma lista de
+            registros de resultados (dicts com redacao_index)
+    """
     with open(arquivo, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        try:
+            resultados = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{arquivo}: JSON inválido ({e})") from e
+    if not isinstance(resultados, list) or not all(
+        isinstance(r, dict) and 'redacao_index' in r for r in resultados
+    ):
+        raise ValueError(f"{arquivo}: não é um arquivo de resultados (lista de registros com redacao_index)")
+    return resultados
 
 
-def extrair_notas(resultados):
-    """Extrai notas reais e preditas dos resultados"""
-    dados = []
+def matrizes_notas(resultados, com_prompt=False):
+    """
+    Carrega as notas dos resultados com sucesso em matrizes NumPy
+    
+    Registros sem avaliação ou sem alguma das 5 notas (reais ou preditas)
+    são ignorados, com aviso; matrizes_da_tabela faz o mesmo na tabela colunar.
+    
+    Args:
+        resultados: Registros de um arquivo de resultados
+        com_prompt: Identifica cada redação por (prompt_id, redacao_index)
     
+    Returns:
+        (indices (n,) ou, com com_prompt, chaves (n, 2), notas reais (n, 5),
+        notas preditas (n, 5))
+    """
+    import numpy as np
+    
+    indices, reais, preditas = [], [], []
     for r in resultados:
-        if r['status'] == 'sucesso':
-            av = r['avaliacao_sistema']
-            
-            # Verificar se avaliacao_sistema não é None
-            if av is None:
-                print(f"⚠️  Aviso: redacao_index {r['redacao_index']} tem avaliacao_sistema NULL")
-                continue
-            
-            dados.append({
-                'index': r['redacao_index'],
-                'nota_real': r['nota_real'],
-                'nota_pred': av['nota_final'],
-                'comp1_real': r['competencias_reais'][0],
-                'comp1_pred': av['competencias']['competencia_1']['nota'],
-                'comp2_real': r['competencias_reais'][1],
-                'comp2_pred': av['competencias']['competencia_2']['nota'],
-                'comp3_real': r['competencias_reais'][2],
-                'comp3_pred': av['competencias']['competencia_3']['nota'],
-                'comp4_real': r['competencias_reais'][3],
-                'comp4_pred': av['competencias']['competencia_4']['nota'],
-                'comp5_real': r['competencias_reais'][4],
-                'comp5_pred': av['competencias']['competencia_5']['nota'],
-            })
-    
-    return pd.DataFrame(dados)
+        if r.get('status') != 'sucesso':
+            continue
+        av = r.get('avaliacao_sistema')
+        
+        # Verificar se avaliacao_sistema não é None
+        if av is None:
+            print(f"⚠️  Aviso: redacao_index {r.get('redacao_index')} tem avaliacao_sistema NULL")
+            continue
+        
+        try:
+            competencias = av['competencias']
+            notas = [competencias[f'competencia_{i}']['nota'] for i in range(1, 6)]
+        except (KeyError, TypeError):
+            notas = [None]
+        if any(nota is None for nota in notas):
+            print(f"⚠️  Aviso: redacao_index {r.get('redacao_index')} sem as 5 notas - ignorada")
+            continue
+        notas_reais = (r.get('competencias_reais') or [])[:5]
+        if len(notas_reais) < 5 or any(nota is None for nota in notas_reais):
+            print(f"⚠️  Aviso: redacao_index {r.get('redacao_index')} sem as 5 notas reais - ignorada")
+            continue
+        preditas.append(notas)
+        reais.append(notas_reais)
+        if r.get('nota_real') is not None and r['nota_real'] != sum(reais[-1]):
+            print(f"⚠️  Aviso: redacao_index {r.get('redacao_index')} tem nota_real {r['nota_real']} "
+                  f"diferente da soma das competências ({sum(reais[-1])}) - usada a soma")
+        indices.append((r.get('prompt_id') or 0, r['redacao_index']) if com_prompt else r['redacao_index'])
+    
+    return (
+        np.asarray(indices, dtype=np.int64).reshape(-1, 2) if com_prompt else np.asarray(indices, dtype=np.int64),
+        np.asarray(reais, dtype=np.int64).reshape(-1, 5),
+        np.asarray(preditas, dtype=np.int64).reshape(-1, 5),
+    )
 
 
-def calcular_metricas_gerais(df, prefixo=''):
+def matrizes_da_tabela(tabela, com_prompt=False):
+    """
+    Matrizes de notas a partir da tabela colunar (ver matrizes_notas)
+    
+    Args:
+        tabela: Tabela Arrow com as colunas COLUNAS_NOTAS de resultados_colunares
+        com_prompt: Identifica cada redação por (prompt_id, redacao_index)
     """
-    Calcula as 5 métricas essenciais para nota total
+    import numpy as np
+    import pyarrow.compute as pc
+    
+    def coluna(nome):
+        return tabela.column(nome).fill_null(0).to_numpy()
+    
+    def completas(tipo):
+        validas = np.ones(len(tabela), dtype=bool)
+        for i in range(1, 6):
+            validas &= tabela.column(f'comp{i}_{tipo}').is_valid().to_numpy(zero_copy_only=False)
+        return validas
+    
+    # Linhas sem alguma nota saem com aviso, como em matrizes_notas: os nulos
+    # preenchidos por coluna() nunca chegam às métricas
+    sucesso = pc.equal(tabela.column('status').cast('string'), 'sucesso').fill_null(False).to_numpy(zero_copy_only=False)
+    preditas_completas = completas('pred')
+    reais_completas = completas('real')
+    
+    indices = coluna('redacao_index').astype(np.int64)
+    for indice in indices[sucesso & ~preditas_completas]:
+        print(f"⚠️  Aviso: redacao_index {indice} sem as 5 notas - ignorada")
+    for indice in indices[sucesso & preditas_completas & ~reais_completas]:
+        print(f"⚠️  Aviso: redacao_index {indice} sem as 5 notas reais - ignorada")
+    
+    linhas = sucesso & preditas_completas & reais_completas
+    reais = np.column_stack([coluna(f'comp{i}_real') for i in range(1, 6)]).astype(np.int64)
+    preditas = np.column_stack([coluna(f'comp{i}_pred') for i in range(1, 6)]).astype(np.int64)
+    if com_prompt:
+        indices = np.column_stack([coluna('prompt_id').astype(np.int64), indices])
+    return indices[linhas], reais[linhas], preditas[linhas]
+
+
+def localizar_resultados(arquivo):
+    """O próprio arquivo JSON ou, se só existir a tabela colunar, o .parquet"""
+    arquivo = Path(arquivo)
+    colunar = arquivo.with_suffix('.parquet')
+    return colunar if not arquivo.exists() and colunar.exists() else arquivo
+
+
+def carregar_matrizes(arquivo, com_prompt=False, gravar_colunar=False):
+    """
+    Carrega as notas de um arquivo de resultados (.json ou .parquet)
+    
+    Usa a tabela colunar quando existe e está atualizada, lendo só as colunas
+    de notas; senão lê o JSON. A análise não grava nada, a menos que
+    gravar_colunar peça para gravar a tabela para as próximas análises.
+    
+    Returns:
+        (total de registros, indices ou chaves, reais (n, 5), preditas (n, 5))
+    """
+    from avaliacao_automatica.resultados_colunares import COLUNAS_NOTAS, atualizar_colunar, ler_colunas
+    
+    tabela = ler_colunas(arquivo, COLUNAS_NOTAS)
+    if tabela is not None:
+        return (len(tabela), *matrizes_da_tabela(tabela, com_prompt))
+    if Path(arquivo).suffix == '.parquet':
+        raise RuntimeError(f"{arquivo}: leitura de .parquet requer o pyarrow e RESULTADOS_COLUNARES habilitado")
+    
+    resultados = carregar_resultados(arquivo)
+    if gravar_colunar:
+        atualizar_colunar(arquivo, resultados)
+    return (len(resultados), *matrizes_notas(resultados, com_prompt))
+
+
+def extrair_notas(resultados):
+    """Extrai notas reais e preditas dos resultados (DataFrame para exportação)"""
+    return tabela_notas(*matrizes_notas(resultados))
+
+
+def tabela_notas(indices, reais, preditas):
+    """DataFrame com as colunas index, nota_real/pred e comp{i}_real/pred"""
+    import pandas as pd
+    
+    colunas = {
+        'index': indices,
+        'nota_real': reais.sum(axis=1),
+        'nota_pred': preditas.sum(axis=1),
+    }
+    for i in range(5):
+        colunas[f'comp{i + 1}_real'] = reais[:, i]
+        colunas[f'comp{i + 1}_pred'] = preditas[:, i]
+    return pd.DataFrame(colunas)
+
+
+def qwk_matriz_confusao(niveis_reais, niveis_pred, num_niveis):
+    """
+    Quadratic Weighted Kappa de várias escalas de uma vez
+    
+    Como no cohen_kappa_score do scikit-learn, o peso da célula (i, j) da
+    matriz de confusão é (posição de i - posição de j)², com as posições
+    contadas entre os níveis presentes na escala (real ou predito). As
+    somas ponderadas das matrizes observada e esperada são expandidas em
+    termos das marginais:
+    
+        Σ w·O = Σ (x - y)²          Σ w·E = Σ x² + Σ y² - 2·(Σ x)(Σ y)/n
+    
+    (x, y = posições do nível real e do predito de cada redação), então só
+    os histogramas de níveis de cada escala são montados: O(n) por escala,
+    sem as matrizes num_niveis x num_niveis.
+    
+    Args:
+        niveis_reais, niveis_pred: Matrizes (k, n) de níveis inteiros, uma
+            linha por escala
+        num_niveis: Número de níveis possíveis (0 a num_niveis - 1)
+    
+    Returns:
+        Array (k,) com o QWK de cada escala (nan se indefinido)
+    """
+    import numpy as np
+    
+    k, n = niveis_reais.shape
+    niveis_reais = np.clip(niveis_reais, 0, num_niveis - 1)
+    niveis_pred = np.clip(niveis_pred, 0, num_niveis - 1)
+    posicao = posicoes_niveis(num_niveis, niveis_reais, niveis_pred)
+    linhas = np.arange(k)[:, None]
+    x = posicao[linhas, niveis_reais]
+    y = posicao[linhas, niveis_pred]
+    
+    diferenca = x - y
+    return _kappa_de_somas(
+        np.einsum('ij,ij->i', diferenca, diferenca),
+        x.sum(axis=1), y.sum(axis=1),
+        np.einsum('ij,ij->i', x, x), np.einsum('ij,ij->i', y, y),
+        n
+    )
+
+
+def _kappa_de_somas(discordancia, soma_x, soma_y, soma_x2, soma_y2, n):
+    """QWK a partir das somas das posições (ver qwk_matriz_confusao); nan se indefinido"""
+    import numpy as np
+    
+    esperado = soma_x2 + soma_y2 - 2 * soma_x * soma_y / max(n, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(esperado > 1e-9, 1 - discordancia / esperado, np.nan)
+
+
+def posicoes_niveis(num_niveis, *matrizes_niveis):
+    """
+    Posição de cada nível entre os níveis presentes, escala a escala
+    
+    Args:
+        num_niveis: Número de níveis possíveis (0 a num_niveis - 1)
+        *matrizes_niveis: Matrizes (k, n) de níveis, uma linha por escala;
+            um nível conta como presente se aparece em qualquer delas
+    
+    Returns:
+        Array (k, num_niveis) float64 com a posição de cada nível
+    """
+    import numpy as np
+    
+    k = matrizes_niveis[0].shape[0]
+    deslocamento = (np.arange(k) * num_niveis)[:, None]
+    presentes = np.zeros(k * num_niveis, dtype=bool)
+    for niveis in matrizes_niveis:
+        presentes |= np.bincount((niveis + deslocamento).ravel(), minlength=k * num_niveis) > 0
+    return np.cumsum(presentes.reshape(k, num_niveis), axis=1, dtype=np.float64)
+
+
+def _por_escala(notas):
+    """
+    Matriz (6, n): nota total na linha 0 e competências nas linhas 1-5
+    
+    A nota total é a soma das competências (ver docstring do módulo).
+    
+    Uma linha contígua por escala deixa as reduções de cada métrica
+    sequenciais na memória (bem mais rápidas que ao longo das colunas).
+    """
+    import numpy as np
+    
+    notas = np.asarray(notas)
+    escalas = np.empty((6, notas.shape[0]), dtype=np.int32)
+    escalas[1:] = notas.T
+    escalas[1:].sum(axis=0, out=escalas[0])
+    return escalas
+
+
+def calcular_metricas(reais, preditas):
+    """
+    Calcula as 5 métricas para a nota total e as 5 competências de uma vez
     
     Métricas:
     1. MAE - Mean Absolute Error
     2. RMSE - Root Mean Squared Error
-    3. QWK - Quadratic Weighted Kappa
+    3. QWK - Quadratic Weighted Kappa (níveis de 40 pontos)
     4. Acurácia Exata - Exact Match
     5. Acurácia Adjacente - Adjacent Match (±40 pontos)
+    
+    Args:
+        reais, preditas: Matrizes (n, 5) de notas por competência
+    
+    Returns:
+        Dict métrica -> array (6,) na ordem de ESCALAS (total, C1..C5)
+    """
+    return metricas_por_linha(_por_escala(reais), _por_escala(preditas))
+
+
+def metricas_por_linha(reais, preditas):
     """
-    notas_reais = df['nota_real'].values
-    notas_pred = df['nota_pred'].values
+    Calcula as 5 métricas de cada linha de matrizes (m, n) de notas
     
-    # 1. MAE - Erro Médio Absoluto
-    mae = mean_absolute_error(notas_reais, notas_pred)
+    Cada linha é uma escala de uma amostra (ex: as 6 escalas de
+    _por_escala, ou as de várias amostras empilhadas); todas saem da mesma
+    passada.
     
-    # 2. RMSE - Raiz do Erro Quadrático Médio
-    rmse = np.sqrt(np.mean((notas_pred - notas_reais) ** 2))
+    Returns:
+        Dict métrica -> array (m,)
+    """
+    import numpy as np
+    
+    erro = preditas - reais
+    erro_abs = np.abs(erro)
+    
+    # Níveis de 40 pontos (0-5 por competência, 0-25 na nota total)
+    niveis_reais = (reais // PASSO_NIVEL).astype(np.int16)
+    niveis_pred = (preditas // PASSO_NIVEL).astype(np.int16)
+    
+    return {
+        'MAE': erro_abs.mean(axis=1),
+        'RMSE': np.sqrt(np.square(erro, dtype=np.float64).mean(axis=1)),
+        'QWK': qwk_matriz_confusao(niveis_reais, niveis_pred, NIVEIS_TOTAL),
+        'Acurácia_Exata': (erro == 0).mean(axis=1),
+        'Acurácia_Adjacente': (erro_abs <= PASSO_NIVEL).mean(axis=1),
+    }
+
+
+# Estatísticas aditivas de cada redação, por escala: as métricas de qualquer
+# subconjunto (ou reamostra) das redações saem das somas destas colunas
+ESTATISTICAS = ('erro_abs', 'erro_quad', 'exata', 'adjacente', 'x', 'y', 'x2', 'y2', 'discordancia')
+
+
+def estatisticas_por_redacao(reais, preditas, posicao):
+    """
+    Estatísticas aditivas de cada redação (ver ESTATISTICAS e metricas_de_somas)
     
-    # 3. QWK - Quadratic Weighted Kappa
-    # Converter notas para níveis (escala de 40 pontos: 0-25 níveis)
-    niveis_reais = notas_reais // 40
-    niveis_pred = notas_pred // 40
-    qwk = cohen_kappa_score(niveis_reais, niveis_pred, weights='quadratic')
+    Args:
+        reais, preditas: Matrizes (6, n) de _por_escala
+        posicao: Posições dos níveis (6, NIVEIS_TOTAL) de posicoes_niveis; x e y
+            são as posições dos níveis real e predito, usadas no QWK
     
-    # 4. Acurácia Exata (Exact Match)
-    acuracia_exata = np.mean(notas_pred == notas_reais)
+    Returns:
+        Matriz (n, 6 * len(ESTATISTICAS)) float64, escala a escala
+    """
+    import numpy as np
+    
+    erro = (preditas - reais).astype(np.float64)
+    erro_abs = np.abs(erro)
+    linhas = np.arange(reais.shape[0])[:, None]
+    x = posicao[linhas, np.clip(reais // PASSO_NIVEL, 0, NIVEIS_TOTAL - 1)]
+    y = posicao[linhas, np.clip(preditas // PASSO_NIVEL, 0, NIVEIS_TOTAL - 1)]
+    
+    colunas = np.stack([
+        erro_abs, erro * erro, erro == 0, erro_abs <= PASSO_NIVEL,
+        x, y, x * x, y * y, (x - y) ** 2,
+    ], axis=-1)
+    return np.ascontiguousarray(colunas.transpose(1, 0, 2).reshape(reais.shape[1], -1))
+
+
+def metricas_de_somas(somas, n):
+    """
+    Métricas a partir das somas das colunas de estatisticas_por_redacao
     
-    # 5. Acurácia Adjacente (±40 pontos de tolerância)
-    acuracia_adjacente = np.mean(np.abs(notas_pred - notas_reais) <= 40)
+    Args:
+        somas: Array (..., 6 * len(ESTATISTICAS)) de somas sobre n redações
+        n: Número de redações somadas
     
-    metricas = {
-        f'{prefixo}MAE': mae,
-        f'{prefixo}RMSE': rmse,
-        f'{prefixo}QWK': qwk,
-        f'{prefixo}Acurácia_Exata': acuracia_exata,
-        f'{prefixo}Acurácia_Adjacente': acuracia_adjacente,
+    Returns:
+        Dict métrica -> array (..., 6) na ordem de ESCALAS
+    """
+    import numpy as np
+    
+    somas = somas.reshape(*somas.shape[:-1], len(ESCALAS), len(ESTATISTICAS))
+    (erro_abs, erro_quad, exata, adjacente,
+     soma_x, soma_y, soma_x2, soma_y2, discordancia) = np.moveaxis(somas, -1, 0)
+    return {
+        'MAE': erro_abs / n,
+        'RMSE': np.sqrt(erro_quad / n),
+        'QWK': _kappa_de_somas(discordancia, soma_x, soma_y, soma_x2, soma_y2, n),
+        'Acurácia_Exata': exata / n,
+        'Acurácia_Adjacente': adjacente / n,
     }
+
+
+def _matrizes_do_df(df):
+    """Matrizes (n, 5) de notas reais e preditas a partir do DataFrame de extrair_notas"""
+    import numpy as np
     
-    return metricas
+    reais = np.column_stack([df[f'comp{i}_real'].to_numpy() for i in range(1, 6)])
+    preditas = np.column_stack([df[f'comp{i}_pred'].to_numpy() for i in range(1, 6)])
+    return reais, preditas
+
+
+def calcular_metricas_gerais(df, prefixo=''):
+    """Calcula as 5 métricas essenciais para a nota total (ver calcular_metricas)"""
+    metricas = calcular_metricas(*_matrizes_do_df(df))
+    return {f'{prefixo}{nome}': float(metricas[nome][0]) for nome in METRICAS}
 
 
 def calcular_metricas_por_competencia(df, prefixo=''):
+    """Calcula as 5 métricas para cada competência (C1 a C5)"""
+    metricas = calcular_metricas(*_matrizes_do_df(df))
+    return {
+        f'{prefixo}Comp{i}_{nome}': float(metricas[nome][i])
+        for i in range(1, 6)
+        for nome in METRICAS
+    }
+
+
+def imprimir_tabela_metricas(tabela_rag, tabela_baseline, coluna):
     """
-    Calcula MAE para cada competência (C1 a C5)
+    Imprime as 5 métricas de RAG e Baseline de uma escala
+    
+    Args:
+        tabela_rag, tabela_baseline: Retornos de calcular_metricas
+        coluna: Posição em ESCALAS (0 = nota total, 1-5 = competências)
     """
-    metricas_comp = {}
+    print(f"\n{'Métrica':<30} {'RAG':>15} {'Baseline':>15} {'Melhor':>12}")
+    print("-"*75)
     
-    for i in range(1, 6):
-        comp_real = df[f'comp{i}_real'].values
-        comp_pred = df[f'comp{i}_pred'].values
+    # Lista das métricas a apresentar
+    metricas_labels = [
+        ('MAE', 'menor', 'pontos'),
+        ('RMSE', 'menor', 'pontos'),
+        ('QWK', 'maior', 'score'),
+        ('Acurácia_Exata', 'maior', 'percent'),
+        ('Acurácia_Adjacente', 'maior', 'percent'),
+    ]
+    
+    for label, criterio, formato in metricas_labels:
+        val_rag = tabela_rag[label][coluna]
+        val_baseline = tabela_baseline[label][coluna]
         
-        # MAE por competência
-        mae = mean_absolute_error(comp_real, comp_pred)
-        metricas_comp[f'{prefixo}Comp{i}_MAE'] = mae
+        # Determinar qual é melhor
+        if criterio == 'menor':
+            melhor = 'RAG' if val_rag < val_baseline else 'Baseline'
+        else:
+            melhor = 'RAG' if val_rag > val_baseline else 'Baseline'
+        
+        # Formatação de saída
+        if formato == 'percent':
+            print(f"{label:<30} {val_rag*100:>14.1f}% {val_baseline*100:>14.1f}% {melhor:>12}")
+        else:
+            print(f"{label:<30} {val_rag:>15.3f} {val_baseline:>15.3f} {melhor:>12}")
+
+
+def alinhar_pares(indices_a, reais_a, preditas_a, indices_b, preditas_b):
+    """
+    Alinha duas variantes pelas redações avaliadas com sucesso em ambas
+    
+    Returns:
+        (indices, reais, preditas_a, preditas_b), matrizes (n, 5) na ordem de indices
+    """
+    import numpy as np
+    
+    indices, pos_a, pos_b = np.intersect1d(indices_a, indices_b, assume_unique=True, return_indices=True)
+    return indices, reais_a[pos_a], preditas_a[pos_a], preditas_b[pos_b]
+
+
+def analisar_incerteza(reais, preditas_rag, preditas_baseline, reamostras, confianca=0.95,
+                       semente=0, processos=None):
+    """
+    Intervalos de confiança (bootstrap pareado) e p-valores (permutação pareada)
+    de todas as métricas, na nota total e nas 5 competências
+    
+    Args:
+        reais, preditas_rag, preditas_baseline: Matrizes (n, 5) alinhadas por redação
+        reamostras: Reamostras do bootstrap e permutações do teste
+        confianca: Nível de confiança dos intervalos
+        semente: Semente (resultado reprodutível)
+        processos: Processos usados (padrão: número de CPUs)
+    
+    Returns:
+        Dict métrica -> {'a' (RAG), 'b' (Baseline), 'diferenca', 'ic_a', 'ic_b',
+        'ic_diferenca', 'p_valor'}; cada array com uma posição por ESCALAS
+    """
+    import numpy as np
+    from avaliacao_automatica.reamostragem import bootstrap_pareado, teste_permutacao_pareado
+    
+    reais, rag, baseline = _por_escala(reais), _por_escala(preditas_rag), _por_escala(preditas_baseline)
+    niveis = [np.clip(notas // PASSO_NIVEL, 0, NIVEIS_TOTAL - 1) for notas in (reais, rag, baseline)]
     
-    return metricas_comp
+    # Intervalos: posições dos níveis de cada variante, como em calcular_metricas
+    intervalos = bootstrap_pareado(
+        estatisticas_por_redacao(reais, rag, posicoes_niveis(NIVEIS_TOTAL, niveis[0], niveis[1])),
+        estatisticas_por_redacao(reais, baseline, posicoes_niveis(NIVEIS_TOTAL, niveis[0], niveis[2])),
+        metricas_de_somas,
+        reamostras=reamostras, confianca=confianca, semente=semente, processos=processos
+    )
+    # Permutação: as notas trocam de variante, então as posições são as comuns às duas
+    comuns = posicoes_niveis(NIVEIS_TOTAL, *niveis)
+    permutacao = teste_permutacao_pareado(
+        estatisticas_por_redacao(reais, rag, comuns),
+        estatisticas_por_redacao(reais, baseline, comuns),
+        metricas_de_somas,
+        reamostras=reamostras, semente=semente, processos=processos
+    )
+    for nome in intervalos:
+        intervalos[nome]['p_valor'] = permutacao[nome]['p_valor']
+    return intervalos
 
 
-def comparar_rag_baseline(df_rag, df_baseline):
+def imprimir_incerteza(incerteza, confianca):
+    """Imprime, por escala, valor e intervalo de RAG, Baseline e da diferença, e o p-valor"""
+    rotulo_ic = f"IC {confianca * 100:.0f}%"
+    nomes_escalas = ['Nota total'] + COMPETENCIAS
+    
+    for coluna, nome_escala in enumerate(nomes_escalas):
+        print(f"\n{nome_escala}")
+        print(f"\n{'Métrica':<20} {'RAG [' + rotulo_ic + ']':>26} {'Baseline [' + rotulo_ic + ']':>26} "
+              f"{'Diferença [' + rotulo_ic + ']':>28} {'p':>7}")
+        print("-"*111)
+        for nome in METRICAS:
+            dados = incerteza[nome]
+            escala = 100 if nome.startswith('Acurácia') else 1
+            
+            def celula(valor, intervalo, sinal=''):
+                return (f"{valor * escala:{sinal}.2f} "
+                        f"[{intervalo[0] * escala:{sinal}.2f}, {intervalo[1] * escala:{sinal}.2f}]")
+            
+            print(f"{nome:<20} {celula(dados['a'][coluna], dados['ic_a'][coluna]):>26} "
+                  f"{celula(dados['b'][coluna], dados['ic_b'][coluna]):>26} "
+                  f"{celula(dados['diferenca'][coluna], dados['ic_diferenca'][coluna], '+'):>28} "
+                  f"{dados['p_valor'][coluna]:>7.3f}")
+    
+    print("\nDiferença = RAG - Baseline; acurácias em pontos percentuais. "
+          "p: teste de permutação pareado (bilateral).")
+
+
+def comparar_rag_baseline(reais_rag, preditas_rag, reais_baseline, preditas_baseline):
     """
     Compara desempenho entre RAG e Baseline (ambos vs Ground Truth)
     Retorna diferenças simples sem testes estatísticos complexos
+    
+    Args:
+        reais_*, preditas_*: Matrizes (n, 5) de notas (ver matrizes_notas)
     """
+    import numpy as np
     
-    # Calcular erros absolutos
-    erros_rag = np.abs(df_rag['nota_pred'].values - df_rag['nota_real'].values)
-    erros_baseline = np.abs(df_baseline['nota_pred'].values - df_baseline['nota_real'].values)
+    # Calcular erros absolutos da nota total
+    erros_rag = np.abs(preditas_rag.sum(axis=1) - reais_rag.sum(axis=1))
+    erros_baseline = np.abs(preditas_baseline.sum(axis=1) - reais_baseline.sum(axis=1))
     
     comparacao = {
         'MAE_RAG': np.mean(erros_rag),
@@ -138,108 +585,87 @@ def comparar_rag_baseline(df_rag, df_baseline):
     return comparacao
 
 
-def gerar_relatorio_completo(prompt_id, exportar_csv=None):
-    """Gera relatório completo de todas as métricas"""
+def gerar_relatorio_completo(prompt_id, exportar_csv=None, variante_rag='rag',
+                             reamostras=10_000, confianca=0.95, semente=0, processos=None,
+                             gravar_colunar=False):
+    """
+    Gera relatório completo de todas as métricas
+    
+    variante_rag escolhe o arquivo RAG comparado com o baseline:
+    'rag' (manual completo) ou 'rag_trechos' (recuperação de trechos)
+    
+    reamostras > 0 acrescenta intervalos de confiança (bootstrap pareado) e
+    p-valores (permutação pareada) calculados sobre as redações avaliadas
+    com sucesso nos dois modos
+    
+    gravar_colunar grava a tabela Parquet de cada JSON lido (ver carregar_matrizes)
+    """
     
     print("="*80)
     print(f"📊 RELATÓRIO DE MÉTRICAS - PROMPT {prompt_id}")
     print("="*80)
     
     # Carregar dados
-    rag_file = f'resultados_experimento/resultados_prompt{prompt_id}_rag.json'
-    baseline_file = f'resultados_experimento/resultados_prompt{prompt_id}_baseline.json'
+    rag_file = localizar_resultados(f'resultados_experimento/resultados_prompt{prompt_id}_{variante_rag}.json')
+    baseline_file = localizar_resultados(f'resultados_experimento/resultados_prompt{prompt_id}_baseline.json')
     
-    if not Path(rag_file).exists():
+    if not rag_file.exists():
         print(f"\n❌ Arquivo não encontrado: {rag_file}")
         return None
     
-    if not Path(baseline_file).exists():
+    if not baseline_file.exists():
         print(f"\n❌ Arquivo não encontrado: {baseline_file}")
         return None
     
-    res_rag = carregar_resultados(rag_file)
-    res_baseline = carregar_resultados(baseline_file)
-    
-    df_rag = extrair_notas(res_rag)
-    df_baseline = extrair_notas(res_baseline)
+    total_rag, indices_rag, reais_rag, preditas_rag = carregar_matrizes(
+        rag_file, gravar_colunar=gravar_colunar
+    )
+    total_baseline, indices_baseline, reais_baseline, preditas_baseline = carregar_matrizes(
+        baseline_file, gravar_colunar=gravar_colunar
+    )
     
-    print(f"\n✅ Sucessos RAG: {len(df_rag)}/{len(res_rag)}")
-    print(f"✅ Sucessos Baseline: {len(df_baseline)}/{len(res_baseline)}")
+    print(f"\n✅ Sucessos RAG: {len(indices_rag)}/{total_rag}")
+    print(f"✅ Sucessos Baseline: {len(indices_baseline)}/{total_baseline}")
     
-    if len(df_rag) == 0 or len(df_baseline) == 0:
+    if len(indices_rag) == 0 or len(indices_baseline) == 0:
         print("\n❌ Erro: Não há dados suficientes para análise")
         return None
     
+    # Todas as métricas, da nota total e das 5 competências, numa única passada
+    tabela_rag = calcular_metricas(reais_rag, preditas_rag)
+    tabela_baseline = calcular_metricas(reais_baseline, preditas_baseline)
+    
+    metricas_rag = {f'RAG_{nome}': float(tabela_rag[nome][0]) for nome in METRICAS}
+    metricas_baseline = {f'Baseline_{nome}': float(tabela_baseline[nome][0]) for nome in METRICAS}
+    metricas_comp_rag = {
+        f'RAG_Comp{i}_{nome}': float(tabela_rag[nome][i]) for i in range(1, 6) for nome in METRICAS
+    }
+    metricas_comp_baseline = {
+        f'Baseline_Comp{i}_{nome}': float(tabela_baseline[nome][i]) for i in range(1, 6) for nome in METRICAS
+    }
+    
     # ========== MÉTRICAS GERAIS ==========
     print("\n" + "="*80)
     print("📈 MÉTRICAS GERAIS - RAG vs BASELINE vs GROUND TRUTH")
     print("="*80)
     
-    metricas_rag = calcular_metricas_gerais(df_rag, 'RAG_')
-    metricas_baseline = calcular_metricas_gerais(df_baseline, 'Baseline_')
-    
-    # Tabela comparativa das 5 métricas essenciais
-    print(f"\n{'Métrica':<30} {'RAG':>15} {'Baseline':>15} {'Melhor':>12}")
-    print("-"*75)
-    
-    # Lista das métricas a apresentar
-    metricas_labels = [
-        ('MAE', 'menor', 'pontos'),
-        ('RMSE', 'menor', 'pontos'),
-        ('QWK', 'maior', 'score'),
-        ('Acurácia_Exata', 'maior', 'percent'),
-        ('Acurácia_Adjacente', 'maior', 'percent'),
-    ]
-    
-    for label, criterio, formato in metricas_labels:
-        val_rag = metricas_rag[f'RAG_{label}']
-        val_baseline = metricas_baseline[f'Baseline_{label}']
-        
-        # Determinar qual é melhor
-        if criterio == 'menor':
-            melhor = 'RAG' if val_rag < val_baseline else 'Baseline'
-        else:
-            melhor = 'RAG' if val_rag > val_baseline else 'Baseline'
-        
-        # Formatação de saída
-        if formato == 'percent':
-            print(f"{label:<30} {val_rag*100:>14.1f}% {val_baseline*100:>14.1f}% {melhor:>12}")
-        else:
-            print(f"{label:<30} {val_rag:>15.3f} {val_baseline:>15.3f} {melhor:>12}")
+    imprimir_tabela_metricas(tabela_rag, tabela_baseline, 0)
     
     # ========== MÉTRICAS POR COMPETÊNCIA ==========
     print("\n" + "="*80)
-    print("📊 MÉTRICAS POR COMPETÊNCIA - MAE")
+    print("📊 MÉTRICAS POR COMPETÊNCIA")
     print("="*80)
     
-    metricas_comp_rag = calcular_metricas_por_competencia(df_rag, 'RAG_')
-    metricas_comp_baseline = calcular_metricas_por_competencia(df_baseline, 'Baseline_')
-    
-    print(f"\n{'Competência':<25} {'MAE RAG':>12} {'MAE Baseline':>12} {'Diferença':>12} {'Melhor':>12}")
-    print("-"*75)
-    
-    competencias = [
-        'C1 (Gramática)',
-        'C2 (Estrutura)',
-        'C3 (Argumentação)',
-        'C4 (Coesão)',
-        'C5 (Proposta)',
-    ]
-    
-    for i, nome_comp in enumerate(competencias, 1):
-        mae_rag = metricas_comp_rag[f'RAG_Comp{i}_MAE']
-        mae_baseline = metricas_comp_baseline[f'Baseline_Comp{i}_MAE']
-        diff = mae_baseline - mae_rag  # Positivo = RAG melhor
-        melhor = 'RAG' if mae_rag < mae_baseline else 'Baseline'
-        
-        print(f"{nome_comp:<25} {mae_rag:>12.2f} {mae_baseline:>12.2f} {diff:>+12.2f} {melhor:>12}")
+    for i, nome_comp in enumerate(COMPETENCIAS, 1):
+        print(f"\n{nome_comp}")
+        imprimir_tabela_metricas(tabela_rag, tabela_baseline, i)
     
     # ========== TESTES ESTATÍSTICOS ==========
     print("\n" + "="*80)
     print("📊 COMPARAÇÃO RESUMIDA: RAG vs BASELINE")
     print("="*80)
     
-    comparacao = comparar_rag_baseline(df_rag, df_baseline)
+    comparacao = comparar_rag_baseline(reais_rag, preditas_rag, reais_baseline, preditas_baseline)
     
     print(f"\nMAE RAG:          {comparacao['MAE_RAG']:.2f} pontos")
     print(f"MAE Baseline:     {comparacao['MAE_Baseline']:.2f} pontos")
@@ -250,10 +676,49 @@ def gerar_relatorio_completo(prompt_id, exportar_csv=None):
     else:
         print(f"\n⚠️  Baseline teve MELHOR desempenho (MAE {abs(comparacao['Diferença_MAE']):.2f} pontos menor)")
     
+    # ========== INCERTEZA (BOOTSTRAP E PERMUTAÇÃO PAREADOS) ==========
+    incerteza = None
+    if reamostras > 0:
+        import time
+        
+        indices_pares, reais_pares, pares_rag, pares_baseline = alinhar_pares(
+            indices_rag, reais_rag, preditas_rag, indices_baseline, preditas_baseline
+        )
+        print("\n" + "="*80)
+        print(f"📐 INCERTEZA: RAG vs BASELINE ({len(indices_pares)} redações pareadas, "
+              f"{reamostras} reamostras)")
+        print("="*80)
+        
+        if len(indices_pares) < 2:
+            print("\n⚠️  Redações pareadas insuficientes para reamostragem")
+        else:
+            inicio = time.perf_counter()
+            incerteza = analisar_incerteza(
+                reais_pares, pares_rag, pares_baseline, reamostras,
+                confianca=confianca, semente=semente, processos=processos
+            )
+            imprimir_incerteza(incerteza, confianca)
+            
+            ic_mae = incerteza['MAE']['ic_diferenca'][0]
+            p_mae = incerteza['MAE']['p_valor'][0]
+            comparacao['IC_Diferença_MAE'] = (float(ic_mae[0]), float(ic_mae[1]))
+            comparacao['p_valor_MAE'] = float(p_mae)
+            comparacao['Diferença_significativa'] = bool(p_mae < 1 - confianca)
+            
+            veredito = "significativa" if comparacao['Diferença_significativa'] else "NÃO significativa"
+            print(f"\n🧪 Diferença de MAE (nota total) {veredito} ao nível de {(1 - confianca) * 100:.0f}% "
+                  f"(p = {p_mae:.3f}) - calculado em {time.perf_counter() - inicio:.2f}s")
+    
     print("\n" + "="*80)
     
     # ========== EXPORTAR CSV (OPCIONAL) ==========
     if exportar_csv:
+        import numpy as np
+        import pandas as pd
+        
+        df_rag = tabela_notas(indices_rag, reais_rag, preditas_rag)
+        df_baseline = tabela_notas(indices_baseline, reais_baseline, preditas_baseline)
+        
         # Combinar dados para análise
         df_completo = pd.DataFrame({
             'index': df_rag['index'],
@@ -277,13 +742,341 @@ def gerar_relatorio_completo(prompt_id, exportar_csv=None):
     
     # Retornar dados para uso posterior
     return {
-        'df_rag': df_rag,
-        'df_baseline': df_baseline,
+        'tabela_rag': tabela_rag,
+        'tabela_baseline': tabela_baseline,
         'metricas_rag': metricas_rag,
         'metricas_baseline': metricas_baseline,
         'metricas_comp_rag': metricas_comp_rag,
         'metricas_comp_baseline': metricas_comp_baseline,
         'comparacao': comparacao,
+        'incerteza': incerteza,
+    }
+
+
+# ========== COMPARAÇÃO DE N CONFIGURAÇÕES ==========
+
+# Métricas de erro (menor é melhor); nas demais, maior é melhor
+METRICAS_MENOR_MELHOR = ('MAE', 'RMSE')
+
+# Abaixo deste tamanho total dos arquivos a leitura é feita no próprio
+# processo: iniciar os processos custaria mais do que decodificar os JSON
+BYTES_MINIMOS_PROCESSOS = 16 * 1024 * 1024
+
+
+def expandir_arquivos(padroes):
+    """
+    Expande arquivos e padrões glob (ex: 'resultados_experimento/*_rag*.json');
+    aceita também as tabelas .parquet de resultados_colunares
+    
+    Returns:
+        (arquivos na ordem dos padrões, sem repetição; padrões sem arquivo)
+    """
+    import glob
+    
+    arquivos, sem_arquivo = [], []
+    for padrao in padroes:
+        encontrados = sorted(glob.glob(padrao, recursive=True)) if glob.has_magic(padrao) else [padrao]
+        encontrados = [Path(arquivo) for arquivo in encontrados if Path(arquivo).is_file()]
+        if not encontrados:
+            sem_arquivo.append(padrao)
+        arquivos.extend(arquivo for arquivo in encontrados if arquivo not in arquivos)
+    
+    # Tabela colunar encontrada junto com o seu JSON: o JSON já a usa
+    arquivos = [
+        arquivo for arquivo in arquivos
+        if not (arquivo.suffix == '.parquet' and arquivo.with_suffix('.json') in arquivos)
+    ]
+    return arquivos, sem_arquivo
+
+
+def nomes_configuracoes(arquivos):
+    """Nome curto de cada arquivo (sem 'resultados_'); com a pasta se o nome se repetir"""
+    nomes = [arquivo.stem.removeprefix('resultados_') for arquivo in arquivos]
+    return [
+        f"{arquivo.parent.name}/{nome}" if nomes.count(nome) > 1 else nome
+        for arquivo, nome in zip(arquivos, nomes)
+    ]
+
+
+def _carregar_configuracao(arquivo, gravar_colunar=False):
+    """Lê um arquivo de resultados: (total de registros, chaves, reais, preditas) ou o erro"""
+    try:
+        return carregar_matrizes(arquivo, com_prompt=True, gravar_colunar=gravar_colunar)
+    except ValueError as e:
+        return e
+
+
+def carregar_configuracoes(arquivos, processos=None, gravar_colunar=False):
+    """
+    Lê vários arquivos de resultados ao mesmo tempo
+    
+    A decodificação do JSON é feita em processos separados (um arquivo por
+    processo) quando o volume compensa; só as matrizes de notas voltam.
+    
+    Returns:
+        Lista de (total, chaves (n, 2), reais (n, 5), preditas (n, 5)), na
+        ordem dos arquivos; um arquivo que não é de resultados tem no lugar
+        o ValueError que o descreve
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    
+    carregar = partial(_carregar_configuracao, gravar_colunar=gravar_colunar)
+    processos = min(processos or os.cpu_count() or 1, len(arquivos))
+    volume = sum(Path(arquivo).stat().st_size for arquivo in arquivos)
+    if processos <= 1 or volume < BYTES_MINIMOS_PROCESSOS:
+        return [carregar(arquivo) for arquivo in arquivos]
+    
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(carregar, arquivos))
+
+
+def _codificar_chaves(chaves):
+    """(prompt_id, redacao_index) -> um inteiro por redação (ordenável e comparável)"""
+    return (chaves[:, 0] << 32) | chaves[:, 1]
+
+
+def alinhar_configuracoes(configuracoes, nomes):
+    """
+    Alinha as configurações pelas redações (prompt_id, redacao_index) presentes em todas
+    
+    A nota real vem da primeira configuração; divergência com as demais é avisada.
+    
+    Args:
+        configuracoes: Retorno de carregar_configuracoes
+        nomes: Nome de cada configuração (avisos)
+    
+    Returns:
+        (chaves (n, 2), reais (n, 5), lista de preditas (n, 5) por configuração)
+    """
+    import numpy as np
+    
+    codigos = []
+    for nome, (_, chaves, _, _) in zip(nomes, configuracoes):
+        codigo = _codificar_chaves(chaves)
+        if len(np.unique(codigo)) < len(codigo):
+            print(f"⚠️  Aviso: {nome} tem redações repetidas - usada a primeira ocorrência")
+        codigos.append(codigo)
+    
+    comuns = codigos[0]
+    for codigo in codigos[1:]:
+        comuns = np.intersect1d(comuns, codigo)
+    comuns = np.unique(comuns)
+    
+    reais, preditas = None, []
+    for nome, codigo, (_, chaves, reais_config, preditas_config) in zip(nomes, codigos, configuracoes):
+        _, primeiras = np.unique(codigo, return_index=True)
+        ordem = primeiras[np.argsort(codigo[primeiras], kind='stable')]
+        posicoes = ordem[np.searchsorted(codigo[ordem], comuns)]
+        if reais is None:
+            chaves_comuns, reais = chaves[posicoes], reais_config[posicoes]
+        elif not np.array_equal(reais, reais_config[posicoes]):
+            print(f"⚠️  Aviso: {nome} tem notas reais diferentes da primeira configuração - "
+                  f"usadas as da primeira")
+        preditas.append(preditas_config[posicoes])
+    
+    return chaves_comuns, reais, preditas
+
+
+def calcular_metricas_configuracoes(reais, lista_preditas):
+    """
+    Métricas de todas as configurações e escalas numa única passada
+    
+    Args:
+        reais: Matriz (n, 5) de notas reais comum às configurações
+        lista_preditas: Matrizes (n, 5) preditas, uma por configuração
+    
+    Returns:
+        Dict métrica -> array (configurações, 6) na ordem de ESCALAS
+    """
+    import numpy as np
+    
+    escalas_reais = _por_escala(reais)
+    linhas_reais = np.tile(escalas_reais, (len(lista_preditas), 1))
+    linhas_preditas = np.concatenate([_por_escala(preditas) for preditas in lista_preditas])
+    metricas = metricas_por_linha(linhas_reais, linhas_preditas)
+    return {nome: valores.reshape(len(lista_preditas), len(ESCALAS)) for nome, valores in metricas.items()}
+
+
+def imprimir_tabela_configuracoes(nomes, tabela, coluna):
+    """
+    Imprime as 5 métricas de cada configuração numa escala (★ = melhor valor)
+    
+    Args:
+        nomes: Nome de cada configuração
+        tabela: Retorno de calcular_metricas_configuracoes
+        coluna: Posição em ESCALAS (0 = nota total, 1-5 = competências)
+    """
+    import numpy as np
+    
+    largura = max(len('Configuração'), *(len(nome) for nome in nomes))
+    print(f"\n{'Configuração':<{largura}} " + " ".join(f"{nome:>20}" for nome in METRICAS))
+    print("-" * (largura + 21 * len(METRICAS)))
+    
+    # Melhor valor de cada métrica (empates recebem todos a ★)
+    melhores = {}
+    for nome in METRICAS:
+        valores = tabela[nome][:, coluna]
+        with np.errstate(invalid='ignore'):
+            alvo = np.nanmin(valores) if nome in METRICAS_MENOR_MELHOR else np.nanmax(valores)
+        melhores[nome] = np.isclose(valores, alvo)
+    
+    for linha, nome_config in enumerate(nomes):
+        celulas = []
+        for nome in METRICAS:
+            valor = tabela[nome][linha, coluna]
+            texto = f"{valor * 100:.1f}%" if nome.startswith('Acurácia') else f"{valor:.3f}"
+            celulas.append(f"{('★ ' if melhores[nome][linha] else '') + texto:>20}")
+        print(f"{nome_config:<{largura}} " + " ".join(celulas))
+
+
+def gerar_relatorio_configuracoes(padroes, exportar_csv=None, exportar_metricas=None,
+                                  reamostras=10_000, confianca=0.95, semente=0, processos=None,
+                                  gravar_colunar=False):
+    """
+    Compara qualquer número de arquivos de resultados (modelos, variantes de
+    prompt, configurações de recuperação...) numa única tabela
+    
+    Os arquivos são lidos ao mesmo tempo e alinhados por (prompt_id,
+    redacao_index): todas as métricas são calculadas sobre as mesmas
+    redações (as avaliadas com sucesso em todas as configurações).
+    
+    reamostras > 0 acrescenta, para cada configuração, o intervalo de
+    confiança e o p-valor da diferença em relação à primeira (referência)
+    
+    Args:
+        padroes: Arquivos ou padrões glob
+        exportar_csv: CSV com as notas de cada redação em todas as configurações
+        exportar_metricas: CSV com uma linha de métricas por configuração
+        gravar_colunar: Grava a tabela Parquet de cada JSON lido
+    """
+    import time
+    
+    print("="*80)
+    print("📊 RELATÓRIO DE MÉTRICAS - COMPARAÇÃO DE CONFIGURAÇÕES")
+    print("="*80)
+    
+    arquivos, sem_arquivo = expandir_arquivos(padroes)
+    for padrao in sem_arquivo:
+        print(f"\n❌ Nenhum arquivo encontrado para: {padrao}")
+    if sem_arquivo or not arquivos:
+        return None
+    
+    inicio = time.perf_counter()
+    configuracoes = carregar_configuracoes(arquivos, processos, gravar_colunar)
+    print(f"\n📂 {len(arquivos)} arquivos lidos em {time.perf_counter() - inicio:.2f}s")
+    
+    # Arquivos que casaram com o padrão mas não são de resultados ficam de fora
+    for configuracao in configuracoes:
+        if isinstance(configuracao, ValueError):
+            print(f"⚠️  Ignorado: {configuracao}")
+    validos = [not isinstance(configuracao, ValueError) for configuracao in configuracoes]
+    arquivos = [arquivo for arquivo, valido in zip(arquivos, validos) if valido]
+    configuracoes = [configuracao for configuracao, valido in zip(configuracoes, validos) if valido]
+    if not arquivos:
+        print("\n❌ Erro: Nenhum arquivo de resultados válido")
+        return None
+    
+    nomes = nomes_configuracoes(arquivos)
+    for nome, arquivo, (total, chaves, _, _) in zip(nomes, arquivos, configuracoes):
+        print(f"✅ {nome}: {len(chaves)}/{total} sucessos ({arquivo})")
+    
+    chaves, reais, lista_preditas = alinhar_configuracoes(configuracoes, nomes)
+    print(f"\n🔗 Redações presentes em todas as configurações: {len(chaves)}")
+    if len(chaves) == 0:
+        print("\n❌ Erro: Não há redações em comum para comparar")
+        return None
+    
+    tabela = calcular_metricas_configuracoes(reais, lista_preditas)
+    
+    # ========== MÉTRICAS GERAIS ==========
+    print("\n" + "="*80)
+    print("📈 MÉTRICAS GERAIS - CONFIGURAÇÕES vs GROUND TRUTH")
+    print("="*80)
+    
+    imprimir_tabela_configuracoes(nomes, tabela, 0)
+    
+    # ========== MÉTRICAS POR COMPETÊNCIA ==========
+    print("\n" + "="*80)
+    print("📊 MÉTRICAS POR COMPETÊNCIA")
+    print("="*80)
+    
+    for i, nome_comp in enumerate(COMPETENCIAS, 1):
+        print(f"\n{nome_comp}")
+        imprimir_tabela_configuracoes(nomes, tabela, i)
+    
+    # ========== INCERTEZA EM RELAÇÃO À REFERÊNCIA ==========
+    incerteza = {}
+    if reamostras > 0 and len(nomes) > 1:
+        print("\n" + "="*80)
+        print(f"📐 DIFERENÇA PARA A REFERÊNCIA ({nomes[0]}) - nota total, "
+              f"{reamostras} reamostras, IC {confianca * 100:.0f}%")
+        print("="*80)
+        
+        if len(chaves) < 2:
+            print("\n⚠️  Redações pareadas insuficientes para reamostragem")
+        else:
+            largura = max(len('Configuração'), *(len(nome) for nome in nomes))
+            print(f"\n{'Configuração':<{largura}} {'Δ MAE [IC]':>28} {'p':>7} {'Δ QWK [IC]':>28} {'p':>7}")
+            print("-" * (largura + 72))
+            for nome, preditas in zip(nomes[1:], lista_preditas[1:]):
+                resultado = analisar_incerteza(
+                    reais, preditas, lista_preditas[0], reamostras,
+                    confianca=confianca, semente=semente, processos=processos
+                )
+                incerteza[nome] = resultado
+                celulas = []
+                for metrica, casas in (('MAE', 2), ('QWK', 3)):
+                    diferenca = resultado[metrica]['diferenca'][0]
+                    intervalo = resultado[metrica]['ic_diferenca'][0]
+                    texto = f"{diferenca:+.{casas}f} [{intervalo[0]:+.{casas}f}, {intervalo[1]:+.{casas}f}]"
+                    celulas.append(f"{texto:>28} {resultado[metrica]['p_valor'][0]:>7.3f}")
+                print(f"{nome:<{largura}} " + " ".join(celulas))
+            print("\nΔ = configuração - referência. p: teste de permutação pareado (bilateral).")
+    
+    print("\n" + "="*80)
+    
+    # ========== EXPORTAR CSV (OPCIONAL) ==========
+    if exportar_csv:
+        import pandas as pd
+        
+        colunas = {
+            'prompt_id': chaves[:, 0],
+            'index': chaves[:, 1],
+            'nota_real': reais.sum(axis=1),
+        }
+        for i in range(5):
+            colunas[f'comp{i + 1}_real'] = reais[:, i]
+        for nome, preditas in zip(nomes, lista_preditas):
+            colunas[f'nota_pred_{nome}'] = preditas.sum(axis=1)
+            colunas[f'erro_{nome}'] = preditas.sum(axis=1) - reais.sum(axis=1)
+            for i in range(5):
+                colunas[f'comp{i + 1}_pred_{nome}'] = preditas[:, i]
+        
+        pd.DataFrame(colunas).to_csv(exportar_csv, index=False)
+        print(f"\n💾 Notas exportadas para: {exportar_csv}")
+    
+    if exportar_metricas:
+        import pandas as pd
+        
+        linhas = []
+        for linha, (nome, arquivo) in enumerate(zip(nomes, arquivos)):
+            registro = {'configuracao': nome, 'arquivo': str(arquivo), 'redacoes': len(chaves)}
+            for coluna, escala in enumerate(ESCALAS):
+                for metrica in METRICAS:
+                    registro[f'{escala}_{metrica}'] = float(tabela[metrica][linha, coluna])
+            linhas.append(registro)
+        
+        pd.DataFrame(linhas).to_csv(exportar_metricas, index=False)
+        print(f"\n💾 Métricas exportadas para: {exportar_metricas}")
+    
+    return {
+        'configuracoes': nomes,
+        'arquivos': [str(arquivo) for arquivo in arquivos],
+        'chaves': chaves,
+        'tabela': tabela,
+        'incerteza': incerteza,
     }
 
 
@@ -296,15 +1089,27 @@ Exemplos de uso:
   python analisar_metricas.py --prompt 3
   python analisar_metricas.py --prompt 6
   python analisar_metricas.py --prompt 3 --export resultados_prompt3.csv
+  python analisar_metricas.py --prompt 3 --variante-rag rag_trechos
+  python analisar_metricas.py --prompt 3 --reamostras 20000 --processos 4
+  python analisar_metricas.py --prompt 3 --reamostras 0
+  python analisar_metricas.py --arquivos "resultados_experimento/resultados_prompt3_*.json"
+  python analisar_metricas.py --arquivos base.json modelo_b/*.json --export-metricas metricas.csv
+  python analisar_metricas.py --prompt 3 --gravar-colunar
         """
     )
     
-    parser.add_argument(
+    entrada = parser.add_mutually_exclusive_group(required=True)
+    entrada.add_argument(
         '--prompt',
         type=int,
-        required=True,
-        choices=[3, 6],
-        help='ID do prompt a analisar (3 ou 6)'
+        help='ID do prompt a analisar (ex: 3 ou 6): compara RAG e baseline'
+    )
+    entrada.add_argument(
+        '--arquivos',
+        nargs='+',
+        metavar='ARQUIVO',
+        help='Arquivos de resultados ou padrões glob a comparar entre si '
+             '(qualquer número; o primeiro é a referência)'
     )
     
     parser.add_argument(
@@ -313,10 +1118,77 @@ Exemplos de uso:
         help='Exportar dados para CSV (opcional)'
     )
     
+    parser.add_argument(
+        '--export-metricas',
+        type=str,
+        help='Com --arquivos: exportar a tabela de métricas (uma linha por configuração) para CSV'
+    )
+    
+    parser.add_argument(
+        '--variante-rag',
+        type=str,
+        default='rag',
+        choices=['rag', 'rag_trechos'],
+        help='Resultados RAG a comparar: manual completo (rag) ou recuperação de trechos (rag_trechos)'
+    )
+    
+    parser.add_argument(
+        '--reamostras',
+        type=int,
+        default=10_000,
+        help='Reamostras do bootstrap pareado e do teste de permutação (0 = desliga; padrão: 10000)'
+    )
+    
+    parser.add_argument(
+        '--confianca',
+        type=float,
+        default=0.95,
+        help='Nível de confiança dos intervalos (padrão: 0.95)'
+    )
+    
+    parser.add_argument(
+        '--semente',
+        type=int,
+        default=0,
+        help='Semente da reamostragem (padrão: 0)'
+    )
+    
+    parser.add_argument(
+        '--processos',
+        type=int,
+        default=None,
+        help='Processos da reamostragem (padrão: número de CPUs)'
+    )
+    
+    parser.add_argument(
+        '--gravar-colunar',
+        action='store_true',
+        help='Grava a tabela Parquet de cada JSON lido, para as próximas análises '
+             '(por padrão a análise não escreve nada)'
+    )
+    
     args = parser.parse_args()
     
+    if not 0 < args.confianca < 1:
+        parser.error("--confianca deve estar entre 0 e 1")
+    
     # Gerar relatório
-    resultado = gerar_relatorio_completo(args.prompt, args.export)
+    if args.arquivos:
+        resultado = gerar_relatorio_configuracoes(
+            args.arquivos, args.export, args.export_metricas,
+            reamostras=args.reamostras, confianca=args.confianca,
+            semente=args.semente, processos=args.processos,
+            gravar_colunar=args.gravar_colunar
+        )
+    else:
+        if args.export_metricas:
+            parser.error("--export-metricas só vale com --arquivos")
+        resultado = gerar_relatorio_completo(
+            args.prompt, args.export, args.variante_rag,
+            reamostras=args.reamostras, confianca=args.confianca,
+            semente=args.semente, processos=args.processos,
+            gravar_colunar=args.gravar_colunar
+        )
     
     if resultado is None:
         print("\n❌ Falha ao gerar relatório")
@@ -0,0 +1,33 @@
+"""
+Opções lidas de variáveis de ambiente
+
+Módulo sem dependências pesadas: os pontos de entrada consultam estas opções
+antes de decidir se precisam importar o CrewAI.
+"""
+
+import os
+from typing import Optional
+
+
+MODELO_SIMULADO = "simulado"
+
+
+def llm_simulado_selecionado(modelo: Optional[str] = None) -> bool:
+    """Indica se o modelo (padrão: variável MODEL) é o LLM simulado"""
+    modelo = modelo if modelo is not None else os.environ.get("MODEL", "")
+    return modelo.split("/", 1)[0].lower() == MODELO_SIMULADO
+
+
+def cache_llm_habilitado() -> bool:
+    """Indica se o cache foi habilitado pela variável de ambiente CACHE_LLM"""
+    return os.environ.get("CACHE_LLM", "").lower() in ("1", "true", "sim")
+
+
+def resultados_colunares_habilitados() -> bool:
+    """Indica se as tabelas Parquet de resultados estão em uso (RESULTADOS_COLUNARES=0 desliga)"""
+    return os.environ.get("RESULTADOS_COLUNARES", "1").lower() not in ("0", "false", "nao", "não")
+
+
+def corpus_compilado_habilitado() -> bool:
+    """Indica se os CSVs de redações são lidos do corpus compilado (CORPUS_COMPILADO=0 desliga)"""
+    return os.environ.get("CORPUS_COMPILADO", "1").lower() not in ("0", "false", "nao", "não")
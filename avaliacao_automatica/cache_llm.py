@@ -0,0 +1,282 @@
+"""
+Cache de Respostas do LLM (endereçado por conteúdo)
+
+Envolve o LLM usado pelos agentes: a chave de cada chamada é o hash SHA-256
+do modelo, dos parâmetros de geração e do prompt renderizado (mensagens).
+As respostas ficam num SQLite local com remoção por idade e por tamanho
+(as menos acessadas recentemente saem primeiro). Reavaliar uma redação
+idêntica passa a custar milissegundos em vez de 6 chamadas ao LLM.
+
+Habilitação:
+    CACHE_LLM=1 python processar_experimento.py ...   (ou a flag --cache-llm)
+
+Uso via linha de comando:
+    python -m avaliacao_automatica.cache_llm --stats
+    python -m avaliacao_automatica.cache_llm --limpar
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from crewai.llms.base_llm import BaseLLM
+
+from avaliacao_automatica.llm_delegado import LLMDelegado
+
+
+CACHE_PATH_PADRAO = Path(__file__).parent.parent / ".cache" / "llm" / "respostas.sqlite3"
+TAMANHO_MAXIMO_MB_PADRAO = 256
+IDADE_MAXIMA_DIAS_PADRAO = 30
+
+
+class CacheRespostas:
+    """
+    Armazenamento SQLite das respostas do LLM
+
+    Qualquer objeto com os métodos obter(chave), gravar(chave, modelo, resposta)
+    e remover(chave) pode substituí-lo no LLMComCache.
+    """
+
+    def __init__(
+        self,
+        caminho: Optional[Path] = None,
+        tamanho_maximo_mb: Optional[float] = None,
+        idade_maxima_dias: Optional[float] = None
+    ):
+        self.caminho = Path(caminho or os.environ.get("CACHE_LLM_PATH", CACHE_PATH_PADRAO))
+        tamanho_mb = tamanho_maximo_mb or float(
+            os.environ.get("CACHE_LLM_MAX_MB", TAMANHO_MAXIMO_MB_PADRAO)
+        )
+        idade_dias = idade_maxima_dias or float(
+            os.environ.get("CACHE_LLM_MAX_DIAS", IDADE_MAXIMA_DIAS_PADRAO)
+        )
+        self.tamanho_maximo = int(tamanho_mb * 1024 * 1024)
+        self.idade_maxima = idade_dias * 24 * 3600
+
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conexao = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute(
+            """
+            CREATE TABLE IF NOT EXISTS respostas (
+                chave TEXT PRIMARY KEY,
+                modelo TEXT NOT NULL,
+                resposta TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                criado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            )
+            """
+        )
+        self._conexao.execute(
+            "CREATE INDEX IF NOT EXISTS idx_respostas_acessado ON respostas (acessado_em)"
+        )
+        self._conexao.commit()
+
+    @staticmethod
+    def gerar_chave(modelo: str, parametros: Dict[str, Any], mensagens: Any) -> str:
+        """Hash SHA-256 de modelo + parâmetros + prompt renderizado"""
+        conteudo = json.dumps(
+            {"modelo": modelo, "parametros": parametros, "mensagens": mensagens},
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def obter(self, chave: str) -> Optional[str]:
+        """Retorna a resposta em cache (ou None), descartando entradas expiradas"""
+        agora = time.time()
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT resposta, criado_em FROM respostas WHERE chave = ?", (chave,)
+            ).fetchone()
+
+            if linha is None or agora - linha[1] > self.idade_maxima:
+                if linha is not None:
+                    self._conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+                    self._conexao.commit()
+                self.falhas += 1
+                return None
+
+            self._conexao.execute(
+                "UPDATE respostas SET acessado_em = ? WHERE chave = ?", (agora, chave)
+            )
+            self._conexao.commit()
+            self.acertos += 1
+            return linha[0]
+
+    def gravar(self, chave: str, modelo: str, resposta: str) -> None:
+        """Grava a resposta e aplica a remoção por tamanho"""
+        agora = time.time()
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, modelo, resposta, len(resposta.encode('utf-8')), agora, agora),
+            )
+            self._remover_excedente()
+            self._conexao.commit()
+
+    def remover(self, chave: str) -> None:
+        """Remove uma resposta do cache (ex: rejeitada pela validação da tarefa)"""
+        with self._lock:
+            self._conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+            self._conexao.commit()
+
+    def _remover_excedente(self) -> None:
+        """Remove entradas expiradas e, se preciso, as menos usadas recentemente"""
+        self._conexao.execute(
+            "DELETE FROM respostas WHERE criado_em < ?", (time.time() - self.idade_maxima,)
+        )
+        total = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.tamanho_maximo:
+            return
+
+        excedente = total - self.tamanho_maximo
+        removidos = 0
+        for chave, tamanho in self._conexao.execute(
+            "SELECT chave, tamanho FROM respostas ORDER BY acessado_em ASC"
+        ).fetchall():
+            if removidos >= excedente:
+                break
+            self._conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+            removidos += tamanho
+
+    def limpar(self) -> int:
+        """Remove todas as entradas; retorna a quantidade removida"""
+        with self._lock:
+            removidas = self._conexao.execute("DELETE FROM respostas").rowcount
+            self._conexao.commit()
+        self._conexao.execute("VACUUM")
+        return removidas
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Acertos/falhas desta execução e ocupação do cache"""
+        with self._lock:
+            entradas, total = self._conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM respostas"
+            ).fetchone()
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round(self.acertos / consultas, 3) if consultas else 0.0,
+            "entradas": entradas,
+            "tamanho_mb": round(total / (1024 * 1024), 2),
+        }
+
+
+class LLMComCache(LLMDelegado):
+    """
+    LLM que consulta o cache antes de delegar ao LLM real
+
+    Chamadas com ferramentas (tools/available_functions) não são cacheadas,
+    pois podem ter efeitos colaterais. Uma resposta rejeitada pela validação
+    da tarefa é removida (descartar_ultima_resposta): uma nova tentativa com o
+    mesmo prompt (--retentativas, --reprocessar-erros) chama o LLM de novo.
+    """
+
+    def __init__(self, llm: BaseLLM, cache: Any = None):
+        self.cache = cache if cache is not None else CacheRespostas()
+        self._local = threading.local()
+        super().__init__(llm)
+
+    def ultima_chamada_do_cache(self) -> bool:
+        """Indica se a última chamada desta thread foi respondida pelo cache"""
+        return getattr(self._local, 'acerto', False)
+
+    def descartar_ultima_resposta(self) -> None:
+        """Remove do cache a resposta da última chamada desta thread"""
+        chave = getattr(self._local, 'chave', None)
+        self._local.chave = None
+        if chave is not None:
+            self.cache.remover(chave)
+
+    def _parametros(self, response_model: Any) -> Dict[str, Any]:
+        parametros = {
+            "temperature": self.llm.temperature,
+            "stop": sorted(self.llm.stop or []),
+            "extra": getattr(self.llm, 'additional_params', {}),
+        }
+        if response_model is not None:
+            parametros["response_model"] = json.dumps(
+                response_model.model_json_schema(), sort_keys=True
+            )
+        return parametros
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        self._local.acerto = False
+        self._local.chave = None
+        if tools or available_functions:
+            return super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model,
+            )
+
+        chave = CacheRespostas.gerar_chave(
+            self.llm.model, self._parametros(response_model), messages
+        )
+        self._local.chave = chave
+        resposta = self.cache.obter(chave)
+        if resposta is not None:
+            self._local.acerto = True
+            return resposta
+
+        resposta = self.llm.call(
+            messages,
+            callbacks=callbacks,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+        if isinstance(resposta, str) and resposta.strip():
+            self.cache.gravar(chave, self.llm.model, resposta)
+        return resposta
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Gerencia o cache de respostas do LLM')
+    acao = parser.add_mutually_exclusive_group(required=True)
+    acao.add_argument('--stats', action='store_true', help='Mostra a ocupação do cache')
+    acao.add_argument('--limpar', action='store_true', help='Remove todas as respostas em cache')
+    args = parser.parse_args()
+
+    cache = CacheRespostas()
+    if args.limpar:
+        print(f"🗑️  {cache.limpar()} resposta(s) removida(s) de {cache.caminho}")
+    else:
+        estatisticas = cache.estatisticas()
+        print(f"📦 {cache.caminho}")
+        print(f"   Entradas: {estatisticas['entradas']}")
+        print(f"   Tamanho: {estatisticas['tamanho_mb']} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Checkpoint por Tarefa (retomada a partir da tarefa que falhou)
+
+A saída de cada tarefa (5 competências e consolidação) é gravada assim que
+termina, indexada por redação, execução (modelo, backend do LLM e templates
+dos prompts), variante do modo e tarefa. Se a avaliação da redação falhar,
+a nova tentativa executa só as tarefas ausentes ou inválidas e reaproveita
+as demais: tipicamente 1 chamada ao LLM em vez de 6. Saídas de outro modelo
+ou de outra versão dos prompts nunca são reaproveitadas.
+
+O armazenamento é um RegistroResultados (JSONL append-only com fsync), então
+uma queda no meio da escrita nunca corrompe o checkpoint. Uma redação
+concluída ganha um marcador no arquivo; na primeira leitura de cada execução
+o arquivo é compactado e só as saídas de redações pendentes permanecem.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from avaliacao_automatica.extracao_json import ajustar_nota, extrair_json_tolerante, validar_consolidacao
+from avaliacao_automatica.log_estruturado import log
+from avaliacao_automatica.resultados import RegistroResultados
+
+
+TAREFA_CONSOLIDACAO = "tarefa_consolidacao"
+
+
+def chave_redacao(tema: str, redacao: str, execucao: str = "") -> str:
+    """
+    Identificador estável da redação numa execução
+
+    Args:
+        tema: Tema da redação
+        redacao: Texto da redação
+        execucao: Assinatura do que gera as saídas (ver assinatura_execucao)
+    """
+    return hashlib.sha256(f"{tema}\0{redacao}\0{execucao}".encode('utf-8')).hexdigest()[:20]
+
+
+def assinatura_execucao(modelo: str, backend: str, templates: str) -> str:
+    """
+    Assinatura de modelo, backend do LLM e templates dos prompts
+
+    Args:
+        modelo: Nome do modelo (ex: gemini-2.5-flash, simulado)
+        backend: Classe/provedor do LLM e parâmetros de geração
+        templates: Hash dos templates (agents.yaml e tasks.yaml)
+    """
+    return hashlib.sha256(f"{modelo}\0{backend}\0{templates}".encode('utf-8')).hexdigest()[:20]
+
+
+def saida_valida(tarefa: str, texto: str) -> bool:
+    """
+    Indica se a saída de uma tarefa pode ser reaproveitada
+
+    Competências: JSON com nota interpretável. Consolidação: as 5 notas.
+    """
+    dados = extrair_json_tolerante(texto)
+    if dados is None:
+        return False
+    if tarefa == TAREFA_CONSOLIDACAO:
+        return not validar_consolidacao(dados, texto)[1]
+    try:
+        ajustar_nota(dados.get('nota'))
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class CheckpointTarefas:
+    """
+    Saídas válidas das tarefas, por (redação, variante do modo)
+
+    O índice em memória é carregado do arquivo na primeira consulta, já sem
+    as redações concluídas; as concluídas nesta execução são liberadas da
+    memória e marcadas no arquivo (ver liberar).
+    """
+
+    def __init__(self, caminho: Path):
+        self.registro = RegistroResultados(Path(caminho))
+        self._lock = threading.Lock()
+        self._indice: Optional[Dict[Tuple[str, str], Dict[str, Dict[str, Any]]]] = None
+        self._reaproveitadas = 0
+        self._gravadas = 0
+
+    @property
+    def caminho(self) -> Path:
+        return self.registro.caminho
+
+    def _carregar(self) -> Dict[Tuple[str, str], Dict[str, Dict[str, Any]]]:
+        if self._indice is None:
+            tamanho_lido = self.caminho.stat().st_size if self.caminho.exists() else 0
+            indice: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+            linhas = 0
+            for item in self.registro.iterar():
+                linhas += 1
+                try:
+                    chave = (item['redacao'], item['modo'])
+                    if item.get('concluida'):
+                        indice.pop(chave, None)
+                    else:
+                        indice.setdefault(chave, {})[item['tarefa']] = item
+                except KeyError:
+                    continue
+            self._indice = indice
+            if linhas > sum(len(saidas) for saidas in indice.values()):
+                self._compactar(tamanho_lido)
+        return self._indice
+
+    def _compactar(self, tamanho_lido: int) -> None:
+        """
+        Regrava o arquivo só com as saídas das redações pendentes (escrita atômica)
+
+        Linhas anexadas por outro processo depois da leitura são copiadas para
+        o final; no pior caso uma saída se perde e a tarefa é refeita.
+        """
+        temporario = self.caminho.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(temporario, 'wb') as f:
+                for saidas in self._indice.values():  # type: ignore[union-attr]
+                    for item in saidas.values():
+                        f.write((json.dumps(item, ensure_ascii=False) + "\n").encode('utf-8'))
+                with open(self.caminho, 'rb') as original:
+                    original.seek(tamanho_lido)
+                    f.write(original.read())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, self.caminho)
+        except OSError as e:
+            temporario.unlink(missing_ok=True)
+            log.warning(f"⚠️  Não foi possível compactar {self.caminho.name}: {e}")
+
+    def obter(self, redacao: str, modo: str) -> Dict[str, str]:
+        """Saídas já gravadas da redação no modo (nome da tarefa -> texto)"""
+        with self._lock:
+            salvas = {
+                tarefa: item['saida']
+                for tarefa, item in self._carregar().get((redacao, modo), {}).items()
+            }
+            self._reaproveitadas += len(salvas)
+        return salvas
+
+    def registrar(self, redacao: str, modo: str, tarefa: str, saida: str) -> bool:
+        """
+        Grava a saída de uma tarefa se ela for válida
+
+        Returns:
+            True se a saída foi gravada
+        """
+        if not saida_valida(tarefa, saida):
+            return False
+        item = {
+            "redacao": redacao,
+            "modo": modo,
+            "tarefa": tarefa,
+            "saida": saida,
+            "timestamp": datetime.now().isoformat(),
+        }
+        with self._lock:
+            indice = self._carregar()
+            self.registro.anexar(item)
+            indice.setdefault((redacao, modo), {})[tarefa] = item
+            self._gravadas += 1
+        return True
+
+    def liberar(self, redacao: str, modo: str) -> None:
+        """
+        Marca uma redação como concluída
+
+        As saídas saem da memória e, na próxima compactação, do arquivo.
+        """
+        with self._lock:
+            if self._carregar().pop((redacao, modo), None) is not None:
+                self.registro.anexar({"redacao": redacao, "modo": modo, "concluida": True})
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Saídas gravadas e reaproveitadas nesta execução"""
+        with self._lock:
+            return {"gravadas": self._gravadas, "reaproveitadas": self._reaproveitadas}
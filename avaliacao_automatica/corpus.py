@@ -0,0 +1,408 @@
+"""
+Corpus Compilado das Redações (CSV -> Arrow)
+
+Os CSVs de redações guardam os parágrafos e as notas por competência como
+listas Python em texto ("['parágrafo 1', ...]", "[120, 160, ...]"), e toda
+leitura refazia o ast.literal_eval. A compilação faz isso uma única vez e
+grava um armazenamento binário (Arrow IPC sem compressão, lido mapeado em
+memória) com, por redação:
+
+- idx (linha no CSV), tema_id (coluna prompt) e titulo
+- paragrafos e texto (parágrafos unidos por linha em branco)
+- competencias (inteiros) e nota
+- hash_texto (SHA-256 do texto)
+
+O compilado fica em .cache/corpus, com o SHA-256 do CSV no nome: um CSV
+alterado gera outra compilação (e a antiga é removida). No processo, um memo
+pela assinatura (mtime, tamanho) do CSV dispensa até o hash; abrir o corpus
+de novo custa uma consulta a um dicionário.
+
+Sem o pyarrow (ou com CORPUS_COMPILADO=0) o CSV é lido em blocos e cada
+redação é convertida sob demanda, como antes.
+
+Uso via linha de comando:
+    python -m avaliacao_automatica.corpus --build redacoes_prompt_3.csv redacoes_prompt_6.csv
+    python -m avaliacao_automatica.corpus --status redacoes_prompt_3.csv redacoes_prompt_6.csv
+    python -m avaliacao_automatica.corpus --invalidate
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from avaliacao_automatica.ambiente import corpus_compilado_habilitado
+from avaliacao_automatica.log_estruturado import log
+
+
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "corpus"
+
+# Incrementar ao mudar o esquema ou a normalização: compilados antigos são refeitos
+VERSAO_CORPUS = "1"
+
+# Colunas obrigatórias do CSV (prompt e title são opcionais)
+COLUNAS_OBRIGATORIAS = ('essay', 'competence', 'score')
+
+# Linhas do CSV lidas por vez (compilação e leitura sem compilado)
+TAMANHO_BLOCO_PADRAO = 500
+
+# Memo em processo: CSV (caminho absoluto) -> (assinatura do arquivo, corpus)
+_memo: Dict[Path, Tuple[Tuple[int, int], "CorpusRedacoes"]] = {}
+_memo_lock = threading.Lock()
+
+
+# ============================================================================
+# NORMALIZAÇÃO
+# ============================================================================
+
+def paragrafos_redacao(essay: Any) -> List[str]:
+    """
+    Converte o campo 'essay' ("['parágrafo 1', 'parágrafo 2', ...]") na lista
+    de parágrafos; um texto que não seja lista vira um único parágrafo
+    """
+    try:
+        paragrafos = ast.literal_eval(essay)
+    except Exception:
+        return [str(essay)]
+    if isinstance(paragrafos, (list, tuple)):
+        return [str(paragrafo) for paragrafo in paragrafos]
+    return [str(essay)]
+
+
+def competencias_redacao(competence: Any) -> List[int]:
+    """Converte o campo 'competence' ("[120, 160, ...]") em inteiros ([] se inválido)"""
+    try:
+        return [int(nota) for nota in ast.literal_eval(competence)]
+    except Exception:
+        return []
+
+
+def hash_texto(texto: str) -> str:
+    """SHA-256 do texto da redação"""
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _inteiro(valor: Any) -> Optional[int]:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalizar_redacao(idx: int, linha: Dict[str, Any]) -> Dict[str, Any]:
+    """Redação normalizada a partir de uma linha do CSV"""
+    paragrafos = paragrafos_redacao(linha['essay'])
+    texto = "\n\n".join(paragrafos)
+    titulo = linha.get('title')
+    return {
+        "idx": idx,
+        "tema_id": _inteiro(linha.get('prompt')),
+        "titulo": titulo if isinstance(titulo, str) else None,
+        "paragrafos": paragrafos,
+        "texto": texto,
+        "competencias": competencias_redacao(linha['competence']),
+        "nota": _inteiro(linha['score']),
+        "hash_texto": hash_texto(texto),
+    }
+
+
+def _blocos_csv(caminho_csv: Path, tamanho_bloco: int, colunas: Optional[List[str]] = None):
+    """Lê o CSV em blocos (DataFrames), validando as colunas obrigatórias"""
+    import pandas as pd
+
+    for bloco in pd.read_csv(caminho_csv, usecols=colunas, chunksize=tamanho_bloco):
+        faltando = [coluna for coluna in (colunas or COLUNAS_OBRIGATORIAS) if coluna not in bloco.columns]
+        if faltando:
+            raise ValueError(f"{caminho_csv}: colunas ausentes no CSV: {faltando}")
+        yield bloco
+
+
+# ============================================================================
+# COMPILAÇÃO
+# ============================================================================
+
+def pyarrow_disponivel() -> bool:
+    """Indica se o pyarrow está instalado (sem importá-lo)"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def compilacao_ativa() -> bool:
+    """Compilação ativa: pyarrow instalado e CORPUS_COMPILADO diferente de 0"""
+    return corpus_compilado_habilitado() and pyarrow_disponivel()
+
+
+def _assinatura(caminho: Path) -> Tuple[int, int]:
+    """Assinatura barata (mtime, tamanho) usada para validar o memo"""
+    stat = caminho.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _hash_arquivo(caminho: Path) -> str:
+    """Calcula o SHA-256 do conteúdo do arquivo"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _prefixo_cache(caminho_csv: Path) -> str:
+    """Prefixo dos compilados de um CSV: nome e hash do caminho (CSVs homônimos não colidem)"""
+    origem = hashlib.sha256(str(caminho_csv.resolve()).encode('utf-8')).hexdigest()[:8]
+    return f"{caminho_csv.stem}_{origem}"
+
+
+def _caminho_cache(caminho_csv: Path, digest: str) -> Path:
+    return CACHE_DIR / f"{_prefixo_cache(caminho_csv)}_{digest[:16]}_v{VERSAO_CORPUS}.arrow"
+
+
+def esquema_corpus():
+    """Esquema do armazenamento compilado"""
+    import pyarrow as pa
+
+    return pa.schema([
+        ('idx', pa.int64()),
+        ('tema_id', pa.int16()),
+        ('titulo', pa.string()),
+        ('paragrafos', pa.list_(pa.string())),
+        ('texto', pa.string()),
+        ('competencias', pa.list_(pa.int16())),
+        ('nota', pa.int16()),
+        ('hash_texto', pa.string()),
+    ])
+
+
+def compilar_corpus(caminho_csv: Path, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> Path:
+    """
+    Compila o CSV no armazenamento binário (escrita atômica, em blocos)
+
+    Args:
+        caminho_csv: CSV de redações (colunas prompt, title, essay, competence, score)
+        tamanho_bloco: Linhas do CSV lidas e gravadas por vez
+
+    Returns:
+        Caminho do compilado
+    """
+    import pyarrow as pa
+
+    caminho_csv = Path(caminho_csv)
+    digest = _hash_arquivo(caminho_csv)
+    destino = _caminho_cache(caminho_csv, digest)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    esquema = esquema_corpus()
+    colunas_origem: List[str] = []
+    temporario = destino.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with pa.OSFile(str(temporario), 'wb') as saida:
+        escritor = None
+        for bloco in _blocos_csv(caminho_csv, tamanho_bloco):
+            if escritor is None:
+                colunas_origem = [str(coluna) for coluna in bloco.columns]
+                esquema = esquema.with_metadata({
+                    'versao': VERSAO_CORPUS,
+                    'origem': caminho_csv.name,
+                    'origem_sha256': digest,
+                    'colunas_origem': json.dumps(colunas_origem, ensure_ascii=False),
+                })
+                escritor = pa.ipc.new_file(saida, esquema)
+            redacoes = [
+                normalizar_redacao(int(idx), linha)
+                for idx, linha in zip(bloco.index, bloco.to_dict('records'))
+            ]
+            escritor.write_batch(pa.RecordBatch.from_pylist(redacoes, schema=esquema))
+        if escritor is None:
+            escritor = pa.ipc.new_file(saida, esquema)
+        escritor.close()
+    os.replace(temporario, destino)
+
+    for antigo in CACHE_DIR.glob(f"{_prefixo_cache(caminho_csv)}_*.arrow"):
+        if antigo != destino:
+            antigo.unlink(missing_ok=True)
+
+    log.debug("📚 Corpus compilado: %s -> %s", caminho_csv, destino)
+    return destino
+
+
+def _abrir_compilado(caminho: Path):
+    """Abre o compilado mapeado em memória (as colunas são lidas sob demanda)"""
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(str(caminho), 'r')).read_all()
+
+
+# ============================================================================
+# ACESSO
+# ============================================================================
+
+class CorpusRedacoes:
+    """
+    Redações de um CSV, normalizadas
+
+    Com o compilado, os dados vêm da tabela Arrow mapeada em memória; sem ele,
+    do CSV lido em blocos (cada redação convertida quando é pedida).
+    """
+
+    def __init__(self, caminho_csv: Path, tabela=None):
+        self.caminho_csv = Path(caminho_csv)
+        self.tabela = tabela
+
+    @property
+    def compilado(self) -> bool:
+        return self.tabela is not None
+
+    def __len__(self) -> int:
+        if self.tabela is not None:
+            return self.tabela.num_rows
+        return sum(len(bloco) for bloco in _blocos_csv(self.caminho_csv, TAMANHO_BLOCO_PADRAO, ['score']))
+
+    @property
+    def colunas_origem(self) -> List[str]:
+        """Colunas do CSV de origem"""
+        if self.tabela is not None:
+            return json.loads(self.tabela.schema.metadata[b'colunas_origem'])
+        import pandas as pd
+        return [str(coluna) for coluna in pd.read_csv(self.caminho_csv, nrows=0).columns]
+
+    def coluna(self, nome: str) -> List[Any]:
+        """Valores de uma coluna do corpus (ex: 'nota', 'tema_id', 'titulo')"""
+        if self.tabela is not None:
+            return self.tabela.column(nome).to_pylist()
+        return [redacao[nome] for redacao in self.iterar()]
+
+    def redacao(self, idx: int) -> Dict[str, Any]:
+        """Redação da linha idx do CSV"""
+        if not 0 <= idx < len(self):
+            raise IndexError("Índice da redação inválido (fora dos limites)")
+        if self.tabela is not None:
+            return self.tabela.slice(idx, 1).to_pylist()[0]
+        return next(iter(self.iterar(ignorar=range(idx))))
+
+    def iterar(self, ignorar: Iterable[int] = (), tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre as redações em ordem, em blocos
+
+        Args:
+            ignorar: idx de redações a pular (não são convertidas nem copiadas)
+            tamanho_bloco: Redações lidas por vez
+        """
+        ignorar = set(ignorar)
+        if self.tabela is not None:
+            import numpy as np
+            import pyarrow as pa
+
+            for lote in self.tabela.to_batches(max_chunksize=tamanho_bloco):
+                if ignorar:
+                    indices = lote.column('idx').to_numpy()
+                    manter = ~np.isin(indices, np.fromiter(ignorar, dtype=np.int64, count=len(ignorar)))
+                    lote = lote.filter(pa.array(manter))
+                yield from lote.to_pylist()
+            return
+
+        for bloco in _blocos_csv(self.caminho_csv, tamanho_bloco):
+            for idx, linha in zip(bloco.index, bloco.to_dict('records')):
+                if int(idx) not in ignorar:
+                    yield normalizar_redacao(int(idx), linha)
+
+
+def abrir_corpus(caminho_csv: Path) -> CorpusRedacoes:
+    """
+    Abre o corpus de um CSV, compilando-o na primeira vez
+
+    Ordem de busca: memo em processo -> compilado em disco (hash do CSV) -> compilação.
+
+    Args:
+        caminho_csv: CSV de redações
+
+    Returns:
+        CorpusRedacoes (lido do CSV se a compilação estiver desabilitada)
+    """
+    caminho_csv = Path(caminho_csv)
+    if not compilacao_ativa():
+        return CorpusRedacoes(caminho_csv)
+
+    chave = caminho_csv.resolve()
+    assinatura = _assinatura(caminho_csv)
+    with _memo_lock:
+        entrada = _memo.get(chave)
+    if entrada is not None and entrada[0] == assinatura:
+        return entrada[1]
+
+    compilado = _caminho_cache(caminho_csv, _hash_arquivo(caminho_csv))
+    if not compilado.exists():
+        compilado = compilar_corpus(caminho_csv)
+    corpus = CorpusRedacoes(caminho_csv, _abrir_compilado(compilado))
+
+    with _memo_lock:
+        _memo[chave] = (assinatura, corpus)
+    return corpus
+
+
+def invalidar_cache() -> int:
+    """Remove os corpora compilados (disco e memo); retorna os arquivos removidos"""
+    with _memo_lock:
+        _memo.clear()
+    removidos = 0
+    if CACHE_DIR.exists():
+        for arquivo in CACHE_DIR.glob("*.arrow"):
+            arquivo.unlink(missing_ok=True)
+            removidos += 1
+    return removidos
+
+
+def status_cache(arquivos: Iterable[Path]) -> Dict[Path, str]:
+    """Estado do compilado de cada CSV ('compilado', 'ausente' ou 'csv_ausente')"""
+    estado = {}
+    for caminho_csv in map(Path, arquivos):
+        if not caminho_csv.exists():
+            estado[caminho_csv] = "csv_ausente"
+            continue
+        compilado = _caminho_cache(caminho_csv, _hash_arquivo(caminho_csv))
+        estado[caminho_csv] = "compilado" if compilado.exists() else "ausente"
+    return estado
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Gerencia o corpus compilado (pré-processado) dos CSVs de redações'
+    )
+    acao = parser.add_mutually_exclusive_group(required=True)
+    acao.add_argument('--build', action='store_true', help='Compila os CSVs indicados')
+    acao.add_argument('--invalidate', action='store_true', help='Remove todos os corpora compilados')
+    acao.add_argument('--status', action='store_true', help='Mostra se cada CSV está compilado')
+    parser.add_argument(
+        'arquivos',
+        nargs='*',
+        default=['redacoes_prompt_3.csv', 'redacoes_prompt_6.csv'],
+        help='CSVs de redações (padrão: redacoes_prompt_3.csv e redacoes_prompt_6.csv)'
+    )
+    args = parser.parse_args()
+
+    if args.invalidate:
+        print(f"🗑️  {invalidar_cache()} arquivo(s) compilado(s) removido(s)")
+        return 0
+    if args.status:
+        for caminho_csv, estado in status_cache(args.arquivos).items():
+            print(f"{caminho_csv}: {estado}")
+        return 0
+
+    if not pyarrow_disponivel():
+        print("❌ pyarrow não instalado. Instale com: pip install pyarrow")
+        return 1
+    for caminho_csv in map(Path, args.arquivos):
+        if not caminho_csv.exists():
+            print(f"❌ Arquivo não encontrado: {caminho_csv}")
+            return 1
+        destino = compilar_corpus(caminho_csv)
+        print(f"✅ {caminho_csv}: {len(abrir_corpus(caminho_csv))} redações -> {destino} "
+              f"({destino.stat().st_size / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
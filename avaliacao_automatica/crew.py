@@ -6,12 +6,199 @@ Implementação da Arquitetura Multi-Agente com Flow para Avaliação Paralela
 from crewai import Agent, Crew, Process, Task, LLM
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List, Dict, Any
+from crewai.tasks.task_output import TaskOutput
+from typing import List, Dict, Any, Optional, Tuple
 
 # Importar o carregador de manuais
-from avaliacao_automatica.manual_loader import load_manual_simple
+from avaliacao_automatica.manual_loader import load_manual, preaquecer_manuais
+from avaliacao_automatica.ambiente import cache_llm_habilitado, llm_simulado_selecionado
+from avaliacao_automatica.cache_llm import LLMComCache
+from avaliacao_automatica.checkpoint_tarefas import (
+    TAREFA_CONSOLIDACAO,
+    CheckpointTarefas,
+    assinatura_execucao,
+    chave_redacao,
+)
+from avaliacao_automatica.extracao_json import (
+    ConsolidacaoIncompleta,
+    ajustar_nota,
+    extrair_json_tolerante,
+    resumo_deterministico,
+    validar_consolidacao,
+)
+from avaliacao_automatica.instrumentacao import LLMInstrumentado, MedidorTarefas
+from avaliacao_automatica.llm_delegado import llm_real
+from avaliacao_automatica.llm_simulado import LLMSimulado
+from avaliacao_automatica.saidas_estruturadas import (
+    REPERGUNTAS_PADRAO,
+    AvaliacaoCompetencia,
+    AvaliacaoConsolidada,
+    ConversorLocal,
+    guardrail_saida,
+)
+from avaliacao_automatica.log_estruturado import log, saida_detalhada
+from avaliacao_automatica.lote import (
+    INSTRUCOES_LOTE,
+    ORCAMENTO_TOKENS_LOTE,
+    SAIDA_LOTE,
+    TAMANHO_LOTE_PADRAO,
+    descricao_lote,
+    dividir_em_lotes,
+    estimar_tokens_prefixo,
+    extrair_lista_json,
+    formatar_redacoes_lote,
+    indexar_por_redacao,
+)
+from avaliacao_automatica.indice_manuais import (
+    ORCAMENTO_TOKENS_PADRAO,
+    TOP_K_PADRAO,
+    recuperar_trechos,
+    resumir_economia,
+)
 
+import copy
+import hashlib
+import json
+import logging
 import os
+import threading
+import uuid
+from pathlib import Path
+
+import yaml
+
+
+# ============================================================================
+# CONSOLIDAÇÃO LOCAL (sem chamada ao LLM do Presidente da Banca)
+# ============================================================================
+
+def extrair_json_saida(saida: Any) -> Optional[Dict[str, Any]]:
+    """
+    Extrai o dicionário JSON da saída de uma tarefa (TaskOutput ou texto)
+    
+    Usa json_dict quando disponível; caso contrário extrai, de forma
+    tolerante, o objeto JSON mais externo do texto (ver extracao_json).
+    
+    Returns:
+        Dict com a saída ou None se não for possível interpretá-la
+    """
+    json_dict = getattr(saida, 'json_dict', None)
+    if isinstance(json_dict, dict):
+        return json_dict
+    return extrair_json_tolerante(saida)
+
+
+def consolidar_avaliacoes(
+    saidas_competencias: List[Any],
+    tema: str,
+    modo_rag: bool
+) -> Dict[str, Any]:
+    """
+    Constrói o resultado consolidado (formato da tarefa_consolidacao) em Python
+    
+    Args:
+        saidas_competencias: Saídas das 5 tarefas de competência, em ordem
+            (TaskOutput, dict ou texto JSON)
+        tema: Tema da redação
+        modo_rag: True = com_rag, False = baseline
+        
+    Returns:
+        Dict com competencias, nota_final (soma das notas ajustadas),
+        modo_avaliacao e resumo_executivo
+        
+    Raises:
+        ValueError: Se alguma competência estiver ausente ou sem nota
+    """
+    if len(saidas_competencias) != 5:
+        raise ValueError(f"Esperadas 5 saídas de competência, recebidas: {len(saidas_competencias)}")
+    
+    competencias: Dict[str, Dict[str, Any]] = {}
+    notas_ajustadas = []
+    
+    for numero, saida in enumerate(saidas_competencias, 1):
+        dados = saida if isinstance(saida, dict) else extrair_json_saida(saida)
+        if dados is None or 'nota' not in dados:
+            raise ValueError(f"Saída da competência {numero} sem JSON válido com 'nota'")
+        
+        nota = ajustar_nota(dados['nota'])
+        # A nota já pode ter sido ajustada pelo modelo da tarefa (nota_original)
+        nota_original = dados.get('nota_original', dados['nota'])
+        if str(nota) != str(nota_original).strip():
+            notas_ajustadas.append({
+                "competencia": numero,
+                "nota_original": nota_original,
+                "nota_ajustada": nota,
+            })
+        
+        competencias[f"competencia_{numero}"] = {
+            "nota": nota,
+            "justificativa": dados.get('justificativa', ''),
+        }
+    
+    nota_final = sum(dados['nota'] for dados in competencias.values())
+    
+    avaliacao = {
+        "avaliacao_id": str(uuid.uuid4()),
+        "tema": tema,
+        "modo_avaliacao": "com_rag" if modo_rag else "baseline",
+        "competencias": competencias,
+        "nota_final": nota_final,
+        "resumo_executivo": resumo_deterministico(competencias, nota_final),
+        "status": "completa",
+        "consolidacao": "local",
+    }
+    if notas_ajustadas:
+        avaliacao["notas_ajustadas"] = notas_ajustadas
+    
+    return avaliacao
+
+
+# ============================================================================
+# CONFIGURAÇÕES YAML (interpretadas uma vez por processo)
+# ============================================================================
+
+_configs_yaml: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_configs_lock = threading.Lock()
+
+
+def carregar_config_yaml(caminho: Path) -> Dict[str, Any]:
+    """
+    Lê agents.yaml/tasks.yaml uma vez por processo
+    
+    O CrewBase relê e interpreta os dois YAMLs a cada BancaExaminadora().
+    Aqui o conteúdo interpretado fica em memória (e é relido se o arquivo
+    mudar); cada banca recebe uma cópia (ver BancaExaminadora.__init__), pois
+    o CrewBase substitui os nomes de agentes e tarefas da configuração pelas
+    instâncias da banca.
+    
+    Raises:
+        FileNotFoundError: Se o arquivo não existir (tratado pelo CrewBase)
+    """
+    caminho = Path(caminho)
+    estado = caminho.stat()
+    assinatura = (estado.st_mtime_ns, estado.st_size)
+    
+    with _configs_lock:
+        entrada = _configs_yaml.get(str(caminho))
+    if entrada is None or entrada[0] != assinatura:
+        with open(caminho, encoding='utf-8') as f:
+            conteudo = yaml.safe_load(f)
+        entrada = (assinatura, conteudo if isinstance(conteudo, dict) else {})
+        with _configs_lock:
+            _configs_yaml[str(caminho)] = entrada
+    
+    return copy.deepcopy(entrada[1])
+
+
+DIRETORIO_CONFIG = Path(__file__).parent / "config"
+
+
+def hash_templates() -> str:
+    """SHA-256 dos templates dos prompts (agents.yaml e tasks.yaml)"""
+    sha = hashlib.sha256()
+    for nome in ("agents.yaml", "tasks.yaml"):
+        sha.update((DIRETORIO_CONFIG / nome).read_bytes())
+    return sha.hexdigest()
 
 
 @CrewBase
@@ -23,19 +210,91 @@ class BancaExaminadora():
     - 5 Agentes Especialistas (um para cada competência)
     - 1 Agente Consolidador (Presidente da Banca)
     - Processo Sequencial com context sharing
+    - Modo paralelo opcional: as 5 competências executam simultaneamente
     """
 
     agents: List[BaseAgent]
     tasks: List[Task]
     
-    # Configuração do LLM
-    llm = LLM(
-        model=os.environ.get("MODEL", "gemini-2.5-flash"),
-        temperature=0.1
-    )
+    # Configuração do LLM (MODEL=simulado: LLM local, sem rede, para medições)
+    if llm_simulado_selecionado():
+        llm = LLMSimulado(model=os.environ["MODEL"])
+    else:
+        llm = LLM(
+            model=os.environ.get("MODEL", "gemini-2.5-flash"),
+            temperature=0.1
+        )
+    
+    # Cache de respostas do LLM (CACHE_LLM=1): prompts idênticos não chamam a API
+    if cache_llm_habilitado():
+        llm = LLMComCache(llm)
     
     # Controle do modo RAG (True = com manual, False = baseline)
     modo_rag: bool = True
+    
+    # Controle do modo paralelo (True = 5 competências simultâneas, False = sequencial)
+    modo_paralelo: bool = os.environ.get("MODO_PARALELO", "").lower() in ("1", "true", "sim")
+    
+    # Consolidação local (True = soma em Python, sem chamar o Presidente da Banca)
+    consolidacao_local: bool = os.environ.get("CONSOLIDACAO_LOCAL", "").lower() in ("1", "true", "sim")
+    
+    # Reperguntas a uma tarefa cuja saída não segue o modelo (só a ela)
+    reperguntas_formato: int = REPERGUNTAS_PADRAO
+    
+    # Resumo executivo escrito pelo LLM na consolidação local (chamada extra opcional)
+    resumo_com_llm: bool = False
+    
+    # Recuperação de trechos (True = top-k trechos do manual, False = manual inteiro)
+    recuperacao_trechos: bool = os.environ.get("RECUPERACAO_TRECHOS", "").lower() in ("1", "true", "sim")
+    top_k_trechos: int = TOP_K_PADRAO
+    orcamento_tokens_manual: int = ORCAMENTO_TOKENS_PADRAO
+    
+    # Economia de tokens da última avaliação com recuperação de trechos
+    estatisticas_recuperacao: Optional[Dict[str, Any]] = None
+    
+    # Arquivo onde a tarefa_consolidacao grava o resultado (um por banca/worker)
+    arquivo_saida: Optional[str] = 'resultado_avaliacao.json'
+    
+    # Avaliação em lote: até tamanho_lote redações por chamada de competência
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO
+    orcamento_tokens_lote: int = ORCAMENTO_TOKENS_LOTE
+    
+    # Métricas (tokens, tempo, retentativas, cache) por tarefa da última avaliação
+    metricas_execucao: Optional[Dict[str, Any]] = None
+    _medidor: Optional[MedidorTarefas] = None
+    
+    # Checkpoint por tarefa: saídas válidas gravadas ao terminar e reaproveitadas
+    # quando a mesma redação é reavaliada (None = desligado)
+    checkpoint: Optional[CheckpointTarefas] = None
+    _checkpoint_atual: Optional[Tuple[str, str]] = None
+    
+    _crew_competencias: Optional[Crew] = None
+    _crew_lote: Optional[Crew] = None
+    _tarefas_lote: Optional[List[Task]] = None
+    
+    def __init__(
+        self,
+        agents_config: Optional[Dict[str, Any]] = None,
+        tasks_config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            agents_config: Conteúdo já interpretado de agents.yaml (padrão: o
+                arquivo lido uma vez por processo, ver carregar_config_yaml)
+            tasks_config: Conteúdo já interpretado de tasks.yaml (idem)
+        """
+        configs = {'agents.yaml': agents_config, 'tasks.yaml': tasks_config}
+        
+        def carregar(caminho: Path) -> Dict[str, Any]:
+            config = configs.get(Path(caminho).name)
+            if config is None:
+                return carregar_config_yaml(caminho)
+            return copy.deepcopy(config)
+        
+        # O CrewBase carrega as configurações logo após este __init__, pelo
+        # load_yaml da instância; a classe do CrewAI não é alterada, e se ele
+        # deixar de usar esse gancho os YAMLs só voltam a ser relidos
+        self.load_yaml = carregar
 
     # ========================================================================
     # AGENTES ESPECIALISTAS
@@ -46,7 +305,7 @@ class BancaExaminadora():
         """Agente I: O Gramático - Especialista em Competência I"""
         return Agent(
             config=self.agents_config['agente_gramatica'], # type: ignore[index]
-            verbose=True,
+            verbose=saida_detalhada(),
             llm=self.llm
         )
 
@@ -55,7 +314,7 @@ class BancaExaminadora():
         """Agente II: O Estruturalista - Especialista em Competência II"""
         return Agent(
             config=self.agents_config['agente_estrutura'], # type: ignore[index]
-            verbose=True,
+            verbose=saida_detalhada(),
             llm=self.llm
         )
 
@@ -64,7 +323,7 @@ class BancaExaminadora():
         """Agente III: O Argumentador - Especialista em Competência III"""
         return Agent(
             config=self.agents_config['agente_argumentacao'], # type: ignore[index]
-            verbose=True,
+            verbose=saida_detalhada(),
             llm=self.llm
         )
     
@@ -73,7 +332,7 @@ class BancaExaminadora():
         """Agente IV: O Linguista - Especialista em Competência IV"""
         return Agent(
             config=self.agents_config['agente_coesao'], # type: ignore[index]
-            verbose=True,
+            verbose=saida_detalhada(),
             llm=self.llm
         )
     
@@ -82,7 +341,7 @@ class BancaExaminadora():
         """Agente V: O Intervencionista - Especialista em Competência V"""
         return Agent(
             config=self.agents_config['agente_proposta'], # type: ignore[index]
-            verbose=True,
+            verbose=saida_detalhada(),
             llm=self.llm
         )
     
@@ -91,7 +350,7 @@ class BancaExaminadora():
         """Agente VI: Presidente da Banca - Consolidador"""
         return Agent(
             config=self.agents_config['presidente_banca'], # type: ignore[index]
-            verbose=True,
+            verbose=saida_detalhada(),
             llm=self.llm
         )
 
@@ -111,19 +370,46 @@ class BancaExaminadora():
         """
         if not self.modo_rag:
             if competencia == 1:  # Mensagem apenas na primeira vez
-                print("⚠️  MODO BASELINE: Não serão carregados os manuais das competências")
+                log.info("⚠️  MODO BASELINE: Não serão carregados os manuais das competências")
             return "[MODO BASELINE: Avalie utilizando seu conhecimento prévio sobre os critérios de avaliação do ENEM. NÃO há manual de referência disponível.]"
         
-        # Carregar manual do PDF
-        print(f"📚 Carregando manual da Competência {competencia}...")
-        manual_text = load_manual_simple(competencia)
+        # Carregar manual (memo em processo -> cache em disco -> PDF)
+        log.debug("📚 Carregando manual da Competência %s...", competencia)
+        manual_text = load_manual(competencia)
         return manual_text
     
+    def _carregar_manuais_recuperados(self, redacao: str, tema: str) -> Dict[str, str]:
+        """
+        Recupera apenas os trechos do manual relevantes para a redação
+        
+        Registra em self.estatisticas_recuperacao a economia de tokens em
+        relação à injeção do manual completo.
+        """
+        manuais = {}
+        estatisticas = {}
+        for competencia in range(1, 6):
+            texto, estatisticas[competencia] = recuperar_trechos(
+                competencia,
+                redacao,
+                tema,
+                top_k=self.top_k_trechos,
+                orcamento_tokens=self.orcamento_tokens_manual
+            )
+            manuais[f'manual_competencia{competencia}'] = texto
+        
+        self.estatisticas_recuperacao = resumir_economia(estatisticas)
+        log.info(f"🔎 Recuperação de trechos: {self.estatisticas_recuperacao['tokens_injetados']} tokens "
+                 f"injetados de {self.estatisticas_recuperacao['tokens_manual_completo']} "
+                 f"({self.estatisticas_recuperacao['percentual_economia']}% de economia)")
+        return manuais
+    
     @task
     def tarefa_competencia1(self) -> Task:
         """Task: Avaliar Competência I (Gramática)"""
         return Task(
             config=self.tasks_config['tarefa_competencia1'], # type: ignore[index]
+            callback=self._gravar_saida_tarefa,
+            **self._saida_estruturada(AvaliacaoCompetencia, competencia=1)
         )
 
     @task
@@ -131,6 +417,8 @@ class BancaExaminadora():
         """Task: Avaliar Competência II (Tema e Estrutura)"""
         return Task(
             config=self.tasks_config['tarefa_competencia2'], # type: ignore[index]
+            callback=self._gravar_saida_tarefa,
+            **self._saida_estruturada(AvaliacaoCompetencia, competencia=2)
         )
 
     @task
@@ -138,6 +426,8 @@ class BancaExaminadora():
         """Task: Avaliar Competência III (Argumentação)"""
         return Task(
             config=self.tasks_config['tarefa_competencia3'], # type: ignore[index]
+            callback=self._gravar_saida_tarefa,
+            **self._saida_estruturada(AvaliacaoCompetencia, competencia=3)
         )
     
     @task
@@ -145,6 +435,8 @@ class BancaExaminadora():
         """Task: Avaliar Competência IV (Coesão)"""
         return Task(
             config=self.tasks_config['tarefa_competencia4'], # type: ignore[index]
+            callback=self._gravar_saida_tarefa,
+            **self._saida_estruturada(AvaliacaoCompetencia, competencia=4)
         )
     
     @task
@@ -152,6 +444,8 @@ class BancaExaminadora():
         """Task: Avaliar Competência V (Proposta)"""
         return Task(
             config=self.tasks_config['tarefa_competencia5'], # type: ignore[index]
+            callback=self._gravar_saida_tarefa,
+            **self._saida_estruturada(AvaliacaoCompetencia, competencia=5)
         )
     
     @task
@@ -159,9 +453,55 @@ class BancaExaminadora():
         """Task: Consolidar todas as avaliações"""
         return Task(
             config=self.tasks_config['tarefa_consolidacao'], # type: ignore[index]
-            output_file='resultado_avaliacao.json'
+            output_file=self.arquivo_saida,
+            callback=self._gravar_saida_tarefa,
+            **self._saida_estruturada(
+                AvaliacaoConsolidada,
+                reparar=self._reparar_consolidacao,
+                modo_avaliacao=self._modo_avaliacao,  # a mesma tarefa serve aos dois modos
+            )
         )
 
+    def _saida_estruturada(self, modelo: type, reparar: Any = None, **fixos: Any) -> Dict[str, Any]:
+        """
+        Opções de Task que ligam a saída ao modelo tipado (ver saidas_estruturadas)
+        
+        O esquema do modelo entra no prompt, a conversão é local e o
+        guardrail normaliza a saída ou repergunta apenas a esta tarefa.
+        """
+        return {
+            "output_pydantic": modelo,
+            "converter_cls": ConversorLocal.com_fixos(**fixos),
+            "guardrail": guardrail_saida(modelo, reparar, self._descartar_resposta_em_cache, **fixos),
+            "guardrail_max_retries": self.reperguntas_formato,
+        }
+    
+    def _descartar_resposta_em_cache(self) -> None:
+        """Tira do cache do LLM (se houver) a resposta rejeitada pelo guardrail"""
+        descartar = getattr(self.llm, 'descartar_ultima_resposta', None)
+        if callable(descartar):
+            descartar()
+    
+    def _reparar_consolidacao(self, saida: TaskOutput) -> Optional[AvaliacaoConsolidada]:
+        """
+        Consolida localmente as competências quando a saída do Presidente não tem conserto
+        
+        As saídas das competências (já validadas e pagas) estão nas tarefas
+        de contexto; somá-las em Python evita reperguntar ao Presidente.
+        """
+        try:
+            local = consolidar_avaliacoes(
+                [tarefa.output for tarefa in self._tarefas_competencias()],
+                (extrair_json_tolerante(saida.raw) or {}).get('tema', ''),
+                self.modo_rag
+            )
+        except (TypeError, ValueError) as e:
+            log.error(f"   ❌ Competências também sem nota válida: {e}")
+            return None
+        log.warning("⚠️  Saída do Presidente sem as 5 notas - consolidando as saídas das competências")
+        local["consolidacao"] = "local (saída do Presidente inválida)"
+        return AvaliacaoConsolidada.model_validate(local)
+
     # ========================================================================
     # CREW - ORQUESTRAÇÃO
     # ========================================================================
@@ -178,13 +518,77 @@ class BancaExaminadora():
         4. Avalia Competência 4
         5. Avalia Competência 5
         6. Consolida resultados (recebe context das 5 anteriores)
+        
+        No modo paralelo (ver _configurar_execucao) as tarefas 1-5 são
+        assíncronas: executam simultaneamente e a consolidação aguarda todas.
         """
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True,
-            output_log_file=True,
+            verbose=saida_detalhada(),
+            output_log_file=saida_detalhada(),
+            stream=False
+        )
+    
+    def crew_competencias(self) -> Crew:
+        """
+        Cria (uma vez por instância) a crew apenas com as 5 competências
+        
+        Usada na consolidação local: a tarefa_consolidacao e o Presidente da
+        Banca ficam de fora e o resultado final é montado por
+        consolidar_avaliacoes().
+        """
+        if self._crew_competencias is None:
+            # O Crew valida que termina com no máximo uma tarefa assíncrona;
+            # o modo de execução é reaplicado por _configurar_execucao()
+            tarefas = self._tarefas_competencias()
+            for tarefa in tarefas:
+                tarefa.async_execution = False
+            
+            self._crew_competencias = Crew(
+                agents=[tarefa.agent for tarefa in tarefas],
+                tasks=tarefas,
+                process=Process.sequential,
+                verbose=saida_detalhada(),
+                output_log_file=saida_detalhada(),
+                stream=False
+            )
+        return self._crew_competencias
+    
+    def crew_lote(self) -> Crew:
+        """
+        Cria (uma vez por instância) a crew de avaliação em lote
+        
+        Mesmos agentes e descrições das 5 competências, mas cada tarefa recebe
+        várias redações no campo {redacao} e responde com um array JSON.
+        """
+        if self._crew_lote is None:
+            tarefas = self._tarefas_em_lote()
+            self._crew_lote = Crew(
+                agents=[tarefa.agent for tarefa in tarefas],
+                tasks=tarefas,
+                process=Process.sequential,
+                verbose=saida_detalhada(),
+                output_log_file=saida_detalhada(),
+                stream=False
+            )
+        return self._crew_lote
+    
+    def _crew_parcial(self, tarefas: List[Task]) -> Crew:
+        """
+        Cria uma crew só com as tarefas que faltam de uma redação (retomada)
+        
+        Tarefas de competência fora da crew entram no contexto da consolidação
+        pela saída reaproveitada do checkpoint (ver _reaproveitar_saidas).
+        """
+        for tarefa in tarefas:
+            tarefa.async_execution = False
+        return Crew(
+            agents=list({id(tarefa.agent): tarefa.agent for tarefa in tarefas}.values()),
+            tasks=tarefas,
+            process=Process.sequential,
+            verbose=saida_detalhada(),
             stream=False
         )
     
@@ -192,6 +596,124 @@ class BancaExaminadora():
     # MÉTODOS AUXILIARES
     # ========================================================================
     
+    def preparar_crews(self) -> None:
+        """
+        Constrói antecipadamente a crew usada por avaliar_redacao
+        
+        Agentes, tarefas e crews são memoizados por instância: depois disso,
+        cada redação apenas interpola seus inputs nas tarefas já existentes.
+        """
+        if self.consolidacao_local:
+            self.crew_competencias()
+        else:
+            self.crew()
+    
+    def _tarefas_em_lote(self) -> List[Task]:
+        """Cria (uma vez por instância) as 5 tarefas de competência em lote"""
+        if self._tarefas_lote is None:
+            self._tarefas_lote = [
+                Task(
+                    name=f"tarefa_lote_competencia{numero}",
+                    description=descricao_lote(self.tasks_config[f'tarefa_competencia{numero}']['description']), # type: ignore[index]
+                    expected_output=SAIDA_LOTE,
+                    agent=tarefa.agent,
+                )
+                for numero, tarefa in enumerate(self._tarefas_competencias(), 1)
+            ]
+        return self._tarefas_lote
+    
+    def _tarefas_competencias(self) -> List[Task]:
+        """Retorna as 5 tarefas de competência (instâncias memoizadas)"""
+        return [
+            self.tarefa_competencia1(),
+            self.tarefa_competencia2(),
+            self.tarefa_competencia3(),
+            self.tarefa_competencia4(),
+            self.tarefa_competencia5(),
+        ]
+    
+    def _agentes(self) -> List[Agent]:
+        """Retorna os 6 agentes da banca (instâncias memoizadas)"""
+        return [
+            self.agente_gramatica(),
+            self.agente_estrutura(),
+            self.agente_argumentacao(),
+            self.agente_coesao(),
+            self.agente_proposta(),
+            self.presidente_banca(),
+        ]
+    
+    def usar_llm(self, llm: Any) -> None:
+        """
+        Troca o LLM da banca, inclusive nos agentes já criados
+        
+        O CrewBase cria os agentes na construção da banca com o LLM da classe;
+        atribuir apenas self.llm não alcançaria esses agentes.
+        """
+        if self._medidor is not None and not isinstance(llm, LLMInstrumentado):
+            llm = LLMInstrumentado(llm, self._medidor)
+        self.llm = llm
+        for agente in self._agentes():
+            agente.llm = llm
+    
+    def _iniciar_medicao(self) -> None:
+        """Instrumenta o LLM da banca (na primeira vez) e zera as métricas"""
+        if self._medidor is None:
+            self._medidor = MedidorTarefas()
+            self.usar_llm(LLMInstrumentado(self.llm, self._medidor))
+        self._medidor.iniciar()
+        self.metricas_execucao = None
+    
+    def _finalizar_medicao(self) -> None:
+        if self._medidor is not None:
+            self.metricas_execucao = self._medidor.resumo()
+    
+    def _modo_avaliacao(self) -> str:
+        """Modo da avaliação em andamento, como registrado nos resultados"""
+        return "com_rag" if self.modo_rag else "baseline"
+    
+    def _assinatura_execucao(self) -> str:
+        """Modelo, backend do LLM e templates: saídas de outra execução não são reaproveitadas"""
+        llm = llm_real(self.llm)
+        backend = (
+            f"{type(llm).__module__}.{type(llm).__name__}"
+            f"|{getattr(llm, 'provider', '')}|{getattr(llm, 'temperature', '')}"
+        )
+        return assinatura_execucao(str(getattr(llm, 'model', '')), backend, hash_templates())
+    
+    def _gravar_saida_tarefa(self, saida: TaskOutput) -> None:
+        """Callback das tarefas: grava a saída no checkpoint assim que a tarefa termina"""
+        atual = self._checkpoint_atual
+        if self.checkpoint is None or atual is None or not saida.name:
+            return
+        if not self.checkpoint.registrar(*atual, saida.name, saida.raw):
+            log.warning(f"⚠️  Saída inválida de {saida.name} - não reaproveitável")
+    
+    def _reaproveitar_saidas(self, tarefas: List[Task], salvas: Dict[str, str]) -> None:
+        """Atribui às tarefas já concluídas a saída gravada (contexto da consolidação)"""
+        for tarefa in tarefas:
+            if tarefa.name in salvas:
+                tarefa.output = TaskOutput(
+                    description=tarefa.description,
+                    name=tarefa.name,
+                    expected_output=tarefa.expected_output,
+                    raw=salvas[tarefa.name],
+                    agent=tarefa.agent.role if tarefa.agent else "",
+                )
+    
+    def _configurar_execucao(self, tarefas: Optional[List[Task]] = None) -> None:
+        """
+        Aplica o modo de execução (sequencial ou paralelo) às tarefas de competência.
+        
+        As tarefas são memoizadas pelo CrewBase, então o modo é aplicado a cada
+        avaliação em vez de na construção, permitindo alternar entre os modos
+        na mesma instância. Com async_execution=True o processo sequencial do
+        CrewAI dispara as 5 tarefas em threads e só as aguarda ao chegar na
+        tarefa síncrona de consolidação.
+        """
+        for tarefa in tarefas or self._tarefas_competencias():
+            tarefa.async_execution = self.modo_paralelo
+    
     def preparar_inputs_com_rag(
         self, 
         redacao: str, 
@@ -202,6 +724,11 @@ class BancaExaminadora():
         """
         Prepara os inputs para o crew, incluindo os manuais (RAG) e textos de apoio
         
+        Tema, textos de apoio e manuais não dependem da redação: para o mesmo
+        tema e modo geram o mesmo texto, que nas tarefas fica antes de {redacao}
+        (prefixo fixo do prompt). Só a recuperação de trechos varia o manual
+        por redação.
+        
         Args:
             redacao: Texto da redação a ser avaliada
             tema: Tema da redação
@@ -217,17 +744,29 @@ class BancaExaminadora():
         if not textos_apoio or textos_apoio.strip() == "":
             textos_apoio = "[Nenhum texto de apoio fornecido]"
         
+        # Extrai em paralelo os manuais ainda fora do cache (só na partida a frio)
+        if modo_rag:
+            preaquecer_manuais()
+        
         inputs = {
             'redacao': redacao,
             'tema': tema,
             'textos_apoio': textos_apoio,
-            'manual_competencia1': self._carregar_manual(1),
-            'manual_competencia2': self._carregar_manual(2),
-            'manual_competencia3': self._carregar_manual(3),
-            'manual_competencia4': self._carregar_manual(4),
-            'manual_competencia5': self._carregar_manual(5),
+            'modo_avaliacao': self._modo_avaliacao(),
         }
         
+        self.estatisticas_recuperacao = None
+        if modo_rag and self.recuperacao_trechos:
+            inputs.update(self._carregar_manuais_recuperados(redacao, tema))
+        else:
+            inputs.update({
+                'manual_competencia1': self._carregar_manual(1),
+                'manual_competencia2': self._carregar_manual(2),
+                'manual_competencia3': self._carregar_manual(3),
+                'manual_competencia4': self._carregar_manual(4),
+                'manual_competencia5': self._carregar_manual(5),
+            })
+        
         return inputs
     
     def avaliar_redacao(
@@ -235,7 +774,8 @@ class BancaExaminadora():
         redacao: str,
         tema: str,
         textos_apoio: str = "",
-        modo_rag: bool = True
+        modo_rag: bool = True,
+        modo_paralelo: bool | None = None
     ) -> Dict[str, Any] | None:
         """
         Método principal para avaliar uma redação
@@ -245,53 +785,266 @@ class BancaExaminadora():
             tema: Tema proposto
             textos_apoio: Textos de apoio fornecidos ao estudante (contexto)
             modo_rag: True = Experimento A (com RAG), False = Experimento B (baseline)
+            modo_paralelo: True = competências simultâneas, False = sequencial,
+                None = mantém o valor atual de self.modo_paralelo
             
         Returns:
             Dict com resultado da avaliação
         """
-        print("=" * 80)
-        print(f"🎓 BANCA EXAMINADORA DIGITAL - Modo: {'RAG' if modo_rag else 'BASELINE'}")
-        print("=" * 80)
-        print(f"📝 Tema: {tema}")
-        print(f"📄 Tamanho da redação: {len(redacao)} caracteres")
-        print(f"📋 Textos de apoio: {'Sim' if textos_apoio else 'Não'}")
-        print("=" * 80)
+        if modo_paralelo is not None:
+            self.modo_paralelo = modo_paralelo
+        
+        if log.isEnabledFor(logging.INFO):
+            log.info("=" * 80)
+            log.info(f"🎓 BANCA EXAMINADORA DIGITAL - Modo: {'RAG' if modo_rag else 'BASELINE'}"
+                     f" | Execução: {'PARALELA' if self.modo_paralelo else 'SEQUENCIAL'}")
+            log.info("=" * 80)
+            log.info(f"📝 Tema: {tema}")
+            log.info(f"📄 Tamanho da redação: {len(redacao)} caracteres")
+            log.info(f"📋 Textos de apoio: {'Sim' if textos_apoio else 'Não'}")
+            log.info("=" * 80)
         
         # Preparar inputs com ou sem manuais
         inputs = self.preparar_inputs_com_rag(redacao, tema, textos_apoio, modo_rag)
         
-        # Executar a crew
-        resultado = self.crew().kickoff(inputs=inputs)
+        # Saídas de uma tentativa anterior desta redação (checkpoint por tarefa)
+        salvas: Dict[str, str] = {}
+        if self.checkpoint is not None:
+            variante = "com_rag" if modo_rag else "baseline"
+            if modo_rag and self.recuperacao_trechos:
+                variante += "_trechos"
+            self._checkpoint_atual = (chave_redacao(tema, redacao, self._assinatura_execucao()), variante)
+            salvas = self.checkpoint.obter(*self._checkpoint_atual)
+            if salvas:
+                log.info(f"♻️  Retomando a redação: {len(salvas)} tarefa(s) reaproveitada(s) do checkpoint")
+        
+        # Tokens, tempo e retentativas por tarefa ficam em self.metricas_execucao
+        self._iniciar_medicao()
+        try:
+            if self.consolidacao_local:
+                avaliacao = self._avaliar_com_consolidacao_local(inputs, tema, modo_rag, salvas)
+            else:
+                avaliacao = self._avaliar_com_presidente(inputs, salvas)
+            if self._checkpoint_atual is not None:
+                self.checkpoint.liberar(*self._checkpoint_atual)  # type: ignore[union-attr]
+            return avaliacao
+        finally:
+            self._checkpoint_atual = None
+            self._finalizar_medicao()
+    
+    def _executar_competencias(self, inputs: Dict[str, Any], salvas: Dict[str, str]) -> List[Any]:
+        """
+        Executa as competências que faltam e devolve as 5 saídas, em ordem
+        
+        Saídas reaproveitadas do checkpoint vêm como texto; as demais como
+        TaskOutput (consolidar_avaliacoes aceita os dois).
+        """
+        tarefas = self._tarefas_competencias()
+        pendentes = [tarefa for tarefa in tarefas if tarefa.name not in salvas]
+        novas: Dict[str, Any] = {}
+        if pendentes:
+            banca_crew = self.crew_competencias() if len(pendentes) == len(tarefas) else self._crew_parcial(pendentes)
+            self._configurar_execucao(pendentes)
+            resultado = banca_crew.kickoff(inputs=inputs)
+            novas = {tarefa.name: saida for tarefa, saida in zip(pendentes, resultado.tasks_output)}
+        return [salvas[tarefa.name] if tarefa.name in salvas else novas[tarefa.name] for tarefa in tarefas]
+    
+    def _avaliar_com_presidente(self, inputs: Dict[str, Any], salvas: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Executa a crew completa (5 competências + Presidente da Banca)
+        
+        Numa retomada, só as tarefas ausentes do checkpoint são executadas; as
+        competências já concluídas entram no contexto do Presidente pela
+        saída gravada.
         
-        print("=" * 80)
-        print("✅ AVALIAÇÃO CONCLUÍDA")
-        print("=" * 80)
+        A saída do Presidente chega validada pelo guardrail da tarefa
+        (AvaliacaoConsolidada). Se ela não trouxer as 5 notas, as saídas das
+        competências (já pagas) são consolidadas localmente em vez de
+        descartar a avaliação (ver _reparar_consolidacao).
+        
+        Raises:
+            ConsolidacaoIncompleta: Se a saída final não tiver as 5 notas
+                (com as notas recuperadas)
+        """
+        salvas = salvas or {}
+        modo_avaliacao = self._modo_avaliacao()
+        competencias = self._tarefas_competencias()
+        
+        if TAREFA_CONSOLIDACAO in salvas:
+            texto_bruto = salvas[TAREFA_CONSOLIDACAO]
+            return validar_consolidacao(extrair_json_tolerante(texto_bruto), texto_bruto, inputs['tema'], modo_avaliacao)[0]
+        
+        # Executar a crew (inteira ou só com as tarefas que faltam)
+        if salvas:
+            pendentes = [tarefa for tarefa in competencias if tarefa.name not in salvas]
+            self._reaproveitar_saidas(competencias, salvas)
+            banca_crew = self._crew_parcial(pendentes + [self.tarefa_consolidacao()])
+            self._configurar_execucao(pendentes)
+        else:
+            banca_crew = self.crew()
+            self._configurar_execucao()
+        resultado = banca_crew.kickoff(inputs=inputs)
+        
+        log.info("✅ AVALIAÇÃO CONCLUÍDA")
         
         # DEBUG: Verificar tipo do resultado
-        print(f"🔍 DEBUG: Tipo do resultado: {type(resultado)}")
-        print(f"🔍 DEBUG: Resultado tem json_dict? {hasattr(resultado, 'json_dict')}")
+        log.debug("🔍 DEBUG: Tipo do resultado: %s", type(resultado))
+        log.debug("🔍 DEBUG: Resultado tem json_dict? %s", hasattr(resultado, 'json_dict'))
+        
+        texto_bruto = getattr(resultado, 'raw', None) or ""
+        dados = getattr(resultado, 'json_dict', None)
+        if dados is None:
+            log.warning("⚠️  AVISO: json_dict retornou None! Extraindo o JSON de resultado.raw")
+            dados = extrair_json_tolerante(texto_bruto)
         
-        # Tentar extrair o JSON do resultado
-        resultado_json = resultado.json_dict # type: ignore
+        avaliacao, faltando = validar_consolidacao(dados, texto_bruto, inputs['tema'], modo_avaliacao)
+        if avaliacao.get("reparos"):
+            log.warning(f"🩹 Saída do Presidente reparada: {'; '.join(avaliacao['reparos'])}")
+        if faltando:
+            raise ConsolidacaoIncompleta(avaliacao, faltando)
         
-        if resultado_json is None:
-            print("⚠️  AVISO: json_dict retornou None! Tentando alternativas...")
+        # Com o guardrail o CrewAI grava no output_file a resposta original
+        self._gravar_arquivo_saida(avaliacao)
+        return avaliacao
+    
+    def avaliar_lote(
+        self,
+        redacoes: List[tuple],
+        tema: str,
+        textos_apoio: str = "",
+        modo_rag: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Avalia várias redações do mesmo tema com uma chamada por competência
+        
+        As redações são divididas em lotes de até self.tamanho_lote que caibam
+        em self.orcamento_tokens_lote. O resultado de cada redação é
+        consolidado localmente (mesmo formato de consolidar_avaliacoes).
+        
+        Args:
+            redacoes: Lista de (id, texto da redação)
+            tema: Tema das redações
+            textos_apoio: Textos de apoio fornecidos ao estudante
+            modo_rag: True = com manuais, False = baseline
             
-            # Tentar pegar o raw do resultado
-            if hasattr(resultado, 'raw'):
-                print("   Tentando usar resultado.raw")
-                resultado_json = resultado.raw # type: ignore
-            elif hasattr(resultado, 'json'):
-                print("   Tentando usar resultado.json")
-                resultado_json = resultado.json # type: ignore
-            elif hasattr(resultado, 'output'):
-                print("   Tentando usar resultado.output")
-                resultado_json = resultado.output # type: ignore
-            else:
-                print("   ❌ Nenhuma alternativa funcionou!")
+        Returns:
+            Dict id (texto) -> avaliação consolidada. Redações ausentes ou
+            incompletas na resposta ficam de fora, para serem reavaliadas
+            individualmente pelo chamador.
+        """
+        if not redacoes:
+            return {}
+        
+        # Prefixo fixo estimado a partir da primeira redação
+        inputs = self.preparar_inputs_com_rag(redacoes[0][1], tema, textos_apoio, modo_rag)
+        tokens_prefixo = estimar_tokens_prefixo(
+            [self.tasks_config[f'tarefa_competencia{n}']['description'] for n in range(1, 6)], # type: ignore[index]
+            [inputs[f'manual_competencia{n}'] for n in range(1, 6)],
+            inputs['textos_apoio'],
+            tema,
+            INSTRUCOES_LOTE
+        )
+        lotes = dividir_em_lotes(
+            redacoes,
+            tokens_prefixo,
+            tamanho_maximo=self.tamanho_lote,
+            orcamento_tokens=self.orcamento_tokens_lote
+        )
+        
+        log.info(f"📦 AVALIAÇÃO EM LOTE - Modo: {'RAG' if modo_rag else 'BASELINE'} | "
+                 f"{len(redacoes)} redações em {len(lotes)} lote(s) "
+                 f"(prefixo estimado: {tokens_prefixo} tokens)")
+        
+        avaliacoes: Dict[str, Dict[str, Any]] = {}
+        self._iniciar_medicao()
+        try:
+            for lote in lotes:
+                inputs = self.preparar_inputs_com_rag(
+                    formatar_redacoes_lote(lote), tema, textos_apoio, modo_rag
+                )
+                banca_crew = self.crew_lote()
+                self._configurar_execucao(self._tarefas_em_lote())
+                resultado = banca_crew.kickoff(inputs=inputs)
                 
-        print(f"🔍 DEBUG: Resultado final é None? {resultado_json is None}")
-        if resultado_json is not None:
-            print(f"🔍 DEBUG: Tipo do resultado_json: {type(resultado_json)}")
+                por_competencia = [
+                    indexar_por_redacao(extrair_lista_json(saida))
+                    for saida in resultado.tasks_output
+                ]
+                
+                for redacao_id, _ in lote:
+                    chave = str(redacao_id)
+                    saidas = [respostas.get(chave) for respostas in por_competencia]
+                    faltando = [n for n, saida in enumerate(saidas, 1) if saida is None]
+                    if faltando:
+                        log.warning(f"⚠️  Redação {chave} ausente no lote (competências {faltando})")
+                        continue
+                    try:
+                        avaliacao = consolidar_avaliacoes(saidas, tema, modo_rag)
+                    except (TypeError, ValueError) as e:
+                        log.warning(f"⚠️  Redação {chave} com resposta inválida no lote: {e}")
+                        continue
+                    avaliacao["lote"] = {"tamanho": len(lote)}
+                    avaliacoes[chave] = avaliacao
+        finally:
+            # Métricas de todos os lotes desta chamada (rateadas pelo chamador)
+            self._finalizar_medicao()
         
-        return resultado_json
+        log.info(f"✅ LOTE CONCLUÍDO - {len(avaliacoes)}/{len(redacoes)} redações avaliadas")
+        return avaliacoes
+    
+    def _avaliar_com_consolidacao_local(
+        self,
+        inputs: Dict[str, Any],
+        tema: str,
+        modo_rag: bool,
+        salvas: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Executa apenas as 5 competências e consolida o resultado em Python
+        
+        Economiza a chamada ao Presidente da Banca (1 de 6 chamadas ao LLM)
+        e elimina o JSON consolidado mal formatado como fonte de erro. Numa
+        retomada, só as competências ausentes do checkpoint são executadas.
+        """
+        avaliacao = consolidar_avaliacoes(self._executar_competencias(inputs, salvas or {}), tema, modo_rag)
+        
+        if self.resumo_com_llm:
+            avaliacao["resumo_executivo"] = self.gerar_resumo_executivo(avaliacao)
+        
+        self._gravar_arquivo_saida(avaliacao)
+        
+        log.info(f"✅ AVALIAÇÃO CONCLUÍDA (consolidação local) - Nota final: {avaliacao['nota_final']}")
+        
+        return avaliacao
+    
+    def _gravar_arquivo_saida(self, avaliacao: Dict[str, Any]) -> None:
+        """Grava a avaliação consolidada no output_file da tarefa_consolidacao"""
+        output_file = self.tarefa_consolidacao().output_file
+        if output_file:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(avaliacao, f, ensure_ascii=False, indent=2)
+    
+    def gerar_resumo_executivo(self, avaliacao: Dict[str, Any]) -> str:
+        """
+        Gera, sob demanda, um resumo executivo escrito pelo LLM
+        
+        Recebe apenas as notas e justificativas já consolidadas, portanto é uma
+        chamada curta e não interfere nas notas. Em caso de falha, mantém o
+        resumo determinístico.
+        """
+        linhas = [
+            f"- Competência {chave.rsplit('_', 1)[1]}: {dados['nota']} - {dados['justificativa']}"
+            for chave, dados in avaliacao["competencias"].items()
+        ]
+        prompt = (
+            f"Tema da redação: {avaliacao['tema']}\n"
+            f"Nota final: {avaliacao['nota_final']}/1000\n"
+            "Avaliações por competência:\n" + "\n".join(linhas) + "\n\n"
+            "Escreva um resumo executivo de até 5 frases desta avaliação, em português. "
+            "Responda apenas com o texto do resumo."
+        )
+        try:
+            return str(self.llm.call(prompt)).strip()
+        except Exception as e:
+            log.warning(f"⚠️  Falha ao gerar resumo executivo com o LLM: {e}")
+            return avaliacao["resumo_executivo"]
@@ -0,0 +1,394 @@
+"""
+Extração Tolerante de JSON das Saídas dos Agentes
+
+As respostas do LLM nem sempre são JSON puro: vêm com texto antes e depois,
+blocos de código markdown, vírgulas sobrando, quebras de linha cruas dentro
+das strings, literais do Python (True/None) ou cortadas no meio. Em vez de
+descartar a avaliação inteira (seis chamadas ao LLM), o extrator percorre a
+saída uma única vez, isola o objeto JSON mais externo balanceado e corrige
+esses defeitos. O validador confere o resultado contra o formato da
+tarefa_consolidacao e recupera as notas de cada competência que puderem
+ser aproveitadas.
+"""
+
+import ast
+import json
+import math
+import numbers
+import re
+import uuid
+from typing import Any, Dict, List, Tuple
+
+
+NOTAS_VALIDAS = (0, 40, 80, 120, 160, 200)
+
+# Distância máxima até a nota válida mais próxima para a nota ser ajustada
+# (abaixo de meio passo da escala: um ponto médio como 100 é ambíguo e rejeitado)
+TOLERANCIA_NOTA = 10
+
+# Tentativas de início de objeto (ex: chaves citadas no texto antes do JSON)
+TENTATIVAS_INICIO = 8
+
+# Vírgulas anteriores testadas ao cortar um trecho final truncado
+RECUOS_TRUNCAMENTO = 4
+
+_FECHAMENTO = {'{': '}', '[': ']'}
+_LITERAIS_PYTHON = {'True': 'true', 'False': 'false', 'None': 'null'}
+_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+# Próximo caractere que exige tratamento dentro e fora de strings
+_ESPECIAL_STRING = re.compile(r'["\\\n\r\t]')
+_ESPECIAL_FORA = re.compile(r'["{}\[\],]|\b(?:True|False|None)\b')
+
+# Chaves de competência aceitas: competencia_1, Competência 1, C1, comp1, ...
+_CHAVE_COMPETENCIA = re.compile(r'^(?:compet\w*|comp|c)[\s_\-.]*([1-5])$', re.IGNORECASE)
+
+# Nota de uma competência citada no texto bruto (último recurso)
+_NOTA_NO_TEXTO = re.compile(
+    r'\bcompet[^\W\d_]*[\s_\-]*([1-5])\b\W{0,20}?(?:\{[^{}]*?)?"?nota"?\s*[:=]\s*"?\b(\d{1,3})\b',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+class ConsolidacaoIncompleta(ValueError):
+    """Consolidação sem nota válida para alguma competência
+
+    Attributes:
+        avaliacao: Avaliação normalizada com as competências recuperadas
+        faltando: Números das competências sem nota
+    """
+
+    def __init__(self, avaliacao: Dict[str, Any], faltando: List[int]):
+        self.avaliacao = avaliacao
+        self.faltando = faltando
+        super().__init__(f"Consolidação sem nota válida para as competências {faltando}")
+
+
+def ajustar_nota(nota: Any) -> int:
+    """
+    Ajusta uma nota para o valor válido mais próximo (0, 40, 80, 120, 160 ou 200)
+
+    Aceita números e strings numéricas (ex: "160", "160 pontos", "1.000").
+    Só notas a até TOLERANCIA_NOTA de um valor válido são ajustadas
+    (ex: 155 -> 160); as demais (ex: 100, 1000, -50) são rejeitadas.
+
+    Raises:
+        ValueError: Se a nota não for um número (ex: None, True, lista) ou
+            estiver fora da escala
+    """
+    original = nota
+    if isinstance(nota, bool) or not isinstance(nota, (numbers.Real, str)):
+        raise ValueError(f"Nota sem valor numérico: {nota!r}")
+    if isinstance(nota, str):
+        match = re.search(r'-?\d+(?:[.,]\d+)*', nota)
+        if not match:
+            raise ValueError(f"Nota sem valor numérico: {nota!r}")
+        nota = match.group(0)
+        if re.fullmatch(r'-?\d{1,3}(?:([.,])\d{3})(?:\1\d{3})*', nota):
+            # Separador de milhar (ex: "1.000")
+            nota = re.sub(r'[.,]', '', nota)
+        elif ',' in nota:
+            nota = nota.replace('.', '').replace(',', '.')
+    valor = float(nota)
+    valida = min(NOTAS_VALIDAS, key=lambda valida: (abs(valida - valor), valida))
+    if not (math.isfinite(valor) and abs(valida - valor) <= TOLERANCIA_NOTA):
+        raise ValueError(f"Nota fora da escala (0 a 200, de 40 em 40): {original!r}")
+    return valida
+
+
+def resumo_deterministico(competencias: Dict[str, Dict[str, Any]], nota_final: int) -> str:
+    """Gera um resumo executivo simples a partir das notas (sem LLM)"""
+    notas = {int(chave.rsplit('_', 1)[1]): dados['nota'] for chave, dados in competencias.items()}
+    maior = max(notas, key=notas.get)  # type: ignore[arg-type]
+    menor = min(notas, key=notas.get)  # type: ignore[arg-type]
+    return (
+        f"Nota final {nota_final}/1000. "
+        f"Melhor desempenho na Competência {maior} ({notas[maior]}); "
+        f"pior desempenho na Competência {menor} ({notas[menor]})."
+    )
+
+
+# ============================================================================
+# EXTRAÇÃO
+# ============================================================================
+
+def _varrer(texto: str, inicio: int) -> Tuple[str, List[Tuple[int, str]], str, int]:
+    """
+    Percorre o texto a partir de um '{' ou '[' e reescreve o trecho balanceado
+
+    No caminho remove vírgulas antes de '}' / ']', escapa quebras de linha e
+    tabulações cruas dentro de strings e troca True/False/None pelos literais
+    JSON. Os trechos sem caracteres especiais são copiados de uma vez (busca
+    por expressão regular), então o custo é próximo ao de uma leitura.
+
+    Returns:
+        (trecho reescrito, pontos de corte [(posição, fechamento)] nas
+        vírgulas, fechamento pendente (com '"' se terminou dentro de uma
+        string; vazio se o trecho está balanceado), posição seguinte ao fim)
+    """
+    saida: List[str] = []
+    tamanho = 0
+    pilha: List[str] = []
+    cortes: List[Tuple[int, str]] = []
+    em_string = False
+    i = inicio
+    n = len(texto)
+
+    def anexar(parte: str) -> None:
+        nonlocal tamanho
+        saida.append(parte)
+        tamanho += len(parte)
+
+    while i < n:
+        if em_string:
+            match = _ESPECIAL_STRING.search(texto, i)
+            if match is None:
+                anexar(texto[i:])
+                i = n
+                break
+            if match.start() > i:
+                anexar(texto[i:match.start()])
+            c = match.group()
+            if c == '\\':
+                anexar(texto[match.start():match.start() + 2])
+                i = match.start() + 2
+                continue
+            if c == '"':
+                em_string = False
+                anexar(c)
+            else:
+                anexar(_ESCAPES[c])
+            i = match.end()
+            continue
+
+        match = _ESPECIAL_FORA.search(texto, i)
+        if match is None:
+            anexar(texto[i:])
+            i = n
+            break
+        if match.start() > i:
+            anexar(texto[i:match.start()])
+        c = match.group()
+        i = match.end()
+
+        if c == '"':
+            em_string = True
+            anexar(c)
+        elif c in _FECHAMENTO:
+            pilha.append(_FECHAMENTO[c])
+            anexar(c)
+        elif c in '}]':
+            if not pilha or pilha[-1] != c:
+                # Fechamento que não corresponde: o objeto termina aqui
+                i = match.start()
+                break
+            while saida and not saida[-1].strip():
+                tamanho -= len(saida.pop())
+            if saida and saida[-1].rstrip().endswith(','):
+                ultimo = saida.pop()
+                tamanho -= len(ultimo)
+                ultimo = ultimo.rstrip()[:-1]
+                if ultimo:
+                    anexar(ultimo)
+            pilha.pop()
+            anexar(c)
+            if not pilha:
+                return ''.join(saida), cortes, '', i
+        elif c == ',':
+            cortes.append((tamanho, ''.join(reversed(pilha))))
+            anexar(c)
+        else:
+            anexar(_LITERAIS_PYTHON.get(c, c))
+
+    # Fim do texto (ou fechamento inválido) com estruturas abertas: truncado
+    pendente = ''.join(reversed(pilha))
+    return ''.join(saida), cortes, ('"' if em_string else '') + pendente, i
+
+
+def _interpretar(trecho: str) -> Any:
+    try:
+        return json.loads(trecho, strict=False)
+    except json.JSONDecodeError:
+        pass
+    # Dicionário no formato do Python (aspas simples)
+    try:
+        return ast.literal_eval(trecho)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def _completar_truncado(trecho: str, cortes: List[Tuple[int, str]], pendente: str) -> Any:
+    """
+    Fecha um trecho truncado; se não bastar, recua até vírgulas anteriores
+
+    Um número ou literal cortado (ex: 160 -> "16") nunca é aproveitado: o
+    item incompleto é descartado.
+    """
+    if pendente.startswith('"'):
+        # Dentro de uma string: só um escape cortado ao meio precisa sair
+        final = trecho[:-1] if re.search(r'(?<!\\)(?:\\\\)*\\$', trecho) else trecho
+    else:
+        final = re.sub(r'[\s,:]+$', '', trecho)
+    if pendente.startswith('"') or not re.search(r'[\w.+\-]$', final):
+        dados = _interpretar(final + pendente)
+        if dados is not None:
+            return dados
+    for posicao, fechamento in reversed(cortes[-RECUOS_TRUNCAMENTO:]):
+        dados = _interpretar(trecho[:posicao] + fechamento)
+        if dados is not None:
+            return dados
+    return None
+
+
+def extrair_json_tolerante(texto: Any, abertura: str = '{') -> Any:
+    """
+    Extrai o objeto (ou array) JSON mais externo de uma saída do LLM
+
+    Ignora texto e marcadores markdown ao redor e corrige vírgulas sobrando,
+    quebras de linha cruas em strings, literais do Python e saídas truncadas
+    (fecha strings e estruturas abertas, descartando o último item se
+    estiver incompleto).
+
+    Args:
+        texto: Saída do LLM (texto, TaskOutput ou dict já interpretado)
+        abertura: '{' para objeto ou '[' para array
+
+    Returns:
+        Objeto interpretado (dict ou list) ou None se nenhum trecho for válido
+    """
+    tipo = dict if abertura == '{' else list
+    if isinstance(texto, tipo):
+        return texto
+    texto = getattr(texto, 'raw', texto)
+    if not isinstance(texto, str):
+        return None
+
+    posicao = texto.find(abertura)
+    for _ in range(TENTATIVAS_INICIO):
+        if posicao == -1:
+            return None
+        trecho, cortes, pendente, fim = _varrer(texto, posicao)
+        if pendente:
+            dados = _completar_truncado(trecho, cortes, pendente)
+        else:
+            dados = _interpretar(trecho)
+        if isinstance(dados, tipo):
+            return dados
+        posicao = texto.find(abertura, posicao + 1)
+    return None
+
+
+# ============================================================================
+# VALIDAÇÃO DA CONSOLIDAÇÃO
+# ============================================================================
+
+def _competencias_informadas(dados: Dict[str, Any]) -> Dict[int, Any]:
+    """Competências do JSON (em 'competencias' ou no nível de cima), por número"""
+    encontradas: Dict[int, Any] = {}
+    fontes = [dados]
+    if isinstance(dados.get('competencias'), dict):
+        fontes.insert(0, dados['competencias'])
+    elif isinstance(dados.get('competencias'), list):
+        fontes.insert(0, {f"competencia_{i}": item for i, item in enumerate(dados['competencias'], 1)})
+
+    for fonte in fontes:
+        for chave, valor in fonte.items():
+            match = _CHAVE_COMPETENCIA.match(str(chave).strip())
+            if match and int(match.group(1)) not in encontradas:
+                encontradas[int(match.group(1))] = valor
+    return encontradas
+
+
+def validar_consolidacao(
+    dados: Any,
+    texto_bruto: str = "",
+    tema: str = "",
+    modo_avaliacao: str = ""
+) -> Tuple[Dict[str, Any], List[int]]:
+    """
+    Normaliza uma avaliação consolidada e recupera as notas por competência
+
+    Aceita competências fora de 'competencias', com chaves variantes
+    (ex: "Competência 1", "C1"), notas como texto ou próximas de um valor
+    válido (ajustadas, ver ajustar_nota) e, em último caso, notas citadas no
+    texto bruto. Notas fora da escala contam como faltando. A nota final é
+    sempre a soma das 5 notas.
+
+    Args:
+        dados: JSON extraído da saída (dict) ou None
+        texto_bruto: Saída original, usada para recuperar notas não encontradas
+        tema: Tema usado se a saída não trouxer o campo
+        modo_avaliacao: 'com_rag' ou 'baseline' (o modo da execução prevalece sobre
+            o informado na saída)
+
+    Returns:
+        (avaliação normalizada, competências sem nota). A avaliação registra
+        em "reparos" o que foi corrigido.
+    """
+    dados = dados if isinstance(dados, dict) else {}
+    reparos: List[str] = []
+    notas_ajustadas: List[Dict[str, Any]] = []
+    competencias: Dict[str, Dict[str, Any]] = {}
+
+    informadas = _competencias_informadas(dados)
+    for numero in range(1, 6):
+        valor = informadas.get(numero)
+        justificativa = ""
+        if isinstance(valor, dict):
+            nota_original = valor.get('nota')
+            justificativa = valor.get('justificativa', '')
+        else:
+            nota_original = valor
+        if nota_original is None:
+            continue
+        try:
+            nota = ajustar_nota(nota_original)
+        except (TypeError, ValueError):
+            continue
+        if str(nota) != str(nota_original).strip():
+            notas_ajustadas.append({
+                "competencia": numero,
+                "nota_original": nota_original,
+                "nota_ajustada": nota,
+            })
+        competencias[f"competencia_{numero}"] = {"nota": nota, "justificativa": justificativa}
+
+    if len(competencias) < 5 and texto_bruto:
+        for match in _NOTA_NO_TEXTO.finditer(texto_bruto):
+            chave = f"competencia_{match.group(1)}"
+            if chave not in competencias:
+                try:
+                    nota = ajustar_nota(match.group(2))
+                except ValueError:
+                    continue
+                competencias[chave] = {"nota": nota, "justificativa": ""}
+                reparos.append(f"nota da {chave} recuperada do texto")
+
+    competencias = dict(sorted(competencias.items()))
+    faltando = [n for n in range(1, 6) if f"competencia_{n}" not in competencias]
+
+    avaliacao: Dict[str, Any] = {
+        **{chave: valor for chave, valor in dados.items() if not _CHAVE_COMPETENCIA.match(str(chave).strip())},
+        "avaliacao_id": dados.get('avaliacao_id') or str(uuid.uuid4()),
+        "tema": dados.get('tema') or tema,
+        "modo_avaliacao": modo_avaliacao or dados.get('modo_avaliacao') or "",
+        "competencias": competencias,
+    }
+    if modo_avaliacao and dados.get('modo_avaliacao') not in (None, "", modo_avaliacao):
+        reparos.append(f"modo_avaliacao corrigido ({dados['modo_avaliacao']} -> {modo_avaliacao})")
+
+    if not faltando:
+        nota_final = sum(item['nota'] for item in competencias.values())
+        if str(dados.get('nota_final', '')).strip() != str(nota_final):
+            if 'nota_final' in dados:
+                reparos.append(f"nota_final recalculada ({dados['nota_final']} -> {nota_final})")
+        avaliacao["nota_final"] = nota_final
+        if not avaliacao.get('resumo_executivo'):
+            avaliacao["resumo_executivo"] = resumo_deterministico(competencias, nota_final)
+        avaliacao.setdefault("status", "completa")
+
+    if notas_ajustadas:
+        avaliacao["notas_ajustadas"] = notas_ajustadas
+    if reparos:
+        avaliacao["reparos"] = reparos
+    return avaliacao, faltando
@@ -0,0 +1,79 @@
+"""
+Fábrica de Bancas (crews pré-construídas e reutilizadas)
+
+Construir uma BancaExaminadora cria 6 agentes, 6 tarefas e a crew. A
+fábrica faz isso uma única vez por thread e configuração e devolve a mesma
+banca para as redações seguintes, que só interpolam seus inputs nas tarefas
+já existentes. Como o CrewAI altera as tarefas durante a execução (descrição
+interpolada, modo assíncrono), uma banca nunca é compartilhada entre threads.
+"""
+
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional
+
+if TYPE_CHECKING:
+    from avaliacao_automatica.crew import BancaExaminadora
+
+
+class FabricaBancas:
+    """
+    Entrega uma banca pré-construída por (thread, chave de configuração)
+
+    Args:
+        configurar: Função chamada com (banca, número da banca) logo após a
+            construção, antes de as crews serem montadas (LLM, modos, arquivo
+            de saída, ...)
+    """
+
+    def __init__(self, configurar: Optional[Callable[["BancaExaminadora", int], None]] = None):
+        self.configurar = configurar
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._contador = itertools.count(1)
+        self._bancas = 0
+        self._reutilizacoes = 0
+        self._construcao_segundos = 0.0
+
+    def obter(self, chave: Hashable = None) -> "BancaExaminadora":
+        """Retorna a banca desta thread para a configuração `chave` (criando-a na primeira vez)"""
+        bancas: Optional[Dict[Hashable, "BancaExaminadora"]] = getattr(self._local, 'bancas', None)
+        if bancas is None:
+            bancas = self._local.bancas = {}
+
+        banca = bancas.get(chave)
+        if banca is not None:
+            with self._lock:
+                self._reutilizacoes += 1
+            return banca
+
+        # O CrewAI só é importado quando a primeira banca é de fato necessária
+        from avaliacao_automatica.crew import BancaExaminadora
+
+        inicio = time.perf_counter()
+        with self._lock:
+            numero = next(self._contador)
+        banca = BancaExaminadora()
+        if self.configurar is not None:
+            self.configurar(banca, numero)
+        banca.preparar_crews()
+        duracao = time.perf_counter() - inicio
+
+        with self._lock:
+            self._bancas += 1
+            self._construcao_segundos += duracao
+        bancas[chave] = banca
+        return banca
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Bancas construídas, tempo de construção e quantas vezes foram reutilizadas"""
+        with self._lock:
+            return {
+                "bancas": self._bancas,
+                "reutilizacoes": self._reutilizacoes,
+                "construcao_segundos": round(self._construcao_segundos, 3),
+                "construcao_media_segundos": (
+                    round(self._construcao_segundos / self._bancas, 3) if self._bancas else 0.0
+                ),
+            }
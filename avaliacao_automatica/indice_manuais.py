@@ -0,0 +1,198 @@
+"""
+Índice de Recuperação sobre os Manuais das Competências ENEM
+
+Em vez de injetar o manual inteiro em cada prompt, divide cada manual em
+trechos (uma única vez por processo), indexa com TF-IDF (scikit-learn) e,
+para cada redação e competência, injeta apenas os top-k trechos mais
+relevantes respeitando um orçamento de tokens.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Tuple
+
+from avaliacao_automatica.manual_loader import load_manual
+
+
+# Termos que orientam a busca para os critérios de cada competência
+CONSULTAS_COMPETENCIA = {
+    1: "domínio da modalidade escrita formal norma culta desvios gramaticais "
+       "ortografia acentuação pontuação concordância regência estrutura sintática nível pontos",
+    2: "compreensão da proposta tema tangenciamento fuga ao tema texto dissertativo-argumentativo "
+       "repertório sociocultural estrutura introdução desenvolvimento conclusão nível pontos",
+    3: "selecionar relacionar organizar interpretar informações fatos opiniões argumentos "
+       "ponto de vista projeto de texto autoria nível pontos",
+    4: "mecanismos linguísticos coesão conectivos articulação referenciação repetição "
+       "operadores argumentativos parágrafos nível pontos",
+    5: "proposta de intervenção agente ação modo meio efeito finalidade detalhamento "
+       "direitos humanos nível pontos",
+}
+
+TAMANHO_TRECHO = 1200        # caracteres por trecho (aproximado)
+SOBREPOSICAO_TRECHO = 200    # caracteres repetidos entre trechos vizinhos
+TOP_K_PADRAO = 6
+ORCAMENTO_TOKENS_PADRAO = 2000
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa simples de tokens (~4 caracteres por token)"""
+    return (len(texto) + 3) // 4
+
+
+def dividir_em_trechos(
+    texto: str,
+    tamanho: int = TAMANHO_TRECHO,
+    sobreposicao: int = SOBREPOSICAO_TRECHO
+) -> List[str]:
+    """
+    Divide o texto do manual em trechos de ~`tamanho` caracteres
+
+    Respeita parágrafos sempre que possível; parágrafos maiores que o
+    tamanho são quebrados em janelas com sobreposição.
+    """
+    paragrafos = [p.strip() for p in re.split(r'\n\s*\n', texto) if p.strip()]
+    trechos: List[str] = []
+    atual = ""
+
+    for paragrafo in paragrafos:
+        if len(paragrafo) > tamanho:
+            if atual:
+                trechos.append(atual)
+                atual = ""
+            passo = max(tamanho - sobreposicao, 1)
+            for inicio in range(0, len(paragrafo), passo):
+                trechos.append(paragrafo[inicio:inicio + tamanho])
+                if inicio + tamanho >= len(paragrafo):
+                    break
+            continue
+
+        if atual and len(atual) + len(paragrafo) + 2 > tamanho:
+            trechos.append(atual)
+            atual = ""
+        atual = f"{atual}\n\n{paragrafo}" if atual else paragrafo
+
+    if atual:
+        trechos.append(atual)
+
+    return trechos
+
+
+class IndiceManual:
+    """Índice TF-IDF dos trechos de um manual de competência"""
+
+    def __init__(self, competencia_id: int, texto_manual: str):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.competencia_id = competencia_id
+        self.trechos = dividir_em_trechos(texto_manual)
+        self.tokens_manual = estimar_tokens(texto_manual)
+        self.vetorizador = TfidfVectorizer(
+            strip_accents='unicode',
+            lowercase=True,
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+        )
+        self.matriz = self.vetorizador.fit_transform(self.trechos)
+
+    def buscar(
+        self,
+        consulta: str,
+        top_k: int = TOP_K_PADRAO,
+        orcamento_tokens: int = ORCAMENTO_TOKENS_PADRAO
+    ) -> List[Tuple[int, str]]:
+        """
+        Retorna até top_k trechos (posição, texto) mais similares à consulta
+
+        Os trechos são escolhidos por similaridade e devolvidos na ordem em
+        que aparecem no manual; trechos que estourariam o orçamento são pulados.
+        """
+        vetor = self.vetorizador.transform([consulta])
+        # Vetores TF-IDF são normalizados (L2): produto escalar = cosseno
+        similaridades = (self.matriz @ vetor.T).toarray().ravel()
+        ordem = similaridades.argsort()[::-1]
+
+        selecionados: List[int] = []
+        tokens = 0
+        for posicao in ordem[:max(top_k, 0)]:
+            custo = estimar_tokens(self.trechos[posicao])
+            if selecionados and tokens + custo > orcamento_tokens:
+                continue
+            selecionados.append(int(posicao))
+            tokens += custo
+
+        return [(posicao, self.trechos[posicao]) for posicao in sorted(selecionados)]
+
+
+_indices: Dict[int, IndiceManual] = {}
+_indices_lock = threading.Lock()
+
+
+def obter_indice(competencia_id: int) -> IndiceManual:
+    """Retorna o índice da competência, construindo-o na primeira chamada"""
+    with _indices_lock:
+        indice = _indices.get(competencia_id)
+        if indice is None:
+            indice = IndiceManual(competencia_id, load_manual(competencia_id))
+            _indices[competencia_id] = indice
+        return indice
+
+
+def recuperar_trechos(
+    competencia_id: int,
+    redacao: str,
+    tema: str,
+    top_k: int = TOP_K_PADRAO,
+    orcamento_tokens: int = ORCAMENTO_TOKENS_PADRAO
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Recupera os trechos do manual mais relevantes para a redação
+
+    Args:
+        competencia_id: Número da competência (1 a 5)
+        redacao: Texto da redação
+        tema: Tema da redação
+        top_k: Número máximo de trechos
+        orcamento_tokens: Limite (estimado) de tokens injetados
+
+    Returns:
+        Tupla (texto a injetar no prompt, estatísticas da recuperação)
+    """
+    indice = obter_indice(competencia_id)
+    consulta = f"{CONSULTAS_COMPETENCIA[competencia_id]} {tema} {redacao}"
+    trechos = indice.buscar(consulta, top_k=top_k, orcamento_tokens=orcamento_tokens)
+
+    texto = "\n\n[...]\n\n".join(trecho for _, trecho in trechos)
+    texto = (
+        f"[Trechos mais relevantes do manual da Competência {competencia_id} "
+        f"({len(trechos)} de {len(indice.trechos)})]\n\n{texto}"
+    )
+
+    estatisticas = {
+        "trechos": [posicao for posicao, _ in trechos],
+        "tokens_injetados": estimar_tokens(texto),
+        "tokens_manual_completo": indice.tokens_manual,
+    }
+    return texto, estatisticas
+
+
+def resumir_economia(estatisticas: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Resume a economia de tokens de uma avaliação (5 competências)
+
+    Args:
+        estatisticas: Dict competencia_id -> estatísticas de recuperar_trechos
+
+    Returns:
+        Dict com tokens injetados, tokens do manual completo e economia
+    """
+    injetados = sum(e["tokens_injetados"] for e in estatisticas.values())
+    completos = sum(e["tokens_manual_completo"] for e in estatisticas.values())
+    return {
+        "tokens_injetados": injetados,
+        "tokens_manual_completo": completos,
+        "tokens_economizados": completos - injetados,
+        "percentual_economia": round(100 * (completos - injetados) / completos, 1) if completos else 0.0,
+        "trechos_por_competencia": {
+            f"competencia_{c}": e["trechos"] for c, e in sorted(estatisticas.items())
+        },
+    }
@@ -0,0 +1,184 @@
+"""
+Instrumentação das Chamadas ao LLM (tokens e latência por tarefa)
+
+Cada banca envolve seu LLM num LLMInstrumentado, que registra, por tarefa
+(tarefa_competencia1..5, tarefa_consolidacao, ...), as chamadas feitas,
+tokens de entrada e saída, tempo de parede, retentativas e acertos do
+cache. Os tokens vêm do uso que o provedor informa para a própria chamada,
+capturado na thread que a fez: chamadas simultâneas no mesmo LLM (tarefas
+paralelas, workers, modos RAG e baseline) não trocam tokens entre si. Uma
+resposta do cache não é cobrada, e quando o provedor não informa uso algum
+os tokens são estimados (~4 caracteres por token).
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from avaliacao_automatica.indice_manuais import estimar_tokens
+from avaliacao_automatica.llm_delegado import LLMDelegado, llm_real
+from avaliacao_automatica.metricas_tarefas import CAMPOS_SOMADOS, novas_metricas
+
+
+# Chamada em andamento em cada thread (recebe o uso de tokens informado pelo provedor)
+_chamada_atual = threading.local()
+_gancho_lock = threading.Lock()
+
+
+def _ler_uso(uso: Any, *chaves: str) -> int:
+    """Lê um contador de tokens de um dict ou objeto de uso do provedor"""
+    for chave in chaves:
+        valor = uso.get(chave) if isinstance(uso, dict) else getattr(uso, chave, None)
+        if valor:
+            return int(valor)
+    return 0
+
+
+def _instalar_gancho_tokens(llm: Any) -> None:
+    """
+    Envolve o registro de uso de tokens do LLM real (uma vez por instância)
+
+    Os provedores do CrewAI registram o uso de cada resposta em
+    _track_token_usage_internal, na thread que fez a chamada, e não o expõem
+    por chamada em nenhuma API pública (get_token_usage_summary só traz o
+    acumulado, compartilhado pelas chamadas simultâneas). O gancho soma esse
+    uso ao registro da chamada em andamento na thread. Um LLM sem esse método
+    não é envolvido, e suas chamadas ficam com tokens estimados.
+    """
+    base = llm_real(llm)
+    with _gancho_lock:
+        original = getattr(base, '_track_token_usage_internal', None)
+        if not callable(original) or getattr(original, '_gancho_instrumentacao', False):
+            return
+
+        def rastrear(usage_data: Any) -> None:
+            original(usage_data)
+            registro = getattr(_chamada_atual, 'registro', None)
+            if registro is None:
+                return
+            prompt_tokens = _ler_uso(usage_data, "prompt_tokens", "prompt_token_count", "input_tokens")
+            completion_tokens = _ler_uso(
+                usage_data, "completion_tokens", "candidates_token_count", "output_tokens"
+            )
+            registro["prompt_tokens"] += prompt_tokens
+            registro["completion_tokens"] += completion_tokens
+            registro["uso_informado"] |= bool(prompt_tokens or completion_tokens)
+
+        rastrear._gancho_instrumentacao = True  # type: ignore[attr-defined]
+        base._track_token_usage_internal = rastrear
+
+
+class MedidorTarefas:
+    """Acumula as métricas por tarefa de uma avaliação (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tarefas: Dict[str, Dict[str, Any]] = {}
+
+    def iniciar(self) -> None:
+        """Descarta as métricas da avaliação anterior"""
+        with self._lock:
+            self._tarefas = {}
+
+    def registrar(
+        self,
+        tarefa: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        duracao: float,
+        acerto_cache: bool = False,
+        falhou: bool = False,
+        estimado: bool = False
+    ) -> None:
+        with self._lock:
+            metricas = self._tarefas.setdefault(tarefa, novas_metricas())
+            metricas["chamadas"] += 1
+            metricas["retentativas"] = metricas["chamadas"] - 1
+            metricas["falhas"] += int(falhou)
+            metricas["acertos_cache"] += int(acerto_cache)
+            metricas["prompt_tokens"] += prompt_tokens
+            metricas["completion_tokens"] += completion_tokens
+            metricas["total_tokens"] += prompt_tokens + completion_tokens
+            metricas["duracao_segundos"] += duracao
+            if estimado:
+                metricas["tokens_estimados"] = True
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas por tarefa e o total da avaliação
+
+        Returns:
+            Dict {"tarefas": {nome: métricas}, "total": métricas somadas}
+        """
+        with self._lock:
+            tarefas = {nome: dict(metricas) for nome, metricas in self._tarefas.items()}
+
+        total = novas_metricas()
+        for metricas in tarefas.values():
+            metricas["duracao_segundos"] = round(metricas["duracao_segundos"], 3)
+            for campo in CAMPOS_SOMADOS:
+                total[campo] += metricas[campo]
+        total["duracao_segundos"] = round(total["duracao_segundos"], 3)
+        return {"tarefas": tarefas, "total": total}
+
+
+class LLMInstrumentado(LLMDelegado):
+    """LLM que mede cada chamada e a atribui à tarefa que a originou"""
+
+    def __init__(self, llm: Any, medidor: MedidorTarefas):
+        self.medidor = medidor
+        super().__init__(llm)
+        _instalar_gancho_tokens(llm)
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        # Registro próprio desta chamada; chamadas de outras threads não o alcançam
+        registro = {"prompt_tokens": 0, "completion_tokens": 0, "uso_informado": False}
+        anterior = getattr(_chamada_atual, 'registro', None)
+        _chamada_atual.registro = registro
+
+        resposta = None
+        falhou = False
+        inicio = time.perf_counter()
+        try:
+            resposta = super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model,
+            )
+            return resposta
+        except Exception:
+            falhou = True
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            _chamada_atual.registro = anterior
+
+            verificar_cache = getattr(self.llm, 'ultima_chamada_do_cache', None)
+            acerto_cache = bool(verificar_cache()) if callable(verificar_cache) else False
+            estimado = not (registro["uso_informado"] or acerto_cache or falhou)
+            if estimado:
+                registro["prompt_tokens"] = estimar_tokens(str(messages))
+                registro["completion_tokens"] = estimar_tokens(str(resposta or ""))
+
+            self.medidor.registrar(
+                getattr(from_task, 'name', None) or "sem_tarefa",
+                registro["prompt_tokens"],
+                registro["completion_tokens"],
+                duracao,
+                acerto_cache=acerto_cache,
+                falhou=falhou,
+                estimado=estimado,
+            )
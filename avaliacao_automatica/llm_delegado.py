@@ -0,0 +1,95 @@
+"""
+Base para LLMs que envolvem outro LLM (cache, instrumentação, ...)
+
+O CrewAI ajusta atributos do LLM durante a execução (ex: `stop`) e consulta
+outros (provider, is_litellm, supports_function_calling). Esta classe repassa
+tudo ao LLM envolvido; as subclasses só implementam call().
+"""
+
+import json
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+
+
+class LLMDelegado(BaseLLM):
+    """LLM que repassa atributos e capacidades ao LLM envolvido (self.llm)"""
+
+    def __init__(self, llm: BaseLLM):
+        # Definido antes do super().__init__ porque `stop` é repassado ao LLM real
+        self.__dict__['llm'] = llm
+        stop = llm.stop
+        super().__init__(model=llm.model, temperature=llm.temperature, stop=stop)
+
+    def __getattr__(self, nome: str) -> Any:
+        llm = self.__dict__.get('llm')
+        if llm is None:
+            raise AttributeError(nome)
+        return getattr(llm, nome)
+
+    @property
+    def is_litellm(self) -> bool:  # type: ignore[override]
+        return getattr(self.llm, 'is_litellm', False)
+
+    @property
+    def provider(self) -> str:  # type: ignore[override]
+        return self.llm.provider
+
+    @provider.setter
+    def provider(self, valor: str) -> None:
+        self.llm.provider = valor
+
+    @property
+    def stop(self):  # type: ignore[override]
+        return self.llm.stop
+
+    @stop.setter
+    def stop(self, valor) -> None:
+        self.llm.stop = valor
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        return self.llm.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self.llm.get_token_usage_summary()
+
+
+def llm_real(llm: Any) -> Any:
+    """Retorna o LLM mais interno de uma cadeia de LLMDelegado"""
+    while isinstance(llm, LLMDelegado):
+        llm = llm.llm
+    return llm
+
+
+def texto_das_mensagens(messages: Any) -> str:
+    """Junta o conteúdo das mensagens (ou o prompt em texto) num único texto"""
+    if isinstance(messages, str):
+        return messages
+    partes = []
+    for mensagem in messages or []:
+        conteudo = mensagem.get("content") if isinstance(mensagem, dict) else mensagem
+        partes.append(conteudo if isinstance(conteudo, str) else json.dumps(conteudo, default=str))
+    return "\n".join(partes)
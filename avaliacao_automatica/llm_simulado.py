@@ -0,0 +1,213 @@
+"""
+LLM Simulado (offline e determinístico)
+
+Substitui o Gemini para medir o custo da própria orquestração (construção
+da crew, renderização dos prompts, parsing e checkpoint) sem rede e sem
+API key. Reconhece as tarefas da banca pelo prompt e responde no formato
+esperado:
+
+- tarefas de competência: JSON com competencia, nota e justificativa
+- tarefas em lote: array JSON com um objeto por redacao_id
+- tarefa de consolidação: JSON consolidado (soma das notas do contexto)
+- resumo executivo: texto curto
+
+As notas dependem apenas do prompt (e da semente), então duas execuções
+com a mesma configuração produzem os mesmos resultados.
+
+Seleção:
+    MODEL=simulado python processar_experimento.py ...   (ou a flag --llm-simulado)
+
+Configuração (variáveis de ambiente):
+    LLM_SIMULADO_LATENCIA         latência média por chamada, em segundos (padrão 0)
+    LLM_SIMULADO_JITTER           variação máxima da latência, em segundos (padrão 0)
+    LLM_SIMULADO_TAXA_FALHA       fração de chamadas que levantam erro (padrão 0)
+    LLM_SIMULADO_TAXA_MALFORMADO  fração de respostas com JSON defeituoso (padrão 0)
+    LLM_SIMULADO_SEMENTE          semente das escolhas (padrão 0)
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+
+from avaliacao_automatica.ambiente import MODELO_SIMULADO
+from avaliacao_automatica.indice_manuais import estimar_tokens
+from avaliacao_automatica.llm_delegado import texto_das_mensagens
+
+
+NOTAS_VALIDAS = (0, 40, 80, 120, 160, 200)
+PESOS_NOTAS = (1, 2, 5, 8, 6, 2)    # distribuição aproximada das notas reais
+
+ROMANOS = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5}
+
+
+class FalhaSimulada(RuntimeError):
+    """Erro levantado de propósito pelo LLM simulado (taxa de falha)"""
+
+
+class LLMSimulado(BaseLLM):
+    """LLM local que responde no formato das tarefas da banca"""
+
+    def __init__(
+        self,
+        model: str = MODELO_SIMULADO,
+        latencia: Optional[float] = None,
+        jitter: Optional[float] = None,
+        taxa_falha: Optional[float] = None,
+        taxa_malformado: Optional[float] = None,
+        semente: Optional[int] = None
+    ):
+        super().__init__(model=model, temperature=0.0, provider=MODELO_SIMULADO)
+        ambiente = os.environ.get
+        self.latencia = latencia if latencia is not None else float(ambiente("LLM_SIMULADO_LATENCIA", 0))
+        self.jitter = jitter if jitter is not None else float(ambiente("LLM_SIMULADO_JITTER", 0))
+        self.taxa_falha = taxa_falha if taxa_falha is not None else float(ambiente("LLM_SIMULADO_TAXA_FALHA", 0))
+        self.taxa_malformado = (
+            taxa_malformado if taxa_malformado is not None
+            else float(ambiente("LLM_SIMULADO_TAXA_MALFORMADO", 0))
+        )
+        self.semente = semente if semente is not None else int(ambiente("LLM_SIMULADO_SEMENTE", 0))
+
+        # Tentativas por prompt: uma retentativa do mesmo prompt sorteia de novo
+        self._tentativas: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _gerador(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.semente}\x00{prompt}".encode('utf-8')).hexdigest()
+        with self._lock:
+            tentativa = self._tentativas.get(digest, 0)
+            self._tentativas[digest] = tentativa + 1
+        return random.Random(f"{digest}:{tentativa}")
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        prompt = texto_das_mensagens(messages)
+        gerador = self._gerador(prompt)
+
+        atraso = self.latencia + gerador.uniform(-self.jitter, self.jitter)
+        if atraso > 0:
+            time.sleep(atraso)
+
+        if gerador.random() < self.taxa_falha:
+            raise FalhaSimulada("Falha simulada do LLM")
+
+        resposta = self._responder(prompt, gerador)
+        if gerador.random() < self.taxa_malformado:
+            resposta = self._corromper(resposta, gerador)
+
+        # Cadeia de raciocínio mínima aceita pelo parser de agentes do CrewAI
+        if from_task is not None or from_agent is not None:
+            resposta = f"Thought: I now can give a great answer\nFinal Answer: {resposta}"
+
+        self._track_token_usage_internal({
+            "prompt_tokens": estimar_tokens(prompt),
+            "completion_tokens": estimar_tokens(resposta),
+        })
+        return resposta
+
+    # ------------------------------------------------------------------
+    # Respostas por tipo de tarefa
+    # ------------------------------------------------------------------
+
+    def _responder(self, prompt: str, gerador: random.Random) -> str:
+        if "MODO LOTE" in prompt:
+            return self._resposta_lote(prompt, gerador)
+        if '"avaliacao_id"' in prompt:
+            return self._resposta_consolidacao(prompt, gerador)
+        competencia = self._competencia_do_prompt(prompt)
+        if competencia is not None:
+            return json.dumps(self._avaliacao_competencia(competencia, gerador), ensure_ascii=False, indent=2)
+        if "resumo executivo" in prompt.lower():
+            return "Resumo simulado: desempenho regular, com melhor resultado nas competências de maior nota."
+        return "Resposta simulada."
+
+    @staticmethod
+    def _competencia_do_prompt(prompt: str) -> Optional[int]:
+        match = re.search(r'"competencia"\s*:\s*([1-5])', prompt)
+        if match:
+            return int(match.group(1))
+        match = re.search(r'Competência\s+(V|IV|III|II|I)\b', prompt)
+        return ROMANOS[match.group(1)] if match else None
+
+    @staticmethod
+    def _avaliacao_competencia(competencia: int, gerador: random.Random) -> Dict[str, Any]:
+        nota = gerador.choices(NOTAS_VALIDAS, weights=PESOS_NOTAS)[0]
+        return {
+            "competencia": competencia,
+            "nota": nota,
+            "justificativa": f"Avaliação simulada da Competência {competencia}: nota {nota}.",
+        }
+
+    def _resposta_lote(self, prompt: str, gerador: random.Random) -> str:
+        competencia = self._competencia_do_prompt(prompt) or 1
+        ids = list(dict.fromkeys(re.findall(r'=== REDAÇÃO id=(\S+) ===', prompt)))
+        avaliacoes: List[Dict[str, Any]] = []
+        for redacao_id in ids:
+            avaliacao = self._avaliacao_competencia(competencia, gerador)
+            avaliacoes.append({"redacao_id": redacao_id, **avaliacao})
+        return json.dumps(avaliacoes, ensure_ascii=False, indent=2)
+
+    def _resposta_consolidacao(self, prompt: str, gerador: random.Random) -> str:
+        # Reaproveita as notas das competências presentes no contexto
+        notas = {
+            int(numero): int(nota)
+            for numero, nota in re.findall(r'"competencia"\s*:\s*([1-5])\s*,\s*"nota"\s*:\s*(\d+)', prompt)
+        }
+        competencias = {}
+        for numero in range(1, 6):
+            nota = notas.get(numero)
+            if nota not in NOTAS_VALIDAS:
+                nota = gerador.choices(NOTAS_VALIDAS, weights=PESOS_NOTAS)[0]
+            competencias[f"competencia_{numero}"] = {
+                "nota": nota,
+                "justificativa": f"Avaliação simulada da Competência {numero}: nota {nota}.",
+            }
+        nota_final = sum(dados["nota"] for dados in competencias.values())
+        modo = re.search(r'MODO DE AVALIAÇÃO:\s*(com_rag|baseline)', prompt)
+        tema = re.search(r'TEMA DA REDAÇÃO:\s*(.+)', prompt)
+        consolidado = {
+            "avaliacao_id": str(uuid.UUID(int=gerador.getrandbits(128))),
+            "tema": tema.group(1).strip() if tema else "",
+            "modo_avaliacao": modo.group(1) if modo else "com_rag",
+            "competencias": competencias,
+            "nota_final": nota_final,
+            "resumo_executivo": f"Avaliação simulada com nota final {nota_final}/1000.",
+            "status": "completa",
+        }
+        return json.dumps(consolidado, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _corromper(resposta: str, gerador: random.Random) -> str:
+        """Aplica um dos defeitos comuns de JSON gerado por LLM"""
+        defeito = gerador.choice(("markdown", "truncado", "virgula", "texto_extra"))
+        if defeito == "markdown":
+            return f"```json\n{resposta}\n```"
+        if defeito == "truncado":
+            return resposta[: max(len(resposta) // 2, 1)]
+        if defeito == "virgula":
+            return re.sub(r'(\S)(\s*[}\]])', r'\1,\2', resposta, count=1)
+        return f"Segue a avaliação solicitada:\n{resposta}\nEspero ter ajudado!"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 1_000_000
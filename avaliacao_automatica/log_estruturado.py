@@ -0,0 +1,129 @@
+"""
+Log Estruturado (níveis e modo lote)
+
+Ponto único de controle da saída do pipeline. O nível vem de configurar_log()
+(opção --log dos scripts) ou da variável de ambiente LOG_NIVEL:
+
+- detalhado: mensagens de progresso, linhas de depuração, agentes e crews
+  verbosos (verbose=True) e log de execução da crew em arquivo
+- normal (padrão): mensagens de progresso por redação, sem a saída verbosa
+  dos agentes
+- lote: silencioso; uma linha JSON compacta por redação e por tarefa no
+  stdout (ver evento), avisos e erros no stderr
+
+Com o log desligado o custo é o de uma comparação de nível: os eventos
+checam uma flag antes de montar o JSON e as linhas de depuração usam
+formatação preguiçosa (log.debug("... %s", valor)).
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+
+NIVEIS = {
+    "detalhado": logging.DEBUG,
+    "normal": logging.INFO,
+    "lote": logging.WARNING,
+}
+NIVEL_PADRAO = "normal"
+
+log = logging.getLogger("avaliacao_automatica")
+log.propagate = False
+
+_nivel = NIVEL_PADRAO
+_eventos_ativos = False
+_lock_eventos = threading.Lock()
+
+
+class _FluxoPadrao(logging.StreamHandler):
+    """Escreve no sys.stdout/sys.stderr vigente (respeita redirecionamentos)"""
+
+    def __init__(self, nome: str):
+        self._nome = nome
+        super().__init__()
+
+    @property
+    def stream(self):
+        return getattr(sys, self._nome)
+
+    @stream.setter
+    def stream(self, _valor):
+        pass
+
+
+def configurar_log(nivel: Optional[str] = None) -> str:
+    """
+    Define o nível de log de todo o pipeline
+
+    Deve ser chamado antes de as bancas serem construídas: a verbosidade dos
+    agentes e das crews é lida na criação.
+
+    Args:
+        nivel: 'detalhado', 'normal' ou 'lote' (None = LOG_NIVEL ou padrão)
+
+    Returns:
+        Nível aplicado
+    """
+    global _nivel, _eventos_ativos
+
+    explicito = nivel is not None
+    nivel = (nivel or os.environ.get("LOG_NIVEL") or NIVEL_PADRAO).strip().lower()
+    if nivel not in NIVEIS:
+        raise ValueError(f"Nível de log desconhecido: '{nivel}' (use {', '.join(NIVEIS)})")
+
+    # No modo lote o stdout fica reservado às linhas JSON
+    manipulador = _FluxoPadrao("stderr" if nivel == "lote" else "stdout")
+    manipulador.setFormatter(logging.Formatter("%(message)s"))
+    log.handlers[:] = [manipulador]
+    log.setLevel(NIVEIS[nivel])
+
+    _nivel = nivel
+    _eventos_ativos = nivel == "lote"
+    if explicito:
+        # Processos filhos seguem o mesmo nível
+        os.environ["LOG_NIVEL"] = nivel
+    return nivel
+
+
+def nivel_log() -> str:
+    """Nível de log em uso"""
+    return _nivel
+
+
+def saida_detalhada() -> bool:
+    """True no nível detalhado: agentes e crews verbosos e log da crew em arquivo"""
+    return _nivel == "detalhado"
+
+
+def eventos_ativos() -> bool:
+    """True no modo lote (use antes de montar campos caros de um evento)"""
+    return _eventos_ativos
+
+
+def evento(tipo: str, **campos: Any) -> None:
+    """
+    Emite uma linha JSON compacta no stdout (apenas no modo lote)
+
+    Args:
+        tipo: Tipo do evento ('redacao', 'tarefa', 'execucao', ...)
+        **campos: Campos do evento (valores não serializáveis viram texto)
+    """
+    if not _eventos_ativos:
+        return
+    linha = json.dumps(
+        {"evento": tipo, "ts": round(time.time(), 3), **campos},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    with _lock_eventos:
+        sys.stdout.write(linha + "\n")
+        sys.stdout.flush()
+
+
+configurar_log()
@@ -0,0 +1,170 @@
+"""
+Avaliação em Lote (várias redações por chamada de competência)
+
+O prefixo de cada tarefa (manual + textos de apoio + instruções) é grande e
+idêntico para todas as redações do mesmo tema. No modo lote, K redações são
+enviadas juntas na mesma chamada de cada competência e o agente devolve um
+array JSON com um objeto por redação (campo "redacao_id"). K é ajustado ao
+orçamento de tokens da chamada.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from avaliacao_automatica.extracao_json import extrair_json_tolerante
+from avaliacao_automatica.indice_manuais import estimar_tokens
+
+
+TAMANHO_LOTE_PADRAO = 4
+ORCAMENTO_TOKENS_LOTE = 100_000      # tokens de entrada por chamada (estimado)
+TOKENS_SAIDA_POR_REDACAO = 600       # resposta esperada por redação (estimado)
+MAX_TOKENS_SAIDA = 8_192             # limite de saída por chamada do modelo
+
+# Inserido na descrição de cada tarefa de competência no modo lote, logo antes
+# do texto das redações (que continua por último, depois do prefixo fixo)
+INSTRUCOES_LOTE = """MODO LOTE:
+O campo TEXTO DA REDAÇÃO abaixo contém VÁRIAS redações independentes, cada uma
+delimitada por "=== REDAÇÃO id=... ===" e "=== FIM DA REDAÇÃO id=... ===".
+Avalie CADA redação separadamente, como se fosse a única, seguindo todas as
+instruções acima. Não compare as redações entre si.
+
+---
+
+"""
+
+SAIDA_LOTE = """
+Formato JSON: um array com um objeto por redação, na ordem em que aparecem:
+[
+  {
+    "redacao_id": "o id informado no cabeçalho da redação",
+    "competencia": [número da competência avaliada],
+    "nota": [escolha EXATAMENTE um valor: 0, 40, 80, 120, 160 ou 200],
+    "justificativa": "Explicação objetiva com exemplos do texto"
+  }
+]
+
+IMPORTANTE: inclua TODAS as redações recebidas e não insira os caracteres ``` na saída JSON
+"""
+
+
+def descricao_lote(descricao: str) -> str:
+    """
+    Insere as instruções do modo lote na descrição de uma tarefa de competência
+
+    As instruções entram antes da linha com {redacao}, mantendo o texto das
+    redações no fim do prompt.
+    """
+    posicao = descricao.find('{redacao}')
+    if posicao == -1:
+        return descricao + "\n" + INSTRUCOES_LOTE
+    inicio_linha = descricao.rfind('\n', 0, posicao) + 1
+    return descricao[:inicio_linha] + INSTRUCOES_LOTE + descricao[inicio_linha:]
+
+
+def formatar_redacoes_lote(redacoes: Sequence[Tuple[Any, str]]) -> str:
+    """
+    Junta as redações do lote num único texto, cada uma delimitada pelo seu id
+
+    Args:
+        redacoes: Lista de (id, texto da redação)
+    """
+    blocos = [
+        f"=== REDAÇÃO id={redacao_id} ===\n{texto.strip()}\n=== FIM DA REDAÇÃO id={redacao_id} ==="
+        for redacao_id, texto in redacoes
+    ]
+    return "\n\n".join(blocos)
+
+
+def dividir_em_lotes(
+    redacoes: Sequence[Tuple[Any, str]],
+    tokens_prefixo: int,
+    tamanho_maximo: int = TAMANHO_LOTE_PADRAO,
+    orcamento_tokens: int = ORCAMENTO_TOKENS_LOTE,
+    tokens_saida_por_redacao: int = TOKENS_SAIDA_POR_REDACAO,
+    max_tokens_saida: int = MAX_TOKENS_SAIDA
+) -> List[List[Tuple[Any, str]]]:
+    """
+    Divide as redações em lotes que cabem no orçamento de tokens
+
+    Um lote fecha quando atinge `tamanho_maximo` redações, quando a próxima
+    redação estouraria o orçamento de entrada (prefixo + redações) ou quando
+    a resposta esperada passaria do limite de saída. Uma redação que sozinha
+    estoura o orçamento forma um lote próprio.
+
+    Args:
+        redacoes: Lista de (id, texto da redação), na ordem de avaliação
+        tokens_prefixo: Tokens fixos da tarefa (manual, textos de apoio, instruções)
+        tamanho_maximo: Máximo de redações por lote (K)
+
+    Returns:
+        Lista de lotes, cada um uma lista de (id, texto)
+    """
+    limite_saida = max(max_tokens_saida // max(tokens_saida_por_redacao, 1), 1)
+    limite = max(min(tamanho_maximo, limite_saida), 1)
+
+    lotes: List[List[Tuple[Any, str]]] = []
+    atual: List[Tuple[Any, str]] = []
+    tokens = tokens_prefixo
+
+    for redacao in redacoes:
+        custo = estimar_tokens(redacao[1]) + 20  # delimitadores
+        if atual and (len(atual) >= limite or tokens + custo > orcamento_tokens):
+            lotes.append(atual)
+            atual = []
+            tokens = tokens_prefixo
+        atual.append(redacao)
+        tokens += custo
+
+    if atual:
+        lotes.append(atual)
+    return lotes
+
+
+def extrair_lista_json(saida: Any) -> List[Dict[str, Any]]:
+    """
+    Extrai o array JSON da resposta de uma tarefa em lote
+
+    Aceita TaskOutput ou texto; tolera texto ao redor, marcadores de código
+    markdown, um objeto que envolva o array (ex: {"avaliacoes": [...]}) e
+    respostas truncadas, das quais aproveita os itens completos.
+
+    Returns:
+        Lista de dicts (vazia se não for possível interpretar a resposta)
+    """
+    dados = extrair_json_tolerante(saida, abertura='[')
+    if dados is None:
+        return []
+    return [item for item in dados if isinstance(item, dict)]
+
+
+def indexar_por_redacao(itens: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Indexa as avaliações do lote pelo redacao_id (como texto)"""
+    indexados: Dict[str, Dict[str, Any]] = {}
+    for item in itens:
+        redacao_id = item.get('redacao_id')
+        if redacao_id is not None and 'nota' in item:
+            indexados[str(redacao_id).strip()] = item
+    return indexados
+
+
+def estimar_tokens_prefixo(
+    descricoes: Sequence[str],
+    manuais: Sequence[str],
+    textos_apoio: str,
+    tema: str,
+    extra: Optional[str] = None
+) -> int:
+    """
+    Estima os tokens fixos da chamada mais cara entre as competências
+
+    Args:
+        descricoes: Descrições (templates) das tarefas de competência
+        manuais: Textos de manual injetados em cada competência (mesma ordem)
+        textos_apoio: Textos de apoio do tema
+        tema: Tema da redação
+        extra: Texto adicional enviado em toda chamada (ex: instruções do lote)
+    """
+    fixos = estimar_tokens(textos_apoio) + estimar_tokens(tema) + estimar_tokens(extra or "")
+    return max(
+        estimar_tokens(descricao) + estimar_tokens(manual) + fixos
+        for descricao, manual in zip(descricoes, manuais)
+    )
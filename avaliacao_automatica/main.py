@@ -13,10 +13,9 @@ Autor: Samuel e Yago
 import sys
 import warnings
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from avaliacao_automatica.crew import BancaExaminadora
-
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 
@@ -61,6 +60,15 @@ TEMA_EXEMPLO = "Desafios do lixo eletrônico no Brasil"
 # FUNÇÕES PRINCIPAIS
 # ============================================================================
 
+def nova_banca():
+    """
+    Cria a BancaExaminadora importando o CrewAI só neste momento, para que o
+    menu e as opções inválidas respondam sem carregar as dependências pesadas
+    """
+    from avaliacao_automatica.crew import BancaExaminadora
+    return BancaExaminadora()
+
+
 def run():
     """
     Executa a avaliação de uma redação COM RAG (Experimento A)
@@ -75,7 +83,7 @@ def run():
     }
 
     try:
-        banca = BancaExaminadora()
+        banca = nova_banca()
         resultado = banca.avaliar_redacao( # type: ignore
             redacao=inputs['redacao'],
             tema=inputs['tema'],
@@ -102,7 +110,7 @@ def run_baseline():
         'tema': TEMA_EXEMPLO,
     }
     try:
-        banca = BancaExaminadora()
+        banca = nova_banca()
         resultado = banca.avaliar_redacao( # type: ignore
             redacao=inputs['redacao'],
             tema=inputs['tema'],
@@ -119,6 +127,9 @@ def run_baseline():
 def run_experimento_completo():
     """
     Executa AMBOS os experimentos (A e B) para comparação
+    
+    Os dois modos rodam ao mesmo tempo, cada um com sua própria banca
+    (e seu próprio arquivo de saída da consolidação).
     """
     print("\n" + "=" * 80)
     print("🔬 EXPERIMENTO COMPLETO: RAG vs BASELINE")
@@ -129,30 +140,29 @@ def run_experimento_completo():
         'tema': TEMA_EXEMPLO,
     }
     
-    resultados = {}
+    experimentos = {
+        'experimento_A_com_rag': True,
+        'experimento_B_baseline': False,
+    }
     
-    try:
-        banca = BancaExaminadora()
-        
-        # Experimento A: COM RAG
-        print("📊 Executando Experimento A (COM RAG)...\n")
-        resultado_rag = banca.avaliar_redacao( # type: ignore
+    def executar(modo_rag: bool):
+        banca = nova_banca()
+        banca.arquivo_saida = f"resultado_avaliacao_{'rag' if modo_rag else 'baseline'}.json"
+        return banca.avaliar_redacao( # type: ignore
             redacao=inputs['redacao'],
             tema=inputs['tema'],
-            modo_rag=True
-        )
-        resultados['experimento_A_com_rag'] = resultado_rag
-        
-        print("\n" + "=" * 80 + "\n")
-        
-        # Experimento B: SEM RAG (Baseline)
-        print("📊 Executando Experimento B (BASELINE)...\n")
-        resultado_baseline = banca.avaliar_redacao( # type: ignore
-            redacao=inputs['redacao'],
-            tema=inputs['tema'],
-            modo_rag=False
+            modo_rag=modo_rag
         )
-        resultados['experimento_B_baseline'] = resultado_baseline
+    
+    try:
+        # Experimento A (COM RAG) e Experimento B (BASELINE) em paralelo
+        print("📊 Executando Experimentos A (COM RAG) e B (BASELINE) simultaneamente...\n")
+        with ThreadPoolExecutor(max_workers=len(experimentos)) as executor:
+            futuros = {
+                nome: executor.submit(executar, modo_rag)
+                for nome, modo_rag in experimentos.items()
+            }
+            resultados = {nome: futuro.result() for nome, futuro in futuros.items()}
         
         # Salvar comparação
         output_path = Path("comparacao_experimentos.json")
@@ -181,7 +191,7 @@ def avaliar_arquivo(filepath: str, tema: str, modo_rag: bool = True):
         with open(filepath, 'r', encoding='utf-8') as f:
             redacao = f.read()
         
-        banca = BancaExaminadora()
+        banca = nova_banca()
         resultado = banca.avaliar_redacao( # type: ignore
             redacao=redacao,
             tema=tema,
@@ -206,7 +216,7 @@ def train():
     }
     
     try:
-        BancaExaminadora().crew().train(
+        nova_banca().crew().train(
             n_iterations=int(sys.argv[1]), 
             filename=sys.argv[2], 
             inputs=inputs
@@ -220,7 +230,7 @@ def replay():
     Reproduz a execução da banca a partir de uma tarefa específica.
     """
     try:
-        BancaExaminadora().crew().replay(task_id=sys.argv[1])
+        nova_banca().crew().replay(task_id=sys.argv[1])
     except Exception as e:
         raise Exception(f"Erro ao reproduzir a banca: {e}")
 
@@ -235,7 +245,7 @@ def test():
     }
 
     try:
-        BancaExaminadora().crew().test(
+        nova_banca().crew().test(
             n_iterations=int(sys.argv[1]), 
             eval_llm=sys.argv[2], 
             inputs=inputs
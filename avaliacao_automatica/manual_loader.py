@@ -1,46 +1,318 @@
 """
 Carregador de Manuais das Competências ENEM - Versão Simplificada
+
+Além da extração direta (load_manual_simple), mantém um armazenamento
+persistente dos textos extraídos:
+- Cache em disco (.cache/manuais) indexado pelo hash SHA-256 do PDF
+- Memo em processo, para que cada manual seja lido do disco uma única vez
+- Extração paralela (pool de processos) dos PDFs ausentes no cache
+
+Uso via linha de comando:
+    python -m avaliacao_automatica.manual_loader --build
+    python -m avaliacao_automatica.manual_loader --invalidate
+    python -m avaliacao_automatica.manual_loader --status
 """
 
+import argparse
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from PyPDF2 import PdfReader
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
-def load_manual_simple(competencia_id: int) -> str:
-    """
-    Carrega o manual de uma competência específica.
-    
-    Args:
-        competencia_id: Número da competência (1 a 5)
-        
-    Returns:
-        str: Texto completo do manual da competência
-    """
+# PDFs estão em: ../rag_context/Competencia_X.pdf (relativo ao módulo)
+RAG_CONTEXT_DIR = Path(__file__).parent.parent / "rag_context"
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "manuais"
+
+COMPETENCIAS = (1, 2, 3, 4, 5)
+
+# Memo em processo: competencia_id -> (assinatura do arquivo, texto)
+_memo: Dict[int, Tuple[Tuple[int, int], str]] = {}
+_memo_lock = threading.Lock()
+
+
+def _validar_competencia(competencia_id: int) -> None:
     if not 1 <= competencia_id <= 5:
         raise ValueError(f"competencia_id deve estar entre 1 e 5, recebido: {competencia_id}")
-    
-    # PDFs estão em: ../rag_context/Competencia_X.pdf (relativo ao módulo)
-    pdf_path = Path(__file__).parent.parent / "rag_context" / f"Competencia_{competencia_id}.pdf"
-    
+
+
+def _caminho_pdf(competencia_id: int) -> Path:
+    """Retorna o caminho do PDF da competência, validando sua existência"""
+    _validar_competencia(competencia_id)
+    pdf_path = RAG_CONTEXT_DIR / f"Competencia_{competencia_id}.pdf"
+
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF não encontrado: {pdf_path}")
-    
+
+    return pdf_path
+
+
+def _extrair_texto_pdf(competencia_id: int, pdf_path: str) -> str:
+    """
+    Extrai o texto de todas as páginas do PDF.
+
+    Função de nível de módulo para poder ser executada no pool de processos.
+    O PyPDF2 só é importado aqui: com o cache em disco preenchido, os manuais
+    são carregados sem ele.
+    """
+    from PyPDF2 import PdfReader
+
     try:
-        reader = PdfReader(str(pdf_path))
+        reader = PdfReader(pdf_path)
         texto_completo = []
-        
+
         for page in reader.pages:
             texto = page.extract_text()
             if texto:
                 texto_completo.append(texto)
-        
+
         resultado = "\n\n".join(texto_completo)
-        
+
         if not resultado.strip():
             raise ValueError(f"PDF da competência {competencia_id} está vazio")
-        
+
         return resultado
-        
+
     except Exception as e:
         raise Exception(f"Erro ao carregar manual da competência {competencia_id}: {str(e)}")
 
+
+def load_manual_simple(competencia_id: int) -> str:
+    """
+    Carrega o manual de uma competência específica.
+
+    Sempre extrai o texto do PDF; para uso repetido prefira load_manual().
+
+    Args:
+        competencia_id: Número da competência (1 a 5)
+
+    Returns:
+        str: Texto completo do manual da competência
+    """
+    pdf_path = _caminho_pdf(competencia_id)
+    return _extrair_texto_pdf(competencia_id, str(pdf_path))
+
+
+# ============================================================================
+# ARMAZENAMENTO PERSISTENTE (CACHE EM DISCO + MEMO EM PROCESSO)
+# ============================================================================
+
+def _assinatura(pdf_path: Path) -> Tuple[int, int]:
+    """Assinatura barata (mtime, tamanho) usada para validar o memo"""
+    stat = pdf_path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _hash_arquivo(caminho: Path) -> str:
+    """Calcula o SHA-256 do conteúdo do arquivo"""
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _caminho_cache(competencia_id: int, digest: str) -> Path:
+    return CACHE_DIR / f"Competencia_{competencia_id}_{digest}.txt"
+
+
+def _ler_cache(competencia_id: int, digest: str) -> Optional[str]:
+    caminho = _caminho_cache(competencia_id, digest)
+    if caminho.exists():
+        return caminho.read_text(encoding='utf-8')
+    return None
+
+
+def _gravar_cache(competencia_id: int, digest: str, texto: str) -> None:
+    """Grava o texto no cache de forma atômica e remove versões antigas"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    destino = _caminho_cache(competencia_id, digest)
+    temporario = destino.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    temporario.write_text(texto, encoding='utf-8')
+    os.replace(temporario, destino)
+
+    for antigo in CACHE_DIR.glob(f"Competencia_{competencia_id}_*.txt"):
+        if antigo != destino:
+            antigo.unlink(missing_ok=True)
+
+
+def _memorizar(competencia_id: int, assinatura: Tuple[int, int], texto: str) -> None:
+    with _memo_lock:
+        _memo[competencia_id] = (assinatura, texto)
+
+
+def _consultar_memo(competencia_id: int, assinatura: Tuple[int, int]) -> Optional[str]:
+    with _memo_lock:
+        entrada = _memo.get(competencia_id)
+    if entrada is not None and entrada[0] == assinatura:
+        return entrada[1]
+    return None
+
+
+def load_manual(competencia_id: int) -> str:
+    """
+    Carrega o manual de uma competência usando o armazenamento persistente.
+
+    Ordem de busca: memo em processo -> cache em disco (hash do PDF) -> extração.
+
+    Args:
+        competencia_id: Número da competência (1 a 5)
+
+    Returns:
+        str: Texto completo do manual da competência
+    """
+    pdf_path = _caminho_pdf(competencia_id)
+    assinatura = _assinatura(pdf_path)
+
+    texto = _consultar_memo(competencia_id, assinatura)
+    if texto is not None:
+        return texto
+
+    digest = _hash_arquivo(pdf_path)
+    texto = _ler_cache(competencia_id, digest)
+    if texto is None:
+        texto = _extrair_texto_pdf(competencia_id, str(pdf_path))
+        _gravar_cache(competencia_id, digest, texto)
+
+    _memorizar(competencia_id, assinatura, texto)
+    return texto
+
+
+def preaquecer_manuais(
+    competencias: Iterable[int] = COMPETENCIAS,
+    max_workers: Optional[int] = None
+) -> Dict[int, str]:
+    """
+    Garante que os manuais estejam no memo, extraindo em paralelo os ausentes.
+
+    Em partida a frio, os PDFs sem cache em disco são extraídos num pool de
+    processos (um PDF por processo). Em partida a quente, nada é extraído.
+
+    Args:
+        competencias: Competências a carregar (padrão: 1 a 5)
+        max_workers: Número máximo de processos (padrão: um por PDF ausente)
+
+    Returns:
+        Dict competencia_id -> texto do manual
+    """
+    manuais: Dict[int, str] = {}
+    pendentes: List[Tuple[int, Path, Tuple[int, int], str]] = []
+
+    for competencia_id in competencias:
+        pdf_path = _caminho_pdf(competencia_id)
+        assinatura = _assinatura(pdf_path)
+
+        texto = _consultar_memo(competencia_id, assinatura)
+        if texto is None:
+            digest = _hash_arquivo(pdf_path)
+            texto = _ler_cache(competencia_id, digest)
+            if texto is None:
+                pendentes.append((competencia_id, pdf_path, assinatura, digest))
+                continue
+            _memorizar(competencia_id, assinatura, texto)
+
+        manuais[competencia_id] = texto
+
+    if len(pendentes) == 1:
+        competencia_id, pdf_path, assinatura, digest = pendentes[0]
+        texto = _extrair_texto_pdf(competencia_id, str(pdf_path))
+        _gravar_cache(competencia_id, digest, texto)
+        _memorizar(competencia_id, assinatura, texto)
+        manuais[competencia_id] = texto
+    elif pendentes:
+        workers = max_workers or len(pendentes)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futuros = {
+                executor.submit(_extrair_texto_pdf, competencia_id, str(pdf_path)):
+                    (competencia_id, assinatura, digest)
+                for competencia_id, pdf_path, assinatura, digest in pendentes
+            }
+            for futuro, (competencia_id, assinatura, digest) in futuros.items():
+                texto = futuro.result()
+                _gravar_cache(competencia_id, digest, texto)
+                _memorizar(competencia_id, assinatura, texto)
+                manuais[competencia_id] = texto
+
+    return manuais
+
+
+def invalidar_cache(competencias: Optional[Iterable[int]] = None) -> int:
+    """
+    Remove os textos em cache (disco e memo).
+
+    Args:
+        competencias: Competências a invalidar (padrão: todas)
+
+    Returns:
+        Quantidade de arquivos removidos do disco
+    """
+    alvos = list(competencias) if competencias is not None else list(COMPETENCIAS)
+    removidos = 0
+
+    with _memo_lock:
+        for competencia_id in alvos:
+            _memo.pop(competencia_id, None)
+
+    if CACHE_DIR.exists():
+        for competencia_id in alvos:
+            for arquivo in CACHE_DIR.glob(f"Competencia_{competencia_id}_*.txt"):
+                arquivo.unlink(missing_ok=True)
+                removidos += 1
+
+    return removidos
+
+
+def status_cache(competencias: Optional[Iterable[int]] = None) -> Dict[int, str]:
+    """Retorna o estado do cache em disco para cada competência (padrão: todas)"""
+    estado = {}
+    for competencia_id in (competencias or COMPETENCIAS):
+        try:
+            digest = _hash_arquivo(_caminho_pdf(competencia_id))
+        except FileNotFoundError:
+            estado[competencia_id] = "pdf_ausente"
+            continue
+        estado[competencia_id] = (
+            "em_cache" if _caminho_cache(competencia_id, digest).exists() else "ausente"
+        )
+    return estado
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Gerencia o cache de texto extraído dos manuais das competências'
+    )
+    acao = parser.add_mutually_exclusive_group(required=True)
+    acao.add_argument('--build', action='store_true', help='Pré-constrói o cache de todos os manuais')
+    acao.add_argument('--invalidate', action='store_true', help='Remove o cache dos manuais')
+    acao.add_argument('--status', action='store_true', help='Mostra o estado do cache')
+    parser.add_argument(
+        '--competencia',
+        type=int,
+        nargs='+',
+        choices=list(COMPETENCIAS),
+        help='Restringe a operação às competências indicadas'
+    )
+    parser.add_argument('--workers', type=int, default=None, help='Processos para extração')
+    args = parser.parse_args()
+
+    competencias = args.competencia or list(COMPETENCIAS)
+
+    if args.build:
+        manuais = preaquecer_manuais(competencias, max_workers=args.workers)
+        for competencia_id in sorted(manuais):
+            print(f"✅ Competência {competencia_id}: {len(manuais[competencia_id])} caracteres em cache")
+    elif args.invalidate:
+        removidos = invalidar_cache(competencias)
+        print(f"🗑️  {removidos} arquivo(s) de cache removido(s)")
+    else:
+        for competencia_id, estado in status_cache(competencias).items():
+            print(f"Competência {competencia_id}: {estado}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Métricas por Tarefa (agregação e rateio)
+
+Operações sobre as métricas registradas pela instrumentação (ver
+instrumentacao.py). Módulo sem dependências pesadas, usado também pelos
+relatórios de execuções retomadas, que não chegam a importar o CrewAI.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+CAMPOS_SOMADOS = (
+    "chamadas",
+    "retentativas",
+    "falhas",
+    "acertos_cache",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "duracao_segundos",
+)
+
+
+def novas_metricas() -> Dict[str, Any]:
+    """Métricas zeradas de uma tarefa"""
+    return {campo: 0 for campo in CAMPOS_SOMADOS}
+
+
+def ratear_metricas(metricas: Dict[str, Any], partes: int) -> Dict[str, Any]:
+    """
+    Divide as métricas de uma chamada em lote entre as redações do lote
+
+    Tokens e tempo são divididos igualmente; contagens de chamadas também,
+    para que a soma sobre as redações reproduza o total do lote.
+    """
+    def dividir(valores: Dict[str, Any]) -> Dict[str, Any]:
+        divididos = dict(valores)
+        for campo in CAMPOS_SOMADOS:
+            divididos[campo] = round(valores[campo] / partes, 3)
+        return divididos
+
+    return {
+        "tarefas": {nome: dividir(valores) for nome, valores in metricas["tarefas"].items()},
+        "total": dividir(metricas["total"]),
+        "rateado_em": partes,
+    }
+
+
+def agregar_metricas(registros: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Soma as métricas por tarefa de várias avaliações
+
+    Args:
+        registros: Resultados estruturados (com a chave "metricas")
+
+    Returns:
+        Dict {"redacoes": n, "tarefas": {nome: totais}, "total": totais}
+        ou None se nenhum registro tiver métricas
+    """
+    tarefas: Dict[str, Dict[str, Any]] = {}
+    total = novas_metricas()
+    redacoes = 0
+
+    for registro in registros:
+        metricas = registro.get('metricas')
+        if not metricas:
+            continue
+        redacoes += 1
+        for nome, valores in metricas["tarefas"].items():
+            acumulado = tarefas.setdefault(nome, novas_metricas())
+            for campo in CAMPOS_SOMADOS:
+                acumulado[campo] += valores.get(campo, 0)
+                total[campo] += valores.get(campo, 0)
+
+    if not redacoes:
+        return None
+    return {"redacoes": redacoes, "tarefas": tarefas, "total": total}
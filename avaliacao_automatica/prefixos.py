@@ -0,0 +1,148 @@
+"""
+Reuso de Prefixo dos Prompts
+
+As tarefas de competência são montadas com todo o conteúdo independente da
+redação (instruções, tema, textos de apoio, manual) antes do texto da
+redação, que vem por último. Assim o início de cada prompt é idêntico, byte
+a byte, para todas as redações do mesmo (tema, competência, modo) e pode ser
+reaproveitado pelo cache de contexto do provedor.
+
+O LLMComReusoPrefixos observa os prompts de uma execução e mede quantos
+bytes cada um compartilha com os prompts anteriores da mesma tarefa, além de
+quantos prefixos fixos distintos (trecho antes da redação) apareceram. Com o
+LLM simulado isso verifica a estabilidade do prefixo sem chamar a API.
+"""
+
+import hashlib
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+from avaliacao_automatica.llm_delegado import LLMDelegado, texto_das_mensagens
+
+
+# Início do conteúdo que varia por redação: o texto da redação nas tarefas de
+# competência e o contexto (saídas das competências) anexado pelo CrewAI na
+# tarefa de consolidação
+MARCADORES_CONTEUDO_VARIAVEL = (
+    "TEXTO DA REDAÇÃO:",
+    "This is the context you're working with:",
+)
+
+# Prompts anteriores guardados por tarefa para medir o prefixo compartilhado
+PROMPTS_COMPARADOS = 8
+
+
+def prefixo_fixo(prompt: str) -> str:
+    """Trecho do prompt antes do conteúdo que varia por redação (vazio se não houver marcador)"""
+    posicoes = [prompt.find(marcador) for marcador in MARCADORES_CONTEUDO_VARIAVEL]
+    posicoes = [posicao for posicao in posicoes if posicao != -1]
+    return prompt[:min(posicoes)] if posicoes else ""
+
+
+def _prefixo_comum(a: bytes, b: bytes) -> int:
+    """Tamanho do maior prefixo comum (busca binária com comparações em C)"""
+    inicio, fim = 0, min(len(a), len(b))
+    while inicio < fim:
+        meio = (inicio + fim + 1) // 2
+        if a[:meio] == b[:meio]:
+            inicio = meio
+        else:
+            fim = meio - 1
+    return inicio
+
+
+class ReusoPrefixos:
+    """Acumula, por tarefa, os bytes de prompt compartilhados (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tarefas: Dict[str, Dict[str, Any]] = {}
+
+    def registrar(self, tarefa: str, prompt: str) -> None:
+        dados = prompt.encode('utf-8')
+        fixo = prefixo_fixo(prompt).encode('utf-8')
+        digest = hashlib.sha256(fixo).hexdigest()
+
+        with self._lock:
+            estado = self._tarefas.setdefault(tarefa, {
+                "chamadas": 0,
+                "bytes_prompt": 0,
+                "bytes_compartilhados": 0,
+                "bytes_prefixo_fixo": 0,
+                "prefixos": set(),
+                "recentes": deque(maxlen=PROMPTS_COMPARADOS),
+            })
+            anteriores = list(estado["recentes"])
+            estado["recentes"].append(dados)
+
+        compartilhado = max((_prefixo_comum(dados, anterior) for anterior in anteriores), default=0)
+
+        with self._lock:
+            estado["chamadas"] += 1
+            estado["bytes_prompt"] += len(dados)
+            estado["bytes_compartilhados"] += compartilhado
+            estado["bytes_prefixo_fixo"] += len(fixo)
+            estado["prefixos"].add(digest)
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Retorna o reuso de prefixo por tarefa e o total da execução
+
+        Returns:
+            Dict {"tarefas": {nome: {chamadas, bytes_prompt, bytes_compartilhados,
+            bytes_prefixo_fixo, prefixos_distintos, percentual_compartilhado}},
+            "total": mesmos campos somados}
+        """
+        campos = ("chamadas", "bytes_prompt", "bytes_compartilhados", "bytes_prefixo_fixo")
+        with self._lock:
+            tarefas = {
+                nome: {
+                    **{campo: estado[campo] for campo in campos},
+                    "prefixos_distintos": len(estado["prefixos"]),
+                }
+                for nome, estado in self._tarefas.items()
+            }
+
+        total: Dict[str, Any] = {campo: 0 for campo in campos + ("prefixos_distintos",)}
+        for metricas in tarefas.values():
+            for campo in total:
+                total[campo] += metricas[campo]
+        for metricas in list(tarefas.values()) + [total]:
+            metricas["percentual_compartilhado"] = (
+                round(100 * metricas["bytes_compartilhados"] / metricas["bytes_prompt"], 1)
+                if metricas["bytes_prompt"] else 0.0
+            )
+        return {"tarefas": tarefas, "total": total}
+
+
+class LLMComReusoPrefixos(LLMDelegado):
+    """LLM que registra os prompts enviados para medir o reuso de prefixo"""
+
+    def __init__(self, llm: Any, reuso: Optional[ReusoPrefixos] = None):
+        self.reuso = reuso if reuso is not None else ReusoPrefixos()
+        super().__init__(llm)
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        self.reuso.registrar(
+            getattr(from_task, 'name', None) or "sem_tarefa",
+            texto_das_mensagens(messages)
+        )
+        return super().call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
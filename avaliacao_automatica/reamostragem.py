@@ -0,0 +1,208 @@
+"""
+Reamostragem Pareada (intervalos de confiança e teste de permutação)
+
+Compara duas variantes avaliadas sobre as mesmas redações (ex: RAG e
+baseline) sem supor distribuição para as métricas:
+
+- bootstrap pareado: sorteia redações com reposição e recalcula, na mesma
+  amostra, as métricas das duas variantes e a diferença entre elas
+  (intervalos de confiança por percentil)
+- teste de permutação pareado: troca ao acaso, redação a redação, as notas
+  das duas variantes; o p-valor é a fração das permutações com diferença
+  pelo menos tão grande quanto a observada
+
+As métricas são escritas como funções de somas de estatísticas por redação
+(erro absoluto, erro quadrático, acerto, ...). Assim, um lote de q
+reamostras é um único produto de matrizes: contagens (q, n) de cada
+redação na reamostra x estatísticas (n, f). Os lotes são distribuídos entre
+processos quando o volume compensa; cada lote tem semente própria derivada
+da semente principal, então o resultado não depende do número de processos.
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+REAMOSTRAS_PADRAO = 10_000
+CONFIANCA_PADRAO = 0.95
+SEMENTE_PADRAO = 0
+
+# Reamostras por lote (fixo: os lotes e suas sementes não dependem dos processos)
+REAMOSTRAS_POR_LOTE = 500
+
+# Limite de elementos da matriz de contagens de um lote (reamostras * redações)
+ELEMENTOS_POR_LOTE = 2_000_000
+
+# Abaixo deste volume (reamostras * redações * estatísticas) os lotes rodam no
+# próprio processo: iniciar os processos custaria mais do que o cálculo
+VOLUME_MINIMO_PROCESSOS = 2_000_000_000
+
+# somas (..., f) e número de redações -> dict métrica -> array (..., escalas)
+FuncaoMetricas = Callable[[np.ndarray, int], Dict[str, np.ndarray]]
+
+
+def _lote_bootstrap(
+    estatisticas_a: np.ndarray,
+    estatisticas_b: np.ndarray,
+    semente: np.random.SeedSequence,
+    quantidade: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Somas das estatísticas de A e de B em `quantidade` reamostras: (q, f) cada"""
+    n = estatisticas_a.shape[0]
+    sorteadas = np.random.default_rng(semente).integers(0, n, size=(quantidade, n))
+    sorteadas += np.arange(quantidade)[:, None] * n
+    contagens = np.bincount(sorteadas.ravel(), minlength=quantidade * n).reshape(quantidade, n)
+    contagens = contagens.astype(np.float64)
+    return contagens @ estatisticas_a, contagens @ estatisticas_b
+
+
+def _lote_permutacao(
+    diferencas: np.ndarray,
+    semente: np.random.SeedSequence,
+    quantidade: int
+) -> np.ndarray:
+    """Soma de B - A nas redações trocadas em `quantidade` permutações: (q, f)"""
+    n = diferencas.shape[0]
+    trocadas = np.random.default_rng(semente).random((quantidade, n)) < 0.5
+    return trocadas.astype(np.float64) @ diferencas
+
+
+def _executar_lotes(
+    tarefa: Callable,
+    matrizes: Tuple[np.ndarray, ...],
+    reamostras: int,
+    semente: int,
+    processos: Optional[int]
+) -> List:
+    """
+    Divide as reamostras em lotes e os executa (em paralelo se compensar)
+
+    Returns:
+        Resultados dos lotes, na ordem dos lotes
+    """
+    n, f = matrizes[0].shape
+    tamanho = max(1, min(REAMOSTRAS_POR_LOTE, ELEMENTOS_POR_LOTE // max(n, 1)))
+    quantidades = [tamanho] * (reamostras // tamanho)
+    if reamostras % tamanho:
+        quantidades.append(reamostras % tamanho)
+    sementes = np.random.SeedSequence(semente).spawn(len(quantidades))
+
+    processos = processos or os.cpu_count() or 1
+    if processos > 1 and len(quantidades) > 1 and reamostras * n * f >= VOLUME_MINIMO_PROCESSOS:
+        with ProcessPoolExecutor(max_workers=min(processos, len(quantidades))) as executor:
+            futuros = [
+                executor.submit(tarefa, *matrizes, semente_lote, quantidade)
+                for semente_lote, quantidade in zip(sementes, quantidades)
+            ]
+            return [futuro.result() for futuro in futuros]
+
+    return [
+        tarefa(*matrizes, semente_lote, quantidade)
+        for semente_lote, quantidade in zip(sementes, quantidades)
+    ]
+
+
+def bootstrap_pareado(
+    estatisticas_a: np.ndarray,
+    estatisticas_b: np.ndarray,
+    metricas: FuncaoMetricas,
+    reamostras: int = REAMOSTRAS_PADRAO,
+    confianca: float = CONFIANCA_PADRAO,
+    semente: int = SEMENTE_PADRAO,
+    processos: Optional[int] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Intervalos de confiança pareados das métricas de A, de B e de A - B
+
+    Args:
+        estatisticas_a, estatisticas_b: Estatísticas aditivas (n, f) de cada
+            redação, alinhadas por redação
+        metricas: Converte somas (..., f) de n redações em métricas
+        reamostras: Número de reamostras bootstrap
+        confianca: Nível de confiança dos intervalos (percentil)
+        semente: Semente principal (resultado reprodutível)
+        processos: Processos usados (padrão: número de CPUs)
+
+    Returns:
+        Dict métrica -> {'a', 'b', 'diferenca': valores da amostra original;
+        'ic_a', 'ic_b', 'ic_diferenca': intervalos com o último eixo = 2}
+    """
+    n = estatisticas_a.shape[0]
+    observadas_a = metricas(estatisticas_a.sum(axis=0), n)
+    observadas_b = metricas(estatisticas_b.sum(axis=0), n)
+
+    lotes = _executar_lotes(_lote_bootstrap, (estatisticas_a, estatisticas_b), reamostras, semente, processos)
+    amostras_a = metricas(np.concatenate([somas_a for somas_a, _ in lotes]), n)
+    amostras_b = metricas(np.concatenate([somas_b for _, somas_b in lotes]), n)
+
+    percentis = [100 * (1 - confianca) / 2, 100 * (1 + confianca) / 2]
+    resultado: Dict[str, Dict[str, np.ndarray]] = {}
+    for nome in observadas_a:
+        a, b = amostras_a[nome], amostras_b[nome]
+        # QWK pode ser indefinido numa reamostra degenerada (nan): ignorado
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            ic = np.nanpercentile(np.stack([a, b, a - b]), percentis, axis=1)
+        resultado[nome] = {
+            'a': observadas_a[nome],
+            'b': observadas_b[nome],
+            'diferenca': observadas_a[nome] - observadas_b[nome],
+            'ic_a': np.moveaxis(ic[:, 0], 0, -1),
+            'ic_b': np.moveaxis(ic[:, 1], 0, -1),
+            'ic_diferenca': np.moveaxis(ic[:, 2], 0, -1),
+        }
+    return resultado
+
+
+def teste_permutacao_pareado(
+    estatisticas_a: np.ndarray,
+    estatisticas_b: np.ndarray,
+    metricas: FuncaoMetricas,
+    reamostras: int = REAMOSTRAS_PADRAO,
+    semente: int = SEMENTE_PADRAO,
+    processos: Optional[int] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Teste de permutação pareado (bilateral) da diferença A - B de cada métrica
+
+    Args:
+        estatisticas_a, estatisticas_b: Estatísticas aditivas (n, f) de cada
+            redação, alinhadas por redação e na mesma escala (ver
+            analisar_metricas.estatisticas_por_redacao)
+        metricas: Converte somas (..., f) de n redações em métricas
+        reamostras: Número de permutações
+        semente: Semente principal (resultado reprodutível)
+        processos: Processos usados (padrão: número de CPUs)
+
+    Returns:
+        Dict métrica -> {'diferenca': diferença observada, 'p_valor': p-valor bilateral}
+    """
+    n = estatisticas_a.shape[0]
+    total_a = estatisticas_a.sum(axis=0)
+    total_b = estatisticas_b.sum(axis=0)
+    observadas_a = metricas(total_a, n)
+    observadas_b = metricas(total_b, n)
+
+    # Trocar a redação i move estatisticas_b[i] - estatisticas_a[i] de B para A
+    lotes = _executar_lotes(_lote_permutacao, (estatisticas_b - estatisticas_a,), reamostras, semente, processos)
+    trocas = np.concatenate(lotes)
+    permutadas_a = metricas(total_a + trocas, n)
+    permutadas_b = metricas(total_b - trocas, n)
+
+    resultado: Dict[str, Dict[str, np.ndarray]] = {}
+    for nome in observadas_a:
+        observada = observadas_a[nome] - observadas_b[nome]
+        diferencas = permutadas_a[nome] - permutadas_b[nome]
+        validas = ~np.isnan(diferencas)
+        # Tolerância para empates numéricos entre diferenças iguais
+        extremas = np.abs(diferencas) >= np.abs(observada) - 1e-9
+        p_valor = (1 + (extremas & validas).sum(axis=0)) / (1 + validas.sum(axis=0))
+        resultado[nome] = {
+            'diferenca': observada,
+            'p_valor': np.where(np.isnan(observada), np.nan, p_valor),
+        }
+    return resultado
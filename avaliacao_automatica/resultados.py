@@ -0,0 +1,194 @@
+"""
+Registro de Resultados Append-Only (JSONL)
+
+Cada redação avaliada vira uma linha JSON anexada ao arquivo com fsync, em
+vez de reescrever o array inteiro a cada redação. Uma linha truncada por
+queda do processo é ignorada na leitura, então o checkpoint nunca fica
+corrompido. O formato de array JSON usado por analisar_metricas.py (e a
+tabela Parquet que o acompanha) é gerado sob demanda pela exportação.
+
+Uso via linha de comando:
+    python -m avaliacao_automatica.resultados exportar resultados_experimento/resultados_prompt3_rag.jsonl
+    python -m avaliacao_automatica.resultados exportar arquivo.jsonl --saida arquivo.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from avaliacao_automatica.log_estruturado import log
+from avaliacao_automatica.resultados_colunares import atualizar_colunar
+
+
+class RegistroResultados:
+    """Log append-only de resultados, um registro JSON por linha"""
+
+    def __init__(self, caminho: Path):
+        self.caminho = Path(caminho)
+        self._lock = threading.Lock()
+
+    def existe(self) -> bool:
+        return self.caminho.exists()
+
+    def anexar(self, registro: Dict[str, Any]) -> None:
+        """
+        Anexa um registro ao log de forma durável
+
+        A linha inteira é escrita numa única chamada em modo append e o
+        arquivo é sincronizado (fsync) antes de retornar.
+        """
+        linha = json.dumps(registro, ensure_ascii=False) + "\n"
+        dados = linha.encode('utf-8')
+
+        with self._lock:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                self._reparar_final(fd)
+                os.write(fd, dados)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def anexar_varios(self, registros: Iterable[Dict[str, Any]]) -> int:
+        """Anexa vários registros com um único fsync; retorna a quantidade"""
+        linhas = [json.dumps(r, ensure_ascii=False) + "\n" for r in registros]
+        if not linhas:
+            return 0
+
+        with self._lock:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.caminho, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                self._reparar_final(fd)
+                os.write(fd, "".join(linhas).encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return len(linhas)
+
+    def _reparar_final(self, fd: int) -> None:
+        """
+        Garante que o arquivo termine em quebra de linha antes de anexar
+
+        Se uma escrita anterior foi interrompida no meio, a linha parcial
+        fica isolada (e é ignorada na leitura) em vez de corromper a próxima.
+        """
+        tamanho = os.fstat(fd).st_size
+        if tamanho == 0:
+            return
+        with open(self.caminho, 'rb') as f:
+            f.seek(tamanho - 1)
+            if f.read(1) != b"\n":
+                os.write(fd, b"\n")
+
+    def iterar(self) -> Iterator[Dict[str, Any]]:
+        """Percorre os registros em streaming, ignorando linhas inválidas"""
+        if not self.caminho.exists():
+            return
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            for numero, linha in enumerate(f, 1):
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    log.warning(f"⚠️  Linha {numero} de {self.caminho.name} inválida (escrita interrompida?) - ignorada")
+                    continue
+                if isinstance(registro, dict):
+                    yield registro
+
+    def indices_processados(self, incluir_erros: bool = True) -> Set[int]:
+        """
+        Reconstrói o conjunto de redacao_index já processados (streaming)
+
+        Args:
+            incluir_erros: False para deixar de fora as redações cujo último
+                registro é um erro (para serem reavaliadas)
+        """
+        if incluir_erros:
+            return {
+                registro['redacao_index']
+                for registro in self.iterar()
+                if 'redacao_index' in registro
+            }
+        ultimos: Dict[int, Any] = {}
+        for registro in self.iterar():
+            if 'redacao_index' in registro:
+                ultimos[registro['redacao_index']] = registro.get('status')
+        return {indice for indice, status in ultimos.items() if status != 'erro'}
+
+    def consolidar(self) -> List[Dict[str, Any]]:
+        """
+        Retorna os registros deduplicados por redacao_index (vale o último)
+
+        Ordenados por redacao_index; registros sem índice vêm ao final.
+        """
+        por_indice: Dict[int, Dict[str, Any]] = {}
+        sem_indice: List[Dict[str, Any]] = []
+        for registro in self.iterar():
+            indice = registro.get('redacao_index')
+            if indice is None:
+                sem_indice.append(registro)
+            else:
+                por_indice[indice] = registro
+        return [por_indice[i] for i in sorted(por_indice)] + sem_indice
+
+    def exportar_json(self, destino: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        Exporta o log no formato de array JSON (compatível com analisar_metricas.py)
+
+        A escrita é atômica: o arquivo temporário substitui o destino. Com o
+        pyarrow instalado, a tabela Parquet correspondente é gravada ao lado
+        (ver resultados_colunares.py).
+
+        Args:
+            destino: Arquivo .json de saída (padrão: mesmo nome com extensão .json)
+
+        Returns:
+            Lista de registros exportados
+        """
+        destino = Path(destino) if destino is not None else self.caminho.with_suffix('.json')
+        resultados = self.consolidar()
+
+        temporario = destino.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, destino)
+        atualizar_colunar(destino, resultados)
+
+        return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Gerencia os registros de resultados (JSONL append-only)'
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    exportar = subparsers.add_parser('exportar', help='Exporta o JSONL para o formato de array JSON')
+    exportar.add_argument('arquivo', type=str, help='Arquivo .jsonl de resultados')
+    exportar.add_argument('--saida', type=str, default=None, help='Arquivo .json de destino')
+
+    args = parser.parse_args()
+
+    registro = RegistroResultados(Path(args.arquivo))
+    if not registro.existe():
+        print(f"❌ Arquivo não encontrado: {registro.caminho}")
+        return 1
+
+    destino = Path(args.saida) if args.saida else registro.caminho.with_suffix('.json')
+    resultados = registro.exportar_json(destino)
+    print(f"💾 {len(resultados)} resultados exportados para {destino}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
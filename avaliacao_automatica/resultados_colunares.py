@@ -0,0 +1,362 @@
+"""
+Armazenamento Colunar dos Resultados (Parquet)
+
+Os arquivos JSON de resultados guardam, por redação, as justificativas
+completas de cada competência; para calcular métricas bastam uma dúzia de
+inteiros. Ao lado de cada resultados_*.json é gravada uma tabela Parquet
+tipada (mesmo nome, extensão .parquet) com:
+
+- notas: reais e preditas por competência, nota final e nota real
+- metadados: prompt, redação, modo, status, execução, duração, data
+- métricas de execução: tokens, chamadas, retentativas, acertos de cache
+  e economia da recuperação de trechos
+- textos (COLUNAS_TEXTO): justificativas, resumo executivo e erro
+
+Como o Parquet guarda cada coluna separadamente, as análises leem só as
+colunas de que precisam (COLUNAS_NOTAS), com o arquivo mapeado em memória;
+os textos só são lidos quando pedidos (ler_justificativas).
+
+O JSON continua sendo o formato de referência. A tabela registra tamanho e
+data do JSON de origem e é ignorada (e regravada) quando ele muda.
+Requer o pyarrow; sem ele, as análises leem o JSON como antes.
+
+Uso via linha de comando:
+    python -m avaliacao_automatica.resultados_colunares converter resultados_experimento/*.json
+    python -m avaliacao_automatica.resultados_colunares status resultados_experimento/*.json
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from avaliacao_automatica.ambiente import resultados_colunares_habilitados
+from avaliacao_automatica.log_estruturado import log
+from avaliacao_automatica.metricas_tarefas import CAMPOS_SOMADOS
+
+
+# Incrementar ao mudar o esquema: tabelas de outra versão são regravadas
+VERSAO_ESQUEMA = "1"
+
+COMPETENCIAS = (1, 2, 3, 4, 5)
+
+COLUNAS_CHAVE = ('prompt_id', 'redacao_index')
+
+# Colunas usadas no cálculo das métricas (analisar_metricas.py)
+COLUNAS_NOTAS = (
+    *COLUNAS_CHAVE,
+    'status',
+    *(f'comp{i}_real' for i in COMPETENCIAS),
+    *(f'comp{i}_pred' for i in COMPETENCIAS),
+)
+
+# Métricas de execução (soma sobre as tarefas, ver metricas_tarefas.py)
+COLUNAS_EXECUCAO = tuple(
+    'duracao_llm_segundos' if campo == 'duracao_segundos' else campo
+    for campo in CAMPOS_SOMADOS
+)
+
+# Textos longos, lidos só sob demanda
+COLUNAS_TEXTO = (
+    *(f'comp{i}_justificativa' for i in COMPETENCIAS),
+    'resumo_executivo',
+    'erro',
+)
+
+
+def pyarrow_disponivel() -> bool:
+    """Indica se o pyarrow está instalado (sem importá-lo)"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def caminho_colunar(arquivo: Path) -> Path:
+    """Tabela Parquet correspondente a um arquivo de resultados"""
+    return Path(arquivo).with_suffix('.parquet')
+
+
+def esquema():
+    """Esquema tipado da tabela de resultados"""
+    import pyarrow as pa
+
+    texto = pa.string()
+    categoria = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ('prompt_id', pa.int16()),
+            ('redacao_index', pa.int32()),
+            ('tema', categoria),
+            ('modo_avaliacao', categoria),
+            ('status', categoria),
+            ('nota_real', pa.int16()),
+            *((f'comp{i}_real', pa.int16()) for i in COMPETENCIAS),
+            *((f'comp{i}_pred', pa.int16()) for i in COMPETENCIAS),
+            ('nota_final', pa.int16()),
+            ('modo_execucao', categoria),
+            ('duracao_segundos', pa.float64()),
+            ('tentativas', pa.int16()),
+            ('timestamp', pa.timestamp('us')),
+            ('erro_tipo', categoria),
+            # Tokens e contagens podem ser frações quando rateados num lote
+            *((coluna, pa.float64()) for coluna in COLUNAS_EXECUCAO),
+            ('tokens_injetados', pa.int64()),
+            ('tokens_manual_completo', pa.int64()),
+            *((coluna, texto) for coluna in COLUNAS_TEXTO),
+        ],
+        metadata={'formato': 'resultados_colunares', 'versao': VERSAO_ESQUEMA},
+    )
+
+
+def _inteiro(valor: Any) -> Optional[int]:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _data(valor: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def linha_colunar(registro: Dict[str, Any]) -> Dict[str, Any]:
+    """Achata um registro de resultado nas colunas do esquema"""
+    avaliacao = registro.get('avaliacao_sistema')
+    avaliacao = avaliacao if isinstance(avaliacao, dict) else {}
+    competencias = avaliacao.get('competencias')
+    competencias = competencias if isinstance(competencias, dict) else {}
+    reais = registro.get('competencias_reais') or []
+    metricas = (registro.get('metricas') or {}).get('total') or {}
+    recuperacao = registro.get('recuperacao') or {}
+
+    linha: Dict[str, Any] = {
+        'prompt_id': _inteiro(registro.get('prompt_id')),
+        'redacao_index': _inteiro(registro.get('redacao_index')),
+        'tema': registro.get('tema'),
+        'modo_avaliacao': registro.get('modo_avaliacao'),
+        'status': registro.get('status'),
+        'nota_real': _inteiro(registro.get('nota_real')),
+        'nota_final': _inteiro(avaliacao.get('nota_final')),
+        'modo_execucao': registro.get('modo_execucao'),
+        'duracao_segundos': registro.get('duracao_segundos'),
+        'tentativas': _inteiro(registro.get('tentativas')),
+        'timestamp': _data(registro.get('timestamp')),
+        'erro_tipo': registro.get('erro_tipo'),
+        'tokens_injetados': _inteiro(recuperacao.get('tokens_injetados')),
+        'tokens_manual_completo': _inteiro(recuperacao.get('tokens_manual_completo')),
+        'resumo_executivo': avaliacao.get('resumo_executivo'),
+        'erro': registro.get('erro'),
+    }
+    for i in COMPETENCIAS:
+        competencia = competencias.get(f'competencia_{i}')
+        competencia = competencia if isinstance(competencia, dict) else {}
+        linha[f'comp{i}_real'] = _inteiro(reais[i - 1]) if len(reais) >= i else None
+        linha[f'comp{i}_pred'] = _inteiro(competencia.get('nota'))
+        justificativa = competencia.get('justificativa')
+        linha[f'comp{i}_justificativa'] = None if justificativa is None else str(justificativa)
+    for campo, coluna in zip(CAMPOS_SOMADOS, COLUNAS_EXECUCAO):
+        linha[coluna] = metricas.get(campo)
+    return linha
+
+
+def tabela_resultados(registros: Iterable[Dict[str, Any]]):
+    """Converte registros de resultados numa tabela Arrow tipada"""
+    import pyarrow as pa
+
+    esquema_tabela = esquema()
+    linhas = [linha_colunar(registro) for registro in registros]
+    colunas = [
+        pa.array([linha[campo.name] for linha in linhas], type=campo.type)
+        for campo in esquema_tabela
+    ]
+    return pa.Table.from_arrays(colunas, schema=esquema_tabela)
+
+
+def gravar_colunar(registros: Iterable[Dict[str, Any]], origem: Path,
+                   destino: Optional[Path] = None) -> Path:
+    """
+    Grava a tabela Parquet dos registros (escrita atômica)
+
+    Args:
+        registros: Registros de resultados (os mesmos do JSON de origem)
+        origem: Arquivo JSON de origem; seu tamanho e data vão nos metadados
+        destino: Arquivo .parquet (padrão: mesmo nome da origem)
+
+    Returns:
+        Caminho da tabela gravada
+    """
+    import pyarrow.parquet as pq
+
+    origem = Path(origem)
+    destino = Path(destino) if destino is not None else caminho_colunar(origem)
+    tabela = tabela_resultados(registros)
+    estado = origem.stat()
+    tabela = tabela.replace_schema_metadata({
+        **tabela.schema.metadata,
+        b'origem_tamanho': str(estado.st_size).encode(),
+        b'origem_mtime_ns': str(estado.st_mtime_ns).encode(),
+    })
+
+    temporario = destino.with_suffix(f".{os.getpid()}.tmp")
+    pq.write_table(tabela, temporario, compression='zstd')
+    os.replace(temporario, destino)
+    return destino
+
+
+def colunar_atualizado(arquivo: Path) -> bool:
+    """
+    Indica se a tabela Parquet de um arquivo JSON corresponde a ele
+
+    A tabela vale se for da versão atual do esquema e tiver sido gerada do
+    JSON com o tamanho e a data de modificação atuais.
+    """
+    import pyarrow.parquet as pq
+
+    arquivo = Path(arquivo)
+    colunar = caminho_colunar(arquivo)
+    if not colunar.exists():
+        return False
+    if not arquivo.exists():
+        return True
+    try:
+        metadados = pq.read_schema(colunar).metadata or {}
+    except Exception:
+        return False
+    estado = arquivo.stat()
+    return (
+        metadados.get(b'versao') == VERSAO_ESQUEMA.encode()
+        and metadados.get(b'origem_tamanho') == str(estado.st_size).encode()
+        and metadados.get(b'origem_mtime_ns') == str(estado.st_mtime_ns).encode()
+    )
+
+
+def ler_colunas(arquivo: Path, colunas: Sequence[str] = COLUNAS_NOTAS, filtros=None):
+    """
+    Lê colunas da tabela de um arquivo de resultados, mapeando-a em memória
+
+    Args:
+        arquivo: Arquivo .parquet, ou .json cuja tabela esteja atualizada
+        colunas: Colunas lidas (as demais não saem do disco)
+        filtros: Filtros de linhas do pyarrow (ex: [('status', '=', 'sucesso')])
+
+    Returns:
+        Tabela Arrow, ou None se não houver tabela utilizável (pyarrow
+        ausente, desabilitado por RESULTADOS_COLUNARES=0 ou desatualizada)
+    """
+    if not resultados_colunares_habilitados() or not pyarrow_disponivel():
+        return None
+    arquivo = Path(arquivo)
+    if arquivo.suffix != '.parquet' and not colunar_atualizado(arquivo):
+        return None
+
+    import pyarrow.parquet as pq
+    return pq.read_table(caminho_colunar(arquivo), columns=list(colunas), filters=filtros, memory_map=True)
+
+
+def ler_justificativas(arquivo: Path, prompt_id: Optional[int] = None,
+                       redacao_index: Optional[int] = None):
+    """
+    Lê os textos (justificativas, resumo, erro) com a chave de cada redação
+
+    Args:
+        arquivo: Arquivo .parquet ou .json de resultados
+        prompt_id, redacao_index: Restringem a leitura a essas redações
+
+    Returns:
+        Tabela Arrow (ou None, como em ler_colunas)
+    """
+    filtros = [
+        (coluna, '=', valor)
+        for coluna, valor in (('prompt_id', prompt_id), ('redacao_index', redacao_index))
+        if valor is not None
+    ]
+    return ler_colunas(arquivo, (*COLUNAS_CHAVE, *COLUNAS_TEXTO), filtros or None)
+
+
+def atualizar_colunar(arquivo: Path, registros: List[Dict[str, Any]]) -> Optional[Path]:
+    """
+    Regrava a tabela de um JSON de resultados se estiver ausente ou desatualizada
+
+    Nunca interrompe quem chamou: falhas viram aviso no log.
+
+    Returns:
+        Caminho da tabela, ou None se não foi gravada
+    """
+    if not resultados_colunares_habilitados() or not pyarrow_disponivel():
+        return None
+    if colunar_atualizado(arquivo):
+        return caminho_colunar(arquivo)
+    try:
+        return gravar_colunar(registros, arquivo)
+    except Exception as e:
+        log.warning(f"⚠️  Não foi possível gravar a tabela colunar de {Path(arquivo).name}: {e}")
+        return None
+
+
+def colunas_resultados(arquivo: Path, colunas: Sequence[str] = COLUNAS_NOTAS, gravar: bool = False):
+    """
+    Lê colunas de um arquivo de resultados
+
+    Sem tabela atualizada, as colunas são montadas em memória a partir do
+    JSON; com gravar=True a tabela é gravada antes, para as próximas leituras.
+
+    Returns:
+        Tabela Arrow, ou None sem o pyarrow (ou com RESULTADOS_COLUNARES=0)
+    """
+    tabela = ler_colunas(arquivo, colunas)
+    if tabela is None and Path(arquivo).suffix != '.parquet':
+        if not resultados_colunares_habilitados() or not pyarrow_disponivel():
+            return None
+        import json
+
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            registros = json.load(f)
+        if gravar and atualizar_colunar(arquivo, registros) is not None:
+            return ler_colunas(arquivo, colunas)
+        tabela = tabela_resultados(registros).select(list(colunas))
+    return tabela
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Gerencia as tabelas Parquet dos arquivos de resultados'
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    converter = subparsers.add_parser('converter', help='Grava (ou regrava) a tabela Parquet de cada JSON')
+    converter.add_argument('arquivos', nargs='+', help='Arquivos .json de resultados')
+
+    status = subparsers.add_parser('status', help='Mostra se a tabela de cada JSON está atualizada')
+    status.add_argument('arquivos', nargs='+', help='Arquivos .json de resultados')
+
+    args = parser.parse_args()
+
+    if not pyarrow_disponivel():
+        print("❌ pyarrow não instalado. Instale com: pip install pyarrow")
+        return 1
+
+    import json
+
+    falhas = 0
+    for arquivo in map(Path, args.arquivos):
+        if not arquivo.exists():
+            print(f"❌ Arquivo não encontrado: {arquivo}")
+            falhas += 1
+        elif args.comando == 'status':
+            situacao = "✅ atualizada" if colunar_atualizado(arquivo) else "⚠️  ausente ou desatualizada"
+            print(f"{arquivo}: {situacao}")
+        else:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                registros = json.load(f)
+            destino = gravar_colunar(registros, arquivo)
+            print(f"💾 {len(registros)} resultados: {destino} "
+                  f"({destino.stat().st_size / 1024:.1f} KB; JSON {arquivo.stat().st_size / 1024:.1f} KB)")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Saídas Estruturadas das Tarefas (modelos tipados e validação)
+
+Cada tarefa de competência e a consolidação são ligadas a um modelo pydantic
+(output_pydantic do CrewAI): o esquema do modelo entra no prompt do agente e
+a resposta é convertida localmente, com o extrator tolerante, sem a chamada
+extra ao LLM que o conversor padrão do CrewAI faria.
+
+O guardrail de cada tarefa corrige o que tem conserto (nota a até
+TOLERANCIA_NOTA de um valor válido ajustada, nota_final recalculada como a
+soma) e, quando a resposta não tem conserto (nota fora da escala,
+competência trocada, JSON ausente), repergunta apenas à tarefa que errou,
+informando o erro. As demais tarefas da redação não são refeitas.
+"""
+
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple, Type, TypeVar
+
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.converter import Converter, ConverterError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+
+from avaliacao_automatica.extracao_json import ajustar_nota, extrair_json_tolerante, validar_consolidacao
+from avaliacao_automatica.log_estruturado import evento, log
+
+
+# Reperguntas por tarefa quando a saída não tem conserto (guardrail_max_retries)
+REPERGUNTAS_PADRAO = 2
+
+INSTRUCOES_CORRECAO = (
+    "Responda novamente apenas com o objeto JSON no formato pedido, sem texto "
+    "antes ou depois e sem marcadores de bloco de código. Cada nota deve ser "
+    "exatamente 0, 40, 80, 120, 160 ou 200."
+)
+
+Modelo = TypeVar("Modelo", bound=BaseModel)
+
+
+class AvaliacaoCompetencia(BaseModel):
+    """Saída de uma tarefa de competência"""
+
+    model_config = ConfigDict(extra='allow')
+
+    competencia: int = Field(ge=1, le=5, description="Número da competência (1 a 5)")
+    nota: int = Field(description="Exatamente um dos valores 0, 40, 80, 120, 160 ou 200")
+    justificativa: str = Field(default="", description="Explicação da nota com exemplos do texto")
+
+    @model_validator(mode='before')
+    @classmethod
+    def _ajustar_nota(cls, dados: Any) -> Any:
+        """Ajusta a nota para a escala válida, guardando a original em nota_original"""
+        if not isinstance(dados, dict) or dados.get('nota') is None:
+            return dados
+        dados = dict(dados)
+        try:
+            nota = ajustar_nota(dados['nota'])
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"nota inválida: {e}") from e
+        if str(nota) != str(dados['nota']).strip():
+            dados.setdefault('nota_original', dados['nota'])
+        dados['nota'] = nota
+        if isinstance(dados.get('justificativa'), list):
+            dados['justificativa'] = "\n".join(str(item) for item in dados['justificativa'])
+        return dados
+
+
+class NotaCompetencia(BaseModel):
+    """Nota e justificativa de uma competência na avaliação consolidada"""
+
+    nota: int = Field(description="Exatamente um dos valores 0, 40, 80, 120, 160 ou 200")
+    justificativa: str = ""
+
+
+class AvaliacaoConsolidada(BaseModel):
+    """Saída da tarefa_consolidacao (competencia_1 a competencia_5)"""
+
+    model_config = ConfigDict(extra='allow')
+
+    avaliacao_id: str = ""
+    tema: str = ""
+    modo_avaliacao: str = Field(default="", description="com_rag ou baseline")
+    competencias: Dict[str, NotaCompetencia] = Field(
+        description="Chaves competencia_1 a competencia_5"
+    )
+    nota_final: int = Field(description="Soma das 5 notas (0 a 1000)")
+    resumo_executivo: str = ""
+    status: str = "completa"
+
+    @model_validator(mode='before')
+    @classmethod
+    def _normalizar(cls, dados: Any) -> Any:
+        """Normaliza com validar_consolidacao (notas ajustadas, nota_final recalculada)"""
+        if not isinstance(dados, dict):
+            return dados
+        avaliacao, faltando = validar_consolidacao(dados)
+        if faltando:
+            raise ValueError(f"competências sem nota válida: {faltando}")
+        return avaliacao
+
+
+def validar_saida(texto: Any, modelo: Type[Modelo], **fixos: Any) -> Tuple[Optional[Modelo], str]:
+    """
+    Extrai o JSON de uma resposta e o valida contra o modelo da tarefa
+
+    Args:
+        texto: Resposta do agente
+        modelo: Modelo pydantic da tarefa
+        **fixos: Campos definidos pela tarefa (preenchidos se ausentes; um
+            valor diferente na resposta é erro). Um valor que muda entre
+            execuções da mesma tarefa (ex: modo de avaliação) é passado como
+            função sem argumentos, chamada a cada validação.
+
+    Returns:
+        (instância do modelo, "") ou (None, descrição do erro)
+    """
+    fixos = {campo: valor() if callable(valor) else valor for campo, valor in fixos.items()}
+    dados = extrair_json_tolerante(texto)
+    if not isinstance(dados, dict):
+        return None, "a resposta não contém um objeto JSON"
+    for campo, esperado in fixos.items():
+        if dados.get(campo) is not None and str(dados[campo]).strip() != str(esperado):
+            return None, f"{campo}: esperado {esperado}, recebido {dados[campo]!r}"
+    try:
+        return modelo.model_validate({**dados, **fixos}), ""
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(str(parte) for parte in erro['loc']) or 'saída'}: {erro['msg']}"
+            for erro in e.errors()
+        )
+
+
+class ConversorLocal(Converter):
+    """
+    Conversor do output_pydantic sem LLM (converter_cls das tarefas)
+
+    O conversor padrão do CrewAI pede ao LLM para reformatar a resposta quando
+    o JSON não é válido; aqui a resposta é extraída e validada localmente e
+    o que não tiver conserto fica para o guardrail reperguntar.
+    """
+
+    # Campos definidos pela tarefa (ver com_fixos)
+    fixos: ClassVar[Dict[str, Any]] = {}
+
+    @classmethod
+    def com_fixos(cls, **fixos: Any) -> Type["ConversorLocal"]:
+        """Subclasse que valida com os campos fixos da tarefa (o CrewAI instancia a classe)"""
+        return type(cls.__name__, (cls,), {"fixos": fixos})
+
+    def to_pydantic(self, current_attempt: int = 1) -> Any:
+        instancia, erro = validar_saida(self.text, self.model, **self.fixos)
+        return instancia if instancia is not None else ConverterError(erro)
+
+    def to_json(self, current_attempt: int = 1) -> Any:
+        instancia = self.to_pydantic(current_attempt)
+        return instancia.model_dump() if isinstance(instancia, BaseModel) else instancia
+
+
+def guardrail_saida(
+    modelo: Type[BaseModel],
+    reparar: Optional[Callable[[TaskOutput], Optional[BaseModel]]] = None,
+    ao_rejeitar: Optional[Callable[[], None]] = None,
+    **fixos: Any
+) -> Callable[[TaskOutput], Tuple[bool, Any]]:
+    """
+    Cria o guardrail que valida a saída de uma tarefa contra o seu modelo
+
+    Saída válida (ou reparável): raw, pydantic e json_dict passam a conter o
+    JSON normalizado, que é o que segue como contexto para o Presidente da
+    Banca e para o checkpoint. Saída sem conserto: o CrewAI repergunta só a
+    esta tarefa, com o erro encontrado.
+
+    Args:
+        modelo: Modelo pydantic da tarefa
+        reparar: Alternativa local tentada antes de reperguntar (opcional)
+        ao_rejeitar: Chamada quando a saída é rejeitada, na thread da tarefa
+            (ex: tirar a resposta do cache do LLM)
+        **fixos: Campos definidos pela tarefa (ex: número da competência, modo de avaliação)
+    """
+    def validar(saida: TaskOutput) -> Tuple[bool, Any]:
+        instancia = saida.pydantic if isinstance(saida.pydantic, modelo) else None
+        erro = ""
+        if instancia is None:
+            instancia, erro = validar_saida(saida.raw, modelo, **fixos)
+        if instancia is None and reparar is not None:
+            instancia = reparar(saida)
+        if instancia is None:
+            log.warning(f"🔁 Saída de {saida.name} fora do formato ({erro}) - reperguntando à tarefa")
+            evento("repergunta", tarefa=saida.name, erro=erro)
+            if ao_rejeitar is not None:
+                ao_rejeitar()
+            return False, f"{erro}. {INSTRUCOES_CORRECAO}"
+        saida.pydantic = instancia
+        saida.json_dict = instancia.model_dump()
+        saida.raw = instancia.model_dump_json(indent=2)
+        return True, saida
+
+    return validar
@@ -0,0 +1,647 @@
+"""
+BENCHMARKS DO PIPELINE DE AVALIAÇÃO
+Mede os caminhos críticos isoladamente e de ponta a ponta (com o LLM simulado)
+e grava um relatório JSON que pode ser comparado entre versões.
+
+Benchmarks:
+- manual.*      load_manual_simple (extração a frio) e load_manual (cache em disco / memória)
+- banca.*       BancaExaminadora(), crew(), preparar_inputs_com_rag (RAG e baseline) e
+                montagem por redação com e sem a FabricaBancas
+- essay.*       processar_essay sobre os CSVs do repositório e o corpus compilado
+                (compilação, abertura do cache em disco e leitura das redações)
+- json.*        extração tolerante + validação de saídas grandes (completas e truncadas)
+- registro.*    RegistroResultados.anexar / exportar_json com 10, 100 e 1000 registros
+- metricas.*    carregamento das notas (JSON e tabela colunar Parquet), extrair_notas,
+                calcular_metricas_gerais, calcular_metricas (300 mil redações) e
+                analisar_incerteza (10 mil reamostras, 1000 redações)
+- e2e.*         processar_experimento_modos (RAG + baseline) com o LLM simulado
+- importacao.*  início dos pontos de entrada (--help e import) em um processo novo
+
+Uso:
+    python benchmark_pipeline.py
+    python benchmark_pipeline.py --apenas manual banca --repeticoes 10
+    python benchmark_pipeline.py --saida benchmarks/atual.json
+    python benchmark_pipeline.py --comparar benchmarks/antes.json benchmarks/atual.json
+    python benchmark_pipeline.py --importacoes processar_experimento
+"""
+
+import os
+
+# Os benchmarks nunca chamam a API: o LLM da banca é sempre o simulado
+os.environ["MODEL"] = "simulado"
+
+import argparse
+import contextlib
+import csv
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+RAIZ = Path(__file__).parent
+CSVS = [RAIZ / "redacoes_prompt_3.csv", RAIZ / "redacoes_prompt_6.csv"]
+DIRETORIO_RELATORIOS = RAIZ / "benchmarks"
+
+# Diretórios temporários criados pelos benchmarks (removidos ao final)
+_TEMPORARIOS: List[Path] = []
+
+# Registro dos benchmarks: nome -> (função de preparo, repetições padrão)
+BENCHMARKS: Dict[str, Dict[str, Any]] = {}
+
+
+def benchmark(nome: str, repeticoes: Optional[int] = None):
+    """
+    Registra um benchmark
+
+    A função decorada faz o preparo (fora da medição) e retorna a função
+    medida. Se retornar uma tupla (preparar_iteracao, medida), preparar_iteracao
+    roda antes de cada repetição e seu retorno é passado para a função medida.
+    """
+    def decorador(funcao: Callable):
+        BENCHMARKS[nome] = {"preparo": funcao, "repeticoes": repeticoes}
+        return funcao
+    return decorador
+
+
+@contextlib.contextmanager
+def silencioso():
+    """Descarta a saída (prints e logs da crew) durante a medição"""
+    with open(os.devnull, 'w', encoding='utf-8') as nulo:
+        with contextlib.redirect_stdout(nulo), contextlib.redirect_stderr(nulo):
+            yield
+
+
+def medir(preparo: Callable, repeticoes: int, aquecimento: int = 1) -> Dict[str, Any]:
+    """Executa o benchmark e retorna estatísticas dos tempos (segundos)"""
+    with silencioso():
+        alvo = preparo()
+    if isinstance(alvo, tuple):
+        preparar_iteracao, funcao = alvo
+    else:
+        preparar_iteracao, funcao = None, alvo
+
+    tempos: List[float] = []
+    for i in range(aquecimento + repeticoes):
+        with silencioso():
+            argumento = preparar_iteracao() if preparar_iteracao else None
+            inicio = time.perf_counter()
+            funcao(argumento) if preparar_iteracao else funcao()
+            duracao = time.perf_counter() - inicio
+        if i >= aquecimento:
+            tempos.append(duracao)
+
+    return {
+        "repeticoes": len(tempos),
+        "mediana_s": statistics.median(tempos),
+        "media_s": statistics.fmean(tempos),
+        "min_s": min(tempos),
+        "max_s": max(tempos),
+        "desvio_s": statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+    }
+
+
+# ============================================================================
+# DADOS SINTÉTICOS
+# ============================================================================
+
+def diretorio_temporario(prefixo: str) -> Path:
+    diretorio = Path(tempfile.mkdtemp(prefix=prefixo))
+    _TEMPORARIOS.append(diretorio)
+    return diretorio
+
+
+def ler_redacoes(limite: Optional[int] = None) -> List[Dict[str, str]]:
+    """Lê as linhas dos CSVs do repositório (módulo csv, sem pandas)"""
+    csv.field_size_limit(sys.maxsize)
+    linhas: List[Dict[str, str]] = []
+    for caminho in CSVS:
+        with open(caminho, newline='', encoding='utf-8') as f:
+            linhas.extend(csv.DictReader(f))
+    return linhas[:limite] if limite else linhas
+
+
+def resultado_sintetico(indice: int, gerador: random.Random, tamanho_justificativa: int = 400) -> Dict[str, Any]:
+    """Resultado estruturado no formato de avaliar_redacao_completa"""
+    notas = [gerador.choice((0, 40, 80, 120, 160, 200)) for _ in range(5)]
+    reais = [gerador.choice((0, 40, 80, 120, 160, 200)) for _ in range(5)]
+    justificativa = ("Justificativa sintética com exemplos do texto. " * 50)[:tamanho_justificativa]
+    return {
+        "redacao_index": indice,
+        "prompt_id": 3,
+        "tema": "Tema sintético",
+        "modo_avaliacao": "com_rag",
+        "nota_real": sum(reais),
+        "competencias_reais": reais,
+        "avaliacao_sistema": {
+            "avaliacao_id": f"sintetico-{indice}",
+            "tema": "Tema sintético",
+            "modo_avaliacao": "com_rag",
+            "competencias": {
+                f"competencia_{n}": {"nota": nota, "justificativa": justificativa}
+                for n, nota in enumerate(notas, 1)
+            },
+            "nota_final": sum(notas),
+            "resumo_executivo": justificativa,
+            "status": "completa",
+        },
+        "timestamp": datetime.now().isoformat(),
+        "status": "sucesso",
+    }
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+@benchmark("manual.load_manual_simple_frio", repeticoes=3)
+def _bench_manual_frio():
+    from avaliacao_automatica.manual_loader import load_manual_simple
+    return lambda: load_manual_simple(1)
+
+
+@benchmark("manual.load_manual_cache_disco")
+def _bench_manual_disco():
+    from avaliacao_automatica import manual_loader
+    manual_loader.load_manual(1)  # garante o cache em disco
+
+    def limpar_memoria():
+        manual_loader._memo.clear()
+
+    return limpar_memoria, lambda _: manual_loader.load_manual(1)
+
+
+@benchmark("manual.load_manual_memoria")
+def _bench_manual_memoria():
+    from avaliacao_automatica.manual_loader import load_manual
+    load_manual(1)
+    return lambda: load_manual(1)
+
+
+@benchmark("banca.construcao")
+def _bench_banca_construcao():
+    from avaliacao_automatica.crew import BancaExaminadora
+    return lambda: BancaExaminadora()
+
+
+@benchmark("banca.crew")
+def _bench_banca_crew():
+    from avaliacao_automatica.crew import BancaExaminadora
+    return BancaExaminadora, lambda banca: banca.crew()
+
+
+def _dados_setup():
+    from textos_apoio import obter_textos_apoio
+    from processar_experimento import processar_essay
+    tema, textos_apoio = obter_textos_apoio(3)
+    return processar_essay(ler_redacoes(1)[0]['essay']), tema, textos_apoio
+
+
+@benchmark("banca.setup_por_redacao_sem_fabrica")
+def _bench_setup_sem_fabrica():
+    from avaliacao_automatica.crew import BancaExaminadora
+    redacao, tema, textos_apoio = _dados_setup()
+
+    def montar():
+        banca = BancaExaminadora()
+        banca.crew()
+        banca.preparar_inputs_com_rag(redacao, tema, textos_apoio, True)
+
+    return montar
+
+
+@benchmark("banca.setup_por_redacao_com_fabrica")
+def _bench_setup_com_fabrica():
+    from avaliacao_automatica.fabrica import FabricaBancas
+    redacao, tema, textos_apoio = _dados_setup()
+    fabrica = FabricaBancas()
+    fabrica.obter()
+
+    def montar():
+        banca = fabrica.obter()
+        banca.preparar_inputs_com_rag(redacao, tema, textos_apoio, True)
+
+    return montar
+
+
+def _preparar_inputs(modo_rag: bool):
+    from avaliacao_automatica.crew import BancaExaminadora
+    from textos_apoio import obter_textos_apoio
+    from processar_experimento import processar_essay
+
+    redacao = processar_essay(ler_redacoes(1)[0]['essay'])
+    tema, textos_apoio = obter_textos_apoio(3)
+    banca = BancaExaminadora()
+    banca.preparar_inputs_com_rag(redacao, tema, textos_apoio, modo_rag)  # aquece os manuais
+    return lambda: banca.preparar_inputs_com_rag(redacao, tema, textos_apoio, modo_rag)
+
+
+@benchmark("banca.preparar_inputs_rag")
+def _bench_inputs_rag():
+    return _preparar_inputs(True)
+
+
+@benchmark("banca.preparar_inputs_baseline")
+def _bench_inputs_baseline():
+    return _preparar_inputs(False)
+
+
+@benchmark("essay.processar_essay_csvs")
+def _bench_processar_essay():
+    from processar_experimento import processar_essay
+    essays = [linha['essay'] for linha in ler_redacoes()]
+
+    def processar_todas():
+        for essay in essays:
+            processar_essay(essay)
+
+    return processar_todas
+
+
+@benchmark("essay.compilar_corpus_csvs", repeticoes=3)
+def _bench_compilar_corpus():
+    from avaliacao_automatica.corpus import compilar_corpus
+
+    def compilar_todos():
+        for caminho in CSVS:
+            compilar_corpus(caminho)
+
+    return compilar_todos
+
+
+@benchmark("essay.abrir_corpus_disco")
+def _bench_abrir_corpus_disco():
+    from avaliacao_automatica import corpus
+    for caminho in CSVS:
+        corpus.abrir_corpus(caminho)  # garante o compilado em disco
+
+    def limpar_memoria():
+        corpus._memo.clear()
+
+    return limpar_memoria, lambda _: [corpus.abrir_corpus(caminho) for caminho in CSVS]
+
+
+@benchmark("essay.iterar_corpus_csvs")
+def _bench_iterar_corpus():
+    from avaliacao_automatica.corpus import abrir_corpus
+    for caminho in CSVS:
+        abrir_corpus(caminho)
+
+    def iterar_todas():
+        for caminho in CSVS:
+            for redacao in abrir_corpus(caminho).iterar():
+                redacao['texto']
+
+    return iterar_todas
+
+
+def _saidas_consolidacao(quantidade: int = 100) -> List[str]:
+    gerador = random.Random(0)
+    return [
+        "Segue a avaliação consolidada:\n```json\n" + json.dumps(
+            resultado_sintetico(i, gerador, tamanho_justificativa=4000)["avaliacao_sistema"],
+            ensure_ascii=False, indent=2
+        ) + "\n```\nFico à disposição."
+        for i in range(quantidade)
+    ]
+
+
+@benchmark("json.extrair_saidas_grandes")
+def _bench_json():
+    from avaliacao_automatica.extracao_json import extrair_json_tolerante, validar_consolidacao
+    saidas = _saidas_consolidacao()
+
+    def extrair_e_validar():
+        for saida in saidas:
+            validar_consolidacao(extrair_json_tolerante(saida), saida)
+
+    return extrair_e_validar
+
+
+@benchmark("json.extrair_saidas_truncadas")
+def _bench_json_truncado():
+    from avaliacao_automatica.extracao_json import extrair_json_tolerante, validar_consolidacao
+    # Cortadas no meio da justificativa da última competência
+    saidas = [saida[:saida.index('"competencia_5"') + 60] for saida in _saidas_consolidacao()]
+
+    def extrair_e_validar():
+        for saida in saidas:
+            validar_consolidacao(extrair_json_tolerante(saida), saida)
+
+    return extrair_e_validar
+
+
+def _registro_com(quantidade: int):
+    from avaliacao_automatica.resultados import RegistroResultados
+    gerador = random.Random(0)
+    registros = [resultado_sintetico(i, gerador) for i in range(quantidade)]
+    diretorio = diretorio_temporario("bench_registro_")
+    contador = iter(range(10 ** 9))
+
+    def novo_registro():
+        return RegistroResultados(diretorio / f"registro_{next(contador)}.jsonl")
+
+    def anexar_todos(registro):
+        for item in registros:
+            registro.anexar(item)
+
+    return novo_registro, anexar_todos
+
+
+def _exportar_com(quantidade: int):
+    from avaliacao_automatica.resultados import RegistroResultados
+    gerador = random.Random(0)
+    diretorio = diretorio_temporario("bench_exportar_")
+    registro = RegistroResultados(diretorio / "registro.jsonl")
+    registro.anexar_varios(resultado_sintetico(i, gerador) for i in range(quantidade))
+    return lambda: registro.exportar_json(diretorio / "registro.json")
+
+
+for _quantidade in (10, 100, 1000):
+    benchmark(f"registro.anexar_{_quantidade}", repeticoes=3 if _quantidade == 1000 else None)(
+        lambda quantidade=_quantidade: _registro_com(quantidade)
+    )
+    benchmark(f"registro.exportar_{_quantidade}")(
+        lambda quantidade=_quantidade: _exportar_com(quantidade)
+    )
+
+
+def _resultados_metricas():
+    gerador = random.Random(0)
+    return [resultado_sintetico(i, gerador, tamanho_justificativa=50) for i in range(1000)]
+
+
+@benchmark("metricas.extrair_notas_1000")
+def _bench_extrair_notas():
+    from analisar_metricas import extrair_notas
+    resultados = _resultados_metricas()
+    return lambda: extrair_notas(resultados)
+
+
+def _arquivo_resultados_metricas() -> Path:
+    """resultados_*.json com 1000 resultados (justificativas de 400 caracteres)"""
+    gerador = random.Random(0)
+    arquivo = diretorio_temporario("bench_metricas_") / "resultados_prompt3_rag.json"
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump([resultado_sintetico(i, gerador) for i in range(1000)], f, ensure_ascii=False, indent=2)
+    return arquivo
+
+
+@benchmark("metricas.carregar_json_1000")
+def _bench_carregar_json():
+    from analisar_metricas import carregar_resultados, matrizes_notas
+    arquivo = _arquivo_resultados_metricas()
+    return lambda: matrizes_notas(carregar_resultados(arquivo))
+
+
+@benchmark("metricas.carregar_colunar_1000")
+def _bench_carregar_colunar():
+    from analisar_metricas import carregar_matrizes, carregar_resultados
+    from avaliacao_automatica.resultados_colunares import gravar_colunar
+    arquivo = _arquivo_resultados_metricas()
+    gravar_colunar(carregar_resultados(arquivo), arquivo)
+    return lambda: carregar_matrizes(arquivo)
+
+
+@benchmark("metricas.calcular_metricas_gerais_1000")
+def _bench_metricas_gerais():
+    from analisar_metricas import calcular_metricas_gerais, extrair_notas
+    df = extrair_notas(_resultados_metricas())
+    return lambda: calcular_metricas_gerais(df)
+
+
+@benchmark("metricas.calcular_metricas_300000")
+def _bench_metricas_vetorizadas():
+    import numpy as np
+    from analisar_metricas import calcular_metricas
+    gerador = np.random.default_rng(0)
+    reais = gerador.integers(0, 6, size=(300_000, 5)) * 40
+    preditas = np.clip(reais + gerador.integers(-1, 2, size=reais.shape) * 40, 0, 200)
+    return lambda: calcular_metricas(reais, preditas)
+
+
+@benchmark("metricas.analisar_incerteza_1000", repeticoes=3)
+def _bench_incerteza():
+    import numpy as np
+    from analisar_metricas import analisar_incerteza
+    gerador = np.random.default_rng(0)
+    reais = gerador.integers(0, 6, size=(1000, 5)) * 40
+    rag = np.clip(reais + gerador.integers(-1, 2, size=reais.shape) * 40, 0, 200)
+    baseline = np.clip(reais + gerador.integers(-2, 2, size=reais.shape) * 40, 0, 200)
+    return lambda: analisar_incerteza(reais, rag, baseline, reamostras=10_000)
+
+
+@benchmark("e2e.processar_experimento_simulado_10_redacoes", repeticoes=3)
+def _bench_ponta_a_ponta():
+    from processar_experimento import processar_experimento_modos
+
+    diretorio = diretorio_temporario("bench_e2e_")
+    csv_path = diretorio / "redacoes_prompt_3.csv"
+    linhas = ler_redacoes(10)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=list(linhas[0].keys()))
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+    def diretorio_vazio():
+        saida = diretorio / "saida"
+        shutil.rmtree(saida, ignore_errors=True)
+        saida.mkdir()
+        return saida
+
+    def executar(saida):
+        processar_experimento_modos(
+            csv_path=str(csv_path),
+            modos=[True, False],
+            output_dir=saida,
+            consolidacao_local=True,
+        )
+
+    return diretorio_vazio, executar
+
+
+# Pontos de entrada medidos em um interpretador novo (nome -> argumentos do python)
+PONTOS_DE_ENTRADA: Dict[str, List[str]] = {
+    "processar_experimento_help": ["processar_experimento.py", "--help"],
+    "analisar_metricas_help": ["analisar_metricas.py", "--help"],
+    "import_processar_experimento": ["-c", "import processar_experimento"],
+    "import_main": ["-c", "import avaliacao_automatica.main"],
+    "import_crew": ["-c", "import avaliacao_automatica.crew"],
+}
+
+
+def _registrar_ponto_de_entrada(nome: str, argumentos: List[str]) -> None:
+    @benchmark(f"importacao.{nome}", repeticoes=5)
+    def _bench_importacao():
+        comando = [sys.executable, *argumentos]
+
+        def executar():
+            subprocess.run(comando, cwd=RAIZ, capture_output=True, check=True)
+
+        return executar
+
+
+for _nome, _argumentos in PONTOS_DE_ENTRADA.items():
+    _registrar_ponto_de_entrada(_nome, _argumentos)
+
+
+def relatorio_importacoes(alvo: str, limite: int = 20) -> int:
+    """
+    Imprime os módulos mais caros de importar para um ponto de entrada
+
+    Usa `python -X importtime`, que informa o tempo próprio e acumulado de
+    cada import no stderr.
+
+    Args:
+        alvo: Nome em PONTOS_DE_ENTRADA ou módulo importável (ex: analisar_metricas)
+        limite: Quantidade de módulos listados
+    """
+    argumentos = PONTOS_DE_ENTRADA.get(alvo, ["-c", f"import {alvo}"])
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", *argumentos],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        proprio, acumulado, modulo = linha[len("import time:"):].split("|", 2)
+        modulos.append((int(acumulado), int(proprio), modulo.rstrip()))
+
+    if processo.returncode != 0 and not modulos:
+        print(f"❌ Falha ao executar {' '.join(argumentos)}:\n{processo.stderr.strip()}")
+        return 1
+
+    total = sum(proprio for _, proprio, _ in modulos)
+    print(f"📦 Importações de {' '.join(argumentos)}: {len(modulos)} módulos, {total / 1000:.1f} ms")
+    print(f"{'Acumulado (ms)':>15}{'Próprio (ms)':>14}  Módulo")
+    for acumulado, proprio, modulo in sorted(modulos, reverse=True)[:limite]:
+        print(f"{acumulado / 1000:>15.1f}{proprio / 1000:>14.1f}  {modulo}")
+    if processo.returncode != 0:
+        print(f"⚠️  O processo terminou com erro: {processo.stderr.strip().splitlines()[-1]}")
+    return 0
+
+
+# ============================================================================
+# RELATÓRIO
+# ============================================================================
+
+def metadados() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "data": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def executar_benchmarks(filtros: List[str], repeticoes: int) -> Dict[str, Any]:
+    relatorio: Dict[str, Any] = {"metadados": metadados(), "resultados": {}, "erros": {}}
+
+    for nome, definicao in BENCHMARKS.items():
+        if filtros and not any(nome.startswith(filtro) for filtro in filtros):
+            continue
+        n = definicao["repeticoes"] or repeticoes
+        print(f"⏱️  {nome} ({n} repetições)...", end=" ", flush=True)
+        try:
+            estatisticas = medir(definicao["preparo"], n)
+        except Exception as e:
+            relatorio["erros"][nome] = f"{type(e).__name__}: {e}"
+            print(f"❌ {type(e).__name__}: {e}")
+            if os.environ.get("BENCHMARK_DEBUG"):
+                traceback.print_exc()
+            continue
+        relatorio["resultados"][nome] = estatisticas
+        print(f"✓ mediana {estatisticas['mediana_s'] * 1000:.2f} ms")
+
+    return relatorio
+
+
+def comparar_relatorios(antes: Path, depois: Path) -> None:
+    """Imprime a variação da mediana de cada benchmark entre dois relatórios"""
+    with open(antes, encoding='utf-8') as f:
+        a = json.load(f)["resultados"]
+    with open(depois, encoding='utf-8') as f:
+        b = json.load(f)["resultados"]
+
+    print(f"{'Benchmark':<52}{'Antes (ms)':>12}{'Depois (ms)':>13}{'Variação':>11}")
+    for nome in sorted(set(a) | set(b)):
+        if nome not in a or nome not in b:
+            print(f"{nome:<52}{'—' if nome not in a else a[nome]['mediana_s'] * 1000:>12}"
+                  f"{'—' if nome not in b else b[nome]['mediana_s'] * 1000:>13}")
+            continue
+        ma, mb = a[nome]["mediana_s"], b[nome]["mediana_s"]
+        variacao = 100 * (mb - ma) / ma if ma else 0.0
+        print(f"{nome:<52}{ma * 1000:>12.2f}{mb * 1000:>13.2f}{variacao:>+10.1f}%")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks dos caminhos críticos do pipeline')
+    parser.add_argument('--apenas', nargs='*', default=[],
+                        help='Prefixos dos benchmarks a executar (ex: manual banca json)')
+    parser.add_argument('--repeticoes', type=int, default=5,
+                        help='Repetições medidas por benchmark (padrão: 5)')
+    parser.add_argument('--saida', type=str, default=None,
+                        help='Arquivo JSON do relatório (padrão: benchmarks/benchmark_<commit>.json)')
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES', 'DEPOIS'),
+                        help='Compara dois relatórios em vez de executar')
+    parser.add_argument('--listar', action='store_true', help='Lista os benchmarks disponíveis')
+    parser.add_argument('--importacoes', type=str, default=None, metavar='ALVO',
+                        help='Mostra os módulos mais caros de importar para um ponto de entrada '
+                             f'({", ".join(PONTOS_DE_ENTRADA)}) ou módulo')
+    args = parser.parse_args()
+
+    if args.listar:
+        for nome in BENCHMARKS:
+            print(nome)
+        return 0
+
+    if args.importacoes:
+        return relatorio_importacoes(args.importacoes)
+
+    if args.comparar:
+        comparar_relatorios(Path(args.comparar[0]), Path(args.comparar[1]))
+        return 0
+
+    sys.path.insert(0, str(RAIZ))
+    try:
+        relatorio = executar_benchmarks(args.apenas, args.repeticoes)
+    finally:
+        for diretorio in _TEMPORARIOS:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    if args.saida:
+        saida = Path(args.saida)
+    else:
+        saida = DIRETORIO_RELATORIOS / f"benchmark_{relatorio['metadados']['commit'] or 'local'}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    print(f"\n💾 Relatório salvo em: {saida}")
+    if relatorio["erros"]:
+        print(f"⚠️  {len(relatorio['erros'])} benchmark(s) com erro (ver 'erros' no relatório)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,25 +8,49 @@ MODO DE USO:
     python processar_experimento.py --prompt redacoes_prompt_3.csv --no-rag
     python processar_experimento.py --prompt redacoes_prompt_6.csv --rag
     python processar_experimento.py --prompt redacoes_prompt_6.csv --no-rag
+    python processar_experimento.py --prompt redacoes_prompt_3.csv --rag --paralelo
     
 FEATURES:
     - Salvamento incremental: cada redação processada é salva imediatamente
     - Recuperação automática: continua de onde parou em caso de interrupção
     - Tratamento de erros: alucinações do LLM são tratadas e registradas
+    - Modo paralelo (--paralelo): as 5 competências são avaliadas simultaneamente
+    - Consolidação local (--consolidacao-local): nota final somada em Python, sem o Presidente da Banca
+    - Recuperação de trechos (--recuperacao): injeta só os top-k trechos relevantes do manual
+    - Workers (--workers N): avalia N redações ao mesmo tempo, com checkpoint e retomada
+    - Bancas reutilizadas: agentes, tarefas e crew são montados uma vez por thread (FabricaBancas)
+    - Log (--log): detalhado, normal ou lote (uma linha JSON por redação e por tarefa)
+    - Checkpoint por tarefa: uma redação que falhou é retomada só a partir das
+      tarefas ausentes ou inválidas (--retentativas, --reprocessar-erros)
 """
 
-import pandas as pd
 import json
-import ast
 import os
 import re
+import itertools
+import queue
+import threading
+import time
 import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
-from avaliacao_automatica.crew import BancaExaminadora
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Any, Optional
+from avaliacao_automatica.ambiente import MODELO_SIMULADO, llm_simulado_selecionado
+from avaliacao_automatica.extracao_json import ConsolidacaoIncompleta, extrair_json_tolerante, validar_consolidacao
+from avaliacao_automatica.checkpoint_tarefas import CheckpointTarefas
+from avaliacao_automatica.corpus import abrir_corpus, paragrafos_redacao
+from avaliacao_automatica.fabrica import FabricaBancas
+from avaliacao_automatica.log_estruturado import NIVEIS, configurar_log, evento, eventos_ativos, log
+from avaliacao_automatica.metricas_tarefas import agregar_metricas, ratear_metricas
+from avaliacao_automatica.resultados import RegistroResultados
 from textos_apoio import obter_textos_apoio
 
+# O CrewAI (crew, LLMs) é importado só onde é usado: --help, verificações
+# e retomadas sem redações pendentes não pagam essa importação
+if TYPE_CHECKING:
+    from avaliacao_automatica.crew import BancaExaminadora
+
 
 def extrair_prompt_id_do_arquivo(nome_arquivo: str) -> int:
     """
@@ -39,22 +63,121 @@ def extrair_prompt_id_do_arquivo(nome_arquivo: str) -> int:
     raise ValueError(f"Não foi possível extrair o prompt_id do arquivo: {nome_arquivo}")
 
 
-def carregar_csv(caminho_csv: str) -> pd.DataFrame:
-    """Carrega o CSV de redações"""
-    print(f"📂 Carregando {caminho_csv}...")
-    df = pd.read_csv(caminho_csv)
-    print(f"   ✓ {len(df)} redações carregadas")
-    return df
+# Ingestão em streaming: o corpus compilado (avaliacao_automatica/corpus.py) é
+# lido em blocos, então a memória não cresce com o tamanho do corpus
+TAMANHO_BLOCO_CSV = 500
+TAMANHO_FILA_REDACOES = 32
+
+
+def contar_redacoes(caminho_csv: str) -> int:
+    """Conta as redações do CSV (pelo corpus compilado, sem reler o arquivo)"""
+    return len(abrir_corpus(caminho_csv))
+
+
+def iterar_redacoes_pendentes(
+    caminho_csv: str,
+    modos: List[bool],
+    indices_processados: Dict[bool, set],
+    tamanho_bloco: int = TAMANHO_BLOCO_CSV
+) -> Iterator[tuple]:
+    """
+    Percorre o corpus em blocos e gera (modo, redação) para cada avaliação que falta
+    
+    Redações já processadas em todos os modos são puladas antes de serem lidas
+    do corpus; as demais (já convertidas na compilação) geram uma tarefa por
+    modo pendente.
+    
+    Args:
+        caminho_csv: Caminho para o CSV com as redações
+        modos: Lista de modos (True = RAG, False = Baseline)
+        indices_processados: Dict modo -> índices já presentes no registro
+        tamanho_bloco: Número de redações lidas por vez
+    """
+    concluidas = set.intersection(*(set(indices_processados[modo]) for modo in modos)) if modos else set()
+    
+    for linha in abrir_corpus(caminho_csv).iterar(ignorar=concluidas, tamanho_bloco=tamanho_bloco):
+        idx = linha['idx']
+        redacao = {
+            "idx": idx,
+            "texto": linha['texto'],
+            "nota_real": linha['nota'],
+            "competencias_reais": linha['competencias'],
+        }
+        for modo in modos:
+            if idx not in indices_processados[modo]:
+                yield modo, redacao
+    
+    if concluidas:
+        log.info(f"\n⏭️  {len(concluidas)} redação(ões) já processada(s) foram puladas")
+
+
+def fila_limitada(itens: Iterable, tamanho: int = TAMANHO_FILA_REDACOES) -> Iterator:
+    """
+    Consome um iterável numa thread produtora através de uma fila limitada
+    
+    A leitura/conversão do CSV avança no máximo `tamanho` itens à frente dos
+    avaliadores. Erros da produtora são repassados ao consumidor.
+    """
+    fila: queue.Queue = queue.Queue(maxsize=max(tamanho, 1))
+    fim = object()
+    parar = threading.Event()
+    
+    def colocar(item) -> bool:
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produzir():
+        try:
+            for item in itens:
+                if not colocar(item):
+                    return
+        except BaseException as e:
+            colocar((fim, e))
+            return
+        colocar((fim, None))
+    
+    produtora = threading.Thread(target=produzir, name="leitor-csv", daemon=True)
+    produtora.start()
+    try:
+        while True:
+            item = fila.get()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is fim:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        parar.set()
 
 
-def gerar_nome_arquivo_resultado(csv_path: str, modo_rag: bool) -> str:
+def sufixo_simulado() -> str:
+    """
+    Sufixo dos arquivos gerados com o LLM simulado ('' com um LLM real)
+    
+    As notas simuladas nunca vão para os arquivos das execuções reais: uma
+    execução real não as trataria como já processadas e analisar_metricas.py
+    não as leria como resultados do experimento.
+    """
+    return f"_{MODELO_SIMULADO}" if llm_simulado_selecionado() else ""
+
+
+def gerar_nome_arquivo_resultado(csv_path: str, modo_rag: bool, recuperacao: bool = False) -> str:
     """
     Gera o nome do arquivo de resultado baseado no CSV e modo
     Ex: redacoes_prompt_3.csv + RAG -> resultados_prompt3_rag.json
+        redacoes_prompt_3.csv + RAG com recuperação -> resultados_prompt3_rag_trechos.json
+        redacoes_prompt_3.csv + RAG com o LLM simulado -> resultados_prompt3_rag_simulado.json
     """
     prompt_id = extrair_prompt_id_do_arquivo(csv_path)
     modo_nome = "rag" if modo_rag else "baseline"
-    return f"resultados_prompt{prompt_id}_{modo_nome}.json"
+    if modo_rag and recuperacao:
+        modo_nome = "rag_trechos"
+    return f"resultados_prompt{prompt_id}_{modo_nome}{sufixo_simulado()}.json"
 
 
 def carregar_resultados_existentes(output_path: Path) -> List[Dict[str, Any]]:
@@ -65,38 +188,68 @@ def carregar_resultados_existentes(output_path: Path) -> List[Dict[str, Any]]:
         try:
             with open(output_path, 'r', encoding='utf-8') as f:
                 resultados = json.load(f)
-            print(f"📥 {len(resultados)} resultados anteriores carregados de {output_path.name}")
+            log.info(f"📥 {len(resultados)} resultados anteriores carregados de {output_path.name}")
             return resultados
         except Exception as e:
-            print(f"⚠️  Erro ao carregar resultados anteriores: {e}")
+            log.warning(f"⚠️  Erro ao carregar resultados anteriores: {e}")
             return []
     return []
 
 
-def salvar_resultados_incrementais(resultados: List[Dict[str, Any]], output_path: Path):
+def carregar_registro_resultados(output_path: Path) -> RegistroResultados:
+    """
+    Abre o registro append-only (.jsonl) do arquivo de resultados
+    Na primeira execução, migra os resultados de um .json anterior (se houver)
+    """
+    registro = RegistroResultados(output_path.with_suffix('.jsonl'))
+    if not registro.existe() and output_path.exists():
+        legado = carregar_resultados_existentes(output_path)
+        if legado:
+            registro.anexar_varios(legado)
+            log.info(f"📦 {len(legado)} resultados migrados para {registro.caminho.name}")
+    return registro
+
+
+def salvar_resultado_incremental(registro: RegistroResultados, resultado: Dict[str, Any]):
     """
-    Salva os resultados incrementalmente (após cada redação processada)
+    Salva o resultado de uma redação (anexa uma linha ao .jsonl, com fsync)
     """
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(resultados, f, ensure_ascii=False, indent=2)
-        print(f"💾 Progresso salvo: {len(resultados)} redações em {output_path.name}")
+        registro.anexar(resultado)
+        log.info(f"💾 Progresso salvo: redação {resultado.get('redacao_index')} em {registro.caminho.name}")
     except Exception as e:
-        print(f"❌ Erro ao salvar resultados: {e}")
+        log.error(f"❌ Erro ao salvar resultado: {e}")
 
 
-def limpar_json_alucinado(texto: str) -> str:
+def emitir_eventos_resultado(resultado: Dict[str, Any]):
     """
-    Limpa possíveis alucinações do LLM no JSON
-    Remove prefixos como ```json, ```JSON, etc.
+    Emite, no modo lote, uma linha JSON para a redação e uma para cada tarefa
+    
+    As tarefas trazem tokens, chamadas, retentativas, acertos de cache e
+    tempo registrados pela instrumentação (rateados nas avaliações em lote).
     """
-    # Remove blocos de código markdown
-    texto = re.sub(r'^```[a-zA-Z]*\s*', '', texto.strip())
-    texto = re.sub(r'```\s*$', '', texto.strip())
-    # Remove aspas triplas no início/fim
-    texto = re.sub(r'^[\'\"]{3}', '', texto.strip())
-    texto = re.sub(r'[\'\"]{3}$', '', texto.strip())
-    return texto.strip()
+    if not eventos_ativos():
+        return
+    avaliacao = resultado.get('avaliacao_sistema')
+    metricas = resultado.get('metricas') or {}
+    comum = {
+        "redacao": resultado.get('redacao_index'),
+        "prompt_id": resultado.get('prompt_id'),
+        "modo": resultado.get('modo_avaliacao'),
+    }
+    for tarefa, valores in metricas.get('tarefas', {}).items():
+        evento("tarefa", **comum, tarefa=tarefa, **valores)
+    evento(
+        "redacao",
+        **comum,
+        status=resultado.get('status'),
+        nota_sistema=avaliacao.get('nota_final') if isinstance(avaliacao, dict) else None,
+        nota_real=resultado.get('nota_real'),
+        execucao=resultado.get('modo_execucao'),
+        duracao_segundos=resultado.get('duracao_segundos'),
+        total_tokens=metricas.get('total', {}).get('total_tokens'),
+        erro=resultado.get('erro'),
+    )
 
 
 def processar_essay(essay_str: str) -> str:
@@ -104,17 +257,12 @@ def processar_essay(essay_str: str) -> str:
     Converte o campo 'essay' de string para texto limpo
     O campo vem como: "['parágrafo 1', 'parágrafo 2', ...]"
     """
-    try:
-        # Converte a string para lista Python
-        paragrafos = ast.literal_eval(essay_str)
-        # Junta os parágrafos com quebra de linha dupla
-        return "\n\n".join(paragrafos)
-    except Exception:
-        return essay_str
+    # Junta os parágrafos com quebra de linha dupla
+    return "\n\n".join(paragrafos_redacao(essay_str))
 
 
 def avaliar_redacao_completa(
-    banca: BancaExaminadora,
+    banca: "BancaExaminadora",
     redacao: str,
     tema: str,
     textos_apoio: str,
@@ -129,11 +277,14 @@ def avaliar_redacao_completa(
     Inclui tratamento de erros e parsing de JSON
     """
     modo_nome = "RAG" if modo_rag else "BASELINE"
-    print(f"\n{'='*80}")
-    print(f"🎓 Redação {idx_redacao} - Prompt {prompt_id} - Modo: {modo_nome}")
-    print(f"   Tema: {tema}")
-    print(f"   Nota Real: {nota_real}")
-    print(f"{'='*80}")
+    log.info(f"\n{'='*80}")
+    log.info(f"🎓 Redação {idx_redacao} - Prompt {prompt_id} - Modo: {modo_nome}")
+    log.info(f"   Tema: {tema}")
+    log.info(f"   Nota Real: {nota_real}")
+    log.info(f"{'='*80}")
+    
+    modo_execucao = "paralela" if banca.modo_paralelo else "sequencial"
+    inicio = time.perf_counter()
     
     try:
         resultado = banca.avaliar_redacao( # type: ignore
@@ -142,36 +293,39 @@ def avaliar_redacao_completa(
             textos_apoio=textos_apoio,
             modo_rag=modo_rag
         )
+        duracao = time.perf_counter() - inicio
         
         # VERIFICAR SE RESULTADO É NULL/NONE
         if resultado is None:
-            print(f"⚠️  AVISO: Resultado da avaliação veio NULL/None!")
+            log.warning(f"⚠️  AVISO: Resultado da avaliação veio NULL/None!")
             raise ValueError("Resultado da avaliação é None - possível erro no CrewAI")
         
-        # Tentar processar o resultado se vier como string
+        # Extração tolerante se vier como string (texto ao redor, vírgulas
+        # sobrando, truncamento, ...)
+        texto_bruto = resultado if isinstance(resultado, str) else ""
         if isinstance(resultado, str):
-            resultado_limpo = limpar_json_alucinado(resultado)
-            try:
-                resultado = json.loads(resultado_limpo)
-            except json.JSONDecodeError as e:
-                print(f"⚠️  JSON mal formatado detectado. Tentando corrigir...")
-                print(f"   Primeiros 200 caracteres: {resultado[:200]}")
-                # Salvar o erro para debug
-                erro_info = {
-                    "erro_tipo": "json_decode",
-                    "mensagem": str(e),
-                    "resultado_bruto": resultado[:500]  # Primeiros 500 chars
-                }
-                raise ValueError(f"Falha ao parsear JSON: {e}") from e
+            dados = extrair_json_tolerante(resultado)
+            if dados is None:
+                log.warning(f"⚠️  Nenhum objeto JSON encontrado na saída")
+                log.debug("   Primeiros 200 caracteres: %s", resultado[:200])
+                raise ValueError("Falha ao extrair JSON da saída da avaliação")
+            resultado = dados
         
         # VERIFICAR SE RESULTADO TEM AS CHAVES ESPERADAS
         if not isinstance(resultado, dict):
-            print(f"⚠️  AVISO: Resultado não é um dicionário! Tipo: {type(resultado)}")
-            print(f"   Conteúdo: {str(resultado)[:300]}")
+            log.warning(f"⚠️  AVISO: Resultado não é um dicionário! Tipo: {type(resultado)}")
+            log.debug("   Conteúdo: %.300s", resultado)
             raise ValueError(f"Resultado não é um dict válido. Tipo: {type(resultado)}")
         
         # LOG de debug para ver o que está vindo
-        print(f"✓ Resultado recebido com {len(resultado)} chaves: {list(resultado.keys())}")
+        log.debug("✓ Resultado recebido com %d chaves: %s", len(resultado), list(resultado))
+        
+        # Validar contra o formato da consolidação, recuperando as notas possíveis
+        resultado, faltando = validar_consolidacao(
+            resultado, texto_bruto, tema, "com_rag" if modo_rag else "baseline"
+        )
+        if faltando:
+            raise ConsolidacaoIncompleta(resultado, faltando)
         
         # Estruturar resultado
         resultado_estruturado = {
@@ -182,15 +336,21 @@ def avaliar_redacao_completa(
             "nota_real": nota_real,
             "competencias_reais": competencias_reais,
             "avaliacao_sistema": resultado,
+            "modo_execucao": modo_execucao,
+            "duracao_segundos": round(duracao, 3),
             "timestamp": datetime.now().isoformat(),
             "status": "sucesso"
         }
+        if banca.estatisticas_recuperacao is not None:
+            resultado_estruturado["recuperacao"] = banca.estatisticas_recuperacao
+        if banca.metricas_execucao is not None:
+            resultado_estruturado["metricas"] = banca.metricas_execucao
         
-        print("✅ Avaliação concluída!")
+        log.info(f"✅ Avaliação concluída em {duracao:.1f}s (execução {modo_execucao})!")
         return resultado_estruturado
         
     except Exception as e:
-        print(f"❌ Erro na avaliação: {e}")
+        log.error(f"❌ Erro na avaliação: {e}")
         # Registrar erro detalhado
         resultado_com_erro = {
             "redacao_index": idx_redacao,
@@ -201,16 +361,235 @@ def avaliar_redacao_completa(
             "competencias_reais": competencias_reais,
             "erro": str(e),
             "erro_tipo": type(e).__name__,
+            "modo_execucao": modo_execucao,
+            "duracao_segundos": round(time.perf_counter() - inicio, 3),
             "timestamp": datetime.now().isoformat(),
             "status": "erro"
         }
+        if isinstance(e, ConsolidacaoIncompleta):
+            # Notas aproveitáveis: permitem reavaliar só as competências faltantes
+            resultado_com_erro["competencias_recuperadas"] = e.avaliacao["competencias"]
+        if banca.metricas_execucao is not None:
+            resultado_com_erro["metricas"] = banca.metricas_execucao
         return resultado_com_erro
 
 
+def avaliar_redacao_com_retentativas(banca: "BancaExaminadora", retentativas: int, **argumentos) -> dict:
+    """
+    Avalia uma redação e, se falhar, tenta de novo até `retentativas` vezes
+    
+    Com o checkpoint por tarefa da banca, cada nova tentativa reexecuta só as
+    tarefas ausentes ou inválidas. As métricas somam todas as tentativas.
+    
+    Args:
+        argumentos: Argumentos de avaliar_redacao_completa (exceto banca)
+    """
+    tentativas = [avaliar_redacao_completa(banca, **argumentos)]
+    while tentativas[-1]['status'] == 'erro' and len(tentativas) <= retentativas:
+        log.warning(f"🔁 Redação {argumentos['idx_redacao']}: nova tentativa "
+                    f"({len(tentativas)}/{retentativas}) a partir das tarefas que faltam")
+        tentativas.append(avaliar_redacao_completa(banca, **argumentos))
+    
+    resultado = tentativas[-1]
+    if len(tentativas) > 1:
+        resultado['tentativas'] = len(tentativas)
+        metricas = agregar_metricas(tentativas)
+        if metricas is not None:
+            metricas.pop('redacoes')
+            resultado['metricas'] = metricas
+    return resultado
+
+
+def avaliar_lote_completo(
+    banca: "BancaExaminadora",
+    redacoes: List[Dict[str, Any]],
+    tema: str,
+    textos_apoio: str,
+    prompt_id: int,
+    modo_rag: bool,
+    retentativas: int = 1
+) -> List[dict]:
+    """
+    Avalia um lote de redações (uma chamada por competência) e separa os resultados
+    
+    Cada redação gera um registro no mesmo formato de avaliar_redacao_completa.
+    Redações ausentes ou inválidas na resposta do lote são reavaliadas sozinhas.
+    
+    Args:
+        redacoes: Dicts com idx, texto, nota_real e competencias_reais
+        retentativas: Novas tentativas de uma redação reavaliada sozinha que falhar
+    
+    Returns:
+        Lista de resultados estruturados, na ordem das redações
+    """
+    modo_nome = "RAG" if modo_rag else "BASELINE"
+    log.info(f"\n{'='*80}")
+    log.info(f"📦 Lote de {len(redacoes)} redações ({[r['idx'] for r in redacoes]}) - "
+             f"Prompt {prompt_id} - Modo: {modo_nome}")
+    log.info(f"{'='*80}")
+    
+    inicio = time.perf_counter()
+    try:
+        avaliacoes = banca.avaliar_lote(
+            [(redacao['idx'], redacao['texto']) for redacao in redacoes],
+            tema=tema,
+            textos_apoio=textos_apoio,
+            modo_rag=modo_rag
+        )
+    except Exception as e:
+        log.error(f"❌ Erro no lote: {e} - reavaliando as redações individualmente")
+        avaliacoes = {}
+    duracao = time.perf_counter() - inicio
+    
+    # Métricas do lote, divididas entre as redações resolvidas nele
+    metricas_lote = banca.metricas_execucao
+    
+    resultados = []
+    for redacao in redacoes:
+        avaliacao = avaliacoes.get(str(redacao['idx']))
+        if avaliacao is None:
+            log.info(f"🔁 Redação {redacao['idx']} ausente no lote - reavaliando sozinha")
+            resultados.append(avaliar_redacao_com_retentativas(
+                banca,
+                retentativas,
+                redacao=redacao['texto'],
+                tema=tema,
+                textos_apoio=textos_apoio,
+                prompt_id=prompt_id,
+                modo_rag=modo_rag,
+                nota_real=redacao['nota_real'],
+                competencias_reais=redacao['competencias_reais'],
+                idx_redacao=redacao['idx']
+            ))
+            continue
+        
+        resultados.append({
+            "redacao_index": redacao['idx'],
+            "prompt_id": prompt_id,
+            "tema": tema,
+            "modo_avaliacao": "com_rag" if modo_rag else "baseline",
+            "nota_real": redacao['nota_real'],
+            "competencias_reais": redacao['competencias_reais'],
+            "avaliacao_sistema": avaliacao,
+            "modo_execucao": "lote",
+            # Tempo do lote rateado entre as redações
+            "duracao_segundos": round(duracao / len(redacoes), 3),
+            "timestamp": datetime.now().isoformat(),
+            "status": "sucesso"
+        })
+        if metricas_lote is not None:
+            resultados[-1]["metricas"] = ratear_metricas(metricas_lote, len(avaliacoes))
+    
+    log.info(f"✅ Lote concluído em {duracao:.1f}s "
+             f"({len(avaliacoes)}/{len(redacoes)} redações resolvidas no lote)")
+    return resultados
+
+
+def agrupar_em_lotes(itens: Iterable[tuple], tamanho_lote: int) -> Iterator[tuple]:
+    """
+    Agrupa as tarefas (modo, redação) em lotes de até tamanho_lote por modo
+    
+    Com tamanho_lote = 1 cada redação forma seu próprio lote.
+    
+    Yields:
+        (modo, lista de redações)
+    """
+    abertos: Dict[bool, List[dict]] = {}
+    for modo, redacao in itens:
+        lote = abertos.setdefault(modo, [])
+        lote.append(redacao)
+        if len(lote) >= tamanho_lote:
+            yield modo, abertos.pop(modo)
+    for modo, lote in abertos.items():
+        if lote:
+            yield modo, lote
+
+
+def imprimir_metricas_tarefas(metricas: Optional[Dict[str, Any]]):
+    """Imprime tokens, tempo, retentativas e cache por tarefa (agregados)"""
+    if not metricas:
+        return
+    total = metricas['total']
+    log.info(f"📈 Custo por tarefa ({metricas['redacoes']} redações com métricas):")
+    log.info(f"   {'Tarefa':<28}{'Chamadas':>9}{'Retent.':>9}{'Cache':>7}"
+             f"{'Tokens entr.':>14}{'Tokens saída':>14}{'% tokens':>10}{'Tempo (s)':>11}")
+    ordenadas = sorted(metricas['tarefas'].items(), key=lambda item: -item[1]['total_tokens'])
+    for nome, valores in ordenadas:
+        fracao = 100 * valores['total_tokens'] / total['total_tokens'] if total['total_tokens'] else 0.0
+        log.info(f"   {nome:<28}{valores['chamadas']:>9.0f}{valores['retentativas']:>9.0f}"
+                 f"{valores['acertos_cache']:>7.0f}{valores['prompt_tokens']:>14.0f}"
+                 f"{valores['completion_tokens']:>14.0f}{fracao:>9.1f}%{valores['duracao_segundos']:>11.1f}")
+    log.info(f"   {'TOTAL':<28}{total['chamadas']:>9.0f}{total['retentativas']:>9.0f}"
+             f"{total['acertos_cache']:>7.0f}{total['prompt_tokens']:>14.0f}"
+             f"{total['completion_tokens']:>14.0f}{100.0:>9.1f}%{total['duracao_segundos']:>11.1f}")
+
+
+def imprimir_reuso_prefixos(reuso: Dict[str, Any], prefixos_esperados: Optional[int] = None):
+    """
+    Imprime os bytes de prompt compartilhados com prompts anteriores da mesma tarefa
+
+    Args:
+        reuso: Resumo de ReusoPrefixos
+        prefixos_esperados: Prefixos fixos distintos esperados por tarefa
+            (um por tema e modo); tarefas acima disso são sinalizadas
+    """
+    total = reuso['total']
+    if not total['chamadas']:
+        return
+    log.info(f"\n♻️  Reuso de prefixo dos prompts: {total['bytes_compartilhados'] / 1e6:.2f} MB de "
+             f"{total['bytes_prompt'] / 1e6:.2f} MB compartilhados ({total['percentual_compartilhado']:.1f}%)")
+    log.info(f"   {'Tarefa':<28}{'Chamadas':>9}{'Prefixo fixo (KB)':>19}{'Prefixos':>10}{'% compart.':>12}")
+    for nome, valores in sorted(reuso['tarefas'].items()):
+        prefixo_medio = valores['bytes_prefixo_fixo'] / valores['chamadas'] / 1e3
+        instavel = prefixos_esperados is not None and valores['prefixos_distintos'] > prefixos_esperados
+        log.info(f"   {nome:<28}{valores['chamadas']:>9}{prefixo_medio:>19.1f}{valores['prefixos_distintos']:>10}"
+                 f"{valores['percentual_compartilhado']:>11.1f}%{'  ⚠️ prefixo instável' if instavel else ''}")
+
+
+def descrever_lote(lote: List[dict]) -> str:
+    """Posição (1-based) da redação, ou intervalo de posições de um lote"""
+    if len(lote) == 1:
+        return str(lote[0]['idx'] + 1)
+    return f"{lote[0]['idx'] + 1}-{lote[-1]['idx'] + 1}"
+
+
+def nome_do_modo(modo_rag: bool) -> str:
+    """Nome curto do modo usado na CLI e nos relatórios ('rag' ou 'baseline')"""
+    return "rag" if modo_rag else "baseline"
+
+
+def interpretar_modos(texto: str) -> List[bool]:
+    """
+    Converte a opção --modes em uma lista de modos (True = RAG, False = Baseline)
+    Ex: 'rag,baseline' -> [True, False]
+    """
+    modos: List[bool] = []
+    for nome in texto.split(','):
+        nome = nome.strip().lower()
+        if nome not in ("rag", "baseline"):
+            raise ValueError(f"Modo desconhecido: '{nome}' (use 'rag' e/ou 'baseline')")
+        modo = nome == "rag"
+        if modo not in modos:
+            modos.append(modo)
+    if not modos:
+        raise ValueError("Informe pelo menos um modo (ex: --modes rag,baseline)")
+    return modos
+
+
 def processar_experimento(
     csv_path: str,
     modo_rag: bool,
-    output_dir: Path
+    output_dir: Path,
+    modo_paralelo: bool = False,
+    consolidacao_local: bool = False,
+    recuperacao: bool = False,
+    top_k: Optional[int] = None,
+    orcamento_tokens: Optional[int] = None,
+    workers: int = 1,
+    cache_llm: bool = False,
+    tamanho_lote: int = 1,
+    retentativas: int = 1,
+    reprocessar_erros: bool = False
 ):
     """
     Processa todas as redações de um CSV em um modo específico (RAG ou Baseline)
@@ -219,131 +598,362 @@ def processar_experimento(
     - Salvamento incremental: cada redação é salva após ser processada
     - Recuperação: se já existem resultados, continua de onde parou
     - Tratamento de erros: não para se uma redação falhar
+    - Workers (workers > 1): N redações avaliadas simultaneamente, cada worker
+      com sua própria banca; o checkpoint continua sendo feito a cada redação
     
     Args:
         csv_path: Caminho para o CSV com as redações
         modo_rag: True para RAG, False para Baseline
         output_dir: Diretório onde salvar os resultados
+        modo_paralelo: True para avaliar as 5 competências simultaneamente
+        consolidacao_local: True para consolidar em Python (sem o Presidente da Banca)
+        recuperacao: True para injetar só os trechos relevantes dos manuais (modo RAG)
+        top_k: Número máximo de trechos por manual (None = padrão)
+        orcamento_tokens: Orçamento de tokens por manual (None = padrão)
+        workers: Número de redações avaliadas simultaneamente
+        cache_llm: True para reutilizar respostas do LLM em cache (prompts idênticos)
+        tamanho_lote: Máximo de redações por chamada de competência (1 = sem lote)
+        retentativas: Novas tentativas de uma redação que falhou, reexecutando
+            só as tarefas ausentes ou inválidas no checkpoint por tarefa
+        reprocessar_erros: True para reavaliar redações registradas com erro
+            numa execução anterior
+    """
+    resultados_por_modo = processar_experimento_modos(
+        csv_path=csv_path,
+        modos=[modo_rag],
+        output_dir=output_dir,
+        modo_paralelo=modo_paralelo,
+        consolidacao_local=consolidacao_local,
+        recuperacao=recuperacao,
+        top_k=top_k,
+        orcamento_tokens=orcamento_tokens,
+        workers=workers,
+        cache_llm=cache_llm,
+        tamanho_lote=tamanho_lote,
+        retentativas=retentativas,
+        reprocessar_erros=reprocessar_erros
+    )
+    return resultados_por_modo[nome_do_modo(modo_rag)]
+
+
+def processar_experimento_modos(
+    csv_path: str,
+    modos: List[bool],
+    output_dir: Path,
+    modo_paralelo: bool = False,
+    consolidacao_local: bool = False,
+    recuperacao: bool = False,
+    top_k: Optional[int] = None,
+    orcamento_tokens: Optional[int] = None,
+    workers: int = 1,
+    cache_llm: bool = False,
+    tamanho_lote: int = 1,
+    retentativas: int = 1,
+    reprocessar_erros: bool = False,
+    tamanho_bloco: int = TAMANHO_BLOCO_CSV,
+    tamanho_fila: int = TAMANHO_FILA_REDACOES
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Processa todas as redações de um CSV em um ou mais modos numa única passada
+    
+    Cada redação é lida e convertida (processar_essay) uma única vez; as
+    avaliações dos modos pedidos são agendadas ao mesmo tempo, cada modo com
+    sua própria banca e seu próprio arquivo de resultados. Com RAG e Baseline
+    juntos, o experimento completo leva aproximadamente o tempo de um modo.
+    
+    Args:
+        csv_path: Caminho para o CSV com as redações
+        modos: Lista de modos (True = RAG, False = Baseline)
+        output_dir: Diretório onde salvar os resultados
+        workers: Número de redações avaliadas simultaneamente por modo
+        tamanho_lote: Máximo de redações por chamada de competência (1 = sem lote)
+        tamanho_bloco: Linhas do CSV lidas por vez
+        tamanho_fila: Máximo de tarefas lidas à frente dos avaliadores
+        (demais argumentos: ver processar_experimento)
+    
+    Returns:
+        Dict nome do modo ('rag'/'baseline') -> lista de resultados exportados
     """
     # Extrair prompt_id do nome do arquivo
     prompt_id = extrair_prompt_id_do_arquivo(csv_path)
-    modo_nome = "RAG" if modo_rag else "BASELINE"
+    modos_nome = " + ".join("RAG" if modo else "BASELINE" for modo in modos)
     
-    print(f"\n{'#'*80}")
-    print(f"# PROCESSANDO: {csv_path}")
-    print(f"# PROMPT: {prompt_id} | MODO: {modo_nome}")
-    print(f"{'#'*80}")
+    log.info(f"\n{'#'*80}")
+    log.info(f"# PROCESSANDO: {csv_path}")
+    log.info(f"# PROMPT: {prompt_id} | MODO: {modos_nome}")
+    log.info(f"{'#'*80}")
     
-    # Carregar CSV
-    df = carregar_csv(csv_path)
-    total_redacoes = len(df)
+    # Contar redações (o CSV é compilado uma vez e depois lido do cache)
+    log.info(f"📂 Lendo {csv_path} em blocos de {tamanho_bloco} redações...")
+    total_redacoes = contar_redacoes(csv_path)
+    log.info(f"   ✓ {total_redacoes} redações encontradas")
     
     # Obter tema e textos de apoio
     tema, textos_apoio = obter_textos_apoio(prompt_id)
-    print(f"\n📝 Tema: {tema}")
-    print(f"📋 Textos de apoio: {len(textos_apoio)} caracteres")
+    log.info(f"\n📝 Tema: {tema}")
+    log.info(f"📋 Textos de apoio: {len(textos_apoio)} caracteres")
     
-    # Definir caminho do arquivo de saída
-    nome_arquivo_saida = gerar_nome_arquivo_resultado(csv_path, modo_rag)
-    output_file = output_dir / nome_arquivo_saida
+    # Um registro de resultados (.jsonl) por modo; reconstrói, em streaming,
+    # quais redações já foram processadas em cada um
+    arquivos_saida: Dict[bool, Path] = {}
+    registros: Dict[bool, RegistroResultados] = {}
+    indices_processados: Dict[bool, set] = {}
+    redacoes_processadas: Dict[bool, int] = {}
     
-    # Carregar resultados existentes (se houver)
-    resultados = carregar_resultados_existentes(output_file)
-    redacoes_processadas = len(resultados)
+    for modo in modos:
+        arquivos_saida[modo] = output_dir / gerar_nome_arquivo_resultado(csv_path, modo, recuperacao)
+        registros[modo] = carregar_registro_resultados(arquivos_saida[modo])
+        indices_processados[modo] = registros[modo].indices_processados(incluir_erros=not reprocessar_erros)
+        redacoes_processadas[modo] = len(indices_processados[modo])
+        
+        if redacoes_processadas[modo] > 0:
+            log.info(f"\n🔄 RECUPERAÇÃO DETECTADA ({nome_do_modo(modo)}): "
+                     f"{redacoes_processadas[modo]}/{total_redacoes} redações já processadas")
+            log.info(f"   Continuando de onde parou...")
     
-    # Verificar quais redações já foram processadas
-    indices_processados = {r.get('redacao_index', -1) for r in resultados}
+    # LLM compartilhado pelas bancas (com cache de respostas, se pedido),
+    # montado junto com a primeira banca: uma retomada sem redações
+    # pendentes não chega a importar o CrewAI
+    llm_compartilhado: Dict[str, Any] = {}
+    lock_llm = threading.Lock()
     
-    if redacoes_processadas > 0:
-        print(f"\n🔄 RECUPERAÇÃO DETECTADA: {redacoes_processadas}/{total_redacoes} redações já processadas")
-        print(f"   Continuando de onde parou...")
+    def obter_llm_banca():
+        with lock_llm:
+            if 'llm' not in llm_compartilhado:
+                from avaliacao_automatica.cache_llm import LLMComCache
+                from avaliacao_automatica.crew import BancaExaminadora
+                from avaliacao_automatica.llm_simulado import LLMSimulado
+                from avaliacao_automatica.prefixos import LLMComReusoPrefixos
+                
+                llm_banca = BancaExaminadora.llm
+                if llm_simulado_selecionado() and not isinstance(llm_banca, LLMSimulado):
+                    llm_banca = LLMSimulado(model=os.environ["MODEL"])
+                if cache_llm and not isinstance(llm_banca, LLMComCache):
+                    llm_banca = LLMComCache(llm_banca)
+                if isinstance(llm_banca, LLMComCache):
+                    llm_compartilhado['cache'] = llm_banca.cache
+                
+                # Observa os prompts renderizados para medir o reuso de prefixo entre redações
+                llm_compartilhado['llm'] = LLMComReusoPrefixos(llm_banca)
+            return llm_compartilhado['llm']
     
-    # Criar banca
-    print(f"\n🎓 Criando Banca Examinadora...")
-    banca = BancaExaminadora()
+    total_threads = max(workers, 1) * len(modos)
     
-    # Processar cada redação
-    for idx, row in df.iterrows():
-        # Verificar se esta redação já foi processada
-        if idx in indices_processados:
-            print(f"\n⏭️  Redação {idx + 1}/{total_redacoes} - JÁ PROCESSADA (pulando)")
-            continue
-        
-        print(f"\n{'─'*80}")
-        print(f"📄 Processando Redação {idx + 1}/{total_redacoes}")
-        print(f"{'─'*80}")
-        
-        # Extrair dados
-        redacao_texto = processar_essay(row['essay'])
-        nota_real = row['score']
+    # Saídas de cada tarefa gravadas ao terminar: uma redação que falhou é
+    # retomada a partir das tarefas ausentes ou inválidas
+    checkpoint = CheckpointTarefas(output_dir / f"tarefas_prompt{prompt_id}{sufixo_simulado()}.jsonl")
+    
+    # Bancas pré-construídas (agentes, tarefas e crew) e reutilizadas a cada
+    # redação: uma por thread, pois a crew não é compartilhável entre threads
+    def configurar_banca(banca: "BancaExaminadora", numero: int):
+        if total_threads <= 1:
+            log.info(f"\n🎓 Criando Banca Examinadora...")
+        banca.usar_llm(obter_llm_banca())
+        banca.checkpoint = checkpoint
+        if total_threads > 1:
+            # Os resultados vão para o registro; um output_file por banca só
+            # deixaria arquivos soltos (e não-resultados) em output_dir
+            banca.arquivo_saida = None
+        banca.modo_paralelo = modo_paralelo
+        banca.consolidacao_local = consolidacao_local
+        banca.recuperacao_trechos = recuperacao
+        if top_k is not None:
+            banca.top_k_trechos = top_k
+        if orcamento_tokens is not None:
+            banca.orcamento_tokens_manual = orcamento_tokens
+        if tamanho_lote > 1:
+            banca.tamanho_lote = tamanho_lote
+    
+    fabrica = FabricaBancas(configurar_banca)
+    
+    def avaliar(banca: "BancaExaminadora", modo: bool, lote: List[dict]) -> List[dict]:
+        if tamanho_lote > 1:
+            return avaliar_lote_completo(banca, lote, tema, textos_apoio, prompt_id, modo, retentativas)
+        return [
+            avaliar_redacao_com_retentativas(
+                banca,
+                retentativas,
+                redacao=redacao['texto'],
+                tema=tema,
+                textos_apoio=textos_apoio,
+                prompt_id=prompt_id,
+                modo_rag=modo,
+                nota_real=redacao['nota_real'],
+                competencias_reais=redacao['competencias_reais'],
+                idx_redacao=redacao['idx']
+            )
+            for redacao in lote
+        ]
+    
+    # Redações pendentes em streaming: o CSV é lido em blocos por uma thread
+    # produtora e cada redação é convertida uma única vez, gerando uma tarefa
+    # por modo que ainda falta; a fila limitada mantém a memória constante.
+    # As tarefas são agrupadas em lotes por modo (lote de 1 sem --lote)
+    fila_redacoes = fila_limitada(
+        iterar_redacoes_pendentes(csv_path, modos, indices_processados, tamanho_bloco),
+        tamanho_fila
+    )
+    pendentes = agrupar_em_lotes(fila_redacoes, max(tamanho_lote, 1))
+    
+    def registrar(modo: bool, resultados: List[dict]):
+        # SALVAR INCREMENTALMENTE
+        for resultado in resultados:
+            salvar_resultado_incremental(registros[modo], resultado)
+            emitir_eventos_resultado(resultado)
+            redacoes_processadas[modo] += 1
+        log.info(f"📊 Progresso ({nome_do_modo(modo)}): "
+                 f"{redacoes_processadas[modo]}/{total_redacoes} redações processadas")
+    
+    resultados_por_modo: Dict[str, List[Dict[str, Any]]] = {}
+    
+    try:
+        if total_threads <= 1:
+            # Processar cada redação (ou lote de redações)
+            for modo, lote in pendentes:
+                log.info(f"\n{'─'*80}")
+                log.info(f"📄 Processando Redação {descrever_lote(lote)}/{total_redacoes}")
+                log.info(f"{'─'*80}")
+                
+                registrar(modo, avaliar(fabrica.obter(), modo, lote))
+        else:
+            log.info(f"\n🎓 Criando {total_threads} Bancas Examinadoras "
+                     f"({max(workers, 1)} worker(s) x {len(modos)} modo(s))...")
+            
+            def avaliar_no_worker(modo: bool, lote: List[dict]) -> List[dict]:
+                banca = fabrica.obter()
+                log.info(f"\n📄 [{threading.current_thread().name}] Processando Redação "
+                         f"{descrever_lote(lote)}/{total_redacoes} ({nome_do_modo(modo)})")
+                return avaliar(banca, modo, lote)
+            
+            # Sem o bloco with: na saída ele esperaria as avaliações em
+            # andamento mesmo após um Ctrl+C
+            executor = ThreadPoolExecutor(max_workers=total_threads, thread_name_prefix="worker")
+            futuros = {}
+            fila = iter(pendentes)
+            interrompido = False
+            try:
+                # Janela limitada: no máximo 2 avaliações por thread em voo
+                for modo, lote in itertools.islice(fila, 2 * total_threads):
+                    futuros[executor.submit(avaliar_no_worker, modo, lote)] = modo
+                
+                while futuros:
+                    concluidos, _ = wait(futuros, return_when=FIRST_COMPLETED)
+                    for futuro in concluidos:
+                        # Checkpoint só no thread principal: sem escrita concorrente
+                        registrar(futuros.pop(futuro), futuro.result())
+                        
+                        proxima = next(fila, None)
+                        if proxima is not None:
+                            futuros[executor.submit(avaliar_no_worker, *proxima)] = proxima[0]
+            except KeyboardInterrupt:
+                interrompido = True
+                for futuro in futuros:
+                    futuro.cancel()
+                raise
+            finally:
+                executor.shutdown(wait=not interrompido, cancel_futures=interrompido)
+    finally:
+        # Encerra a leitura do CSV (se interrompida antes do fim)
+        fila_redacoes.close()
         
-        # Converter competencias de string para lista
-        try:
-            competencias_reais = ast.literal_eval(row['competence'])
-        except Exception:
-            competencias_reais = []
+        # Gera os arrays JSON consumidos por analisar_metricas.py (também em
+        # interrupções); uma falha aqui não pode encobrir a exceção original,
+        # e o registro .jsonl continua íntegro para uma nova exportação
+        for modo in modos:
+            try:
+                resultados_por_modo[nome_do_modo(modo)] = registros[modo].exportar_json(arquivos_saida[modo])
+            except Exception as e:
+                log.error(f"❌ Falha ao exportar {arquivos_saida[modo]}: {e}")
+                log.error(f"   Para exportar depois: python -m avaliacao_automatica.resultados "
+                          f"exportar {registros[modo].caminho}")
+                resultados_por_modo[nome_do_modo(modo)] = []
+    
+    # Relatório final
+    log.info(f"\n{'='*80}")
+    log.info(f"✅ PROCESSAMENTO CONCLUÍDO!")
+    log.info(f"{'='*80}")
+    log.info(f"📁 Arquivo: {csv_path}")
+    log.info(f"🎯 Prompt: {prompt_id}")
+    
+    for modo in modos:
+        resultados = resultados_por_modo[nome_do_modo(modo)]
+        log.info(f"\n⚙️  Modo: {'RAG' if modo else 'BASELINE'}")
+        log.info(f"📊 Total: {len(resultados)}/{total_redacoes} redações")
         
-        # Avaliar
-        resultado = avaliar_redacao_completa(
-            banca=banca,
-            redacao=redacao_texto,
-            tema=tema,
-            textos_apoio=textos_apoio,
-            prompt_id=prompt_id,
-            modo_rag=modo_rag,
-            nota_real=nota_real,
-            competencias_reais=competencias_reais,
-            idx_redacao=int(idx)
-        )
+        # Contar sucessos e erros
+        sucessos = sum(1 for r in resultados if r.get('status') == 'sucesso')
+        erros = sum(1 for r in resultados if r.get('status') == 'erro')
+        log.info(f"✅ Sucessos: {sucessos}")
+        log.info(f"❌ Erros: {erros}")
+        evento("execucao", prompt_id=prompt_id, modo=nome_do_modo(modo), redacoes=len(resultados),
+               total_redacoes=total_redacoes, sucessos=sucessos, erros=erros,
+               arquivo=str(arquivos_saida[modo]))
         
-        # Adicionar aos resultados
-        resultados.append(resultado)
+        # Economia de tokens da recuperação de trechos (se usada)
+        com_recuperacao = [r['recuperacao'] for r in resultados if r.get('recuperacao')]
+        if com_recuperacao:
+            injetados = sum(e['tokens_injetados'] for e in com_recuperacao)
+            completos = sum(e['tokens_manual_completo'] for e in com_recuperacao)
+            log.info(f"🔎 Tokens de manual injetados: {injetados} (manual completo: {completos})")
+            log.info(f"   Economia estimada: {completos - injetados} tokens "
+                     f"({100 * (completos - injetados) / completos:.1f}%)")
         
-        # SALVAR INCREMENTALMENTE
-        salvar_resultados_incrementais(resultados, output_file)
+        imprimir_metricas_tarefas(agregar_metricas(resultados))
         
-        # Status
-        print(f"📊 Progresso: {len(resultados)}/{total_redacoes} redações processadas")
+        log.info(f"💾 Resultados salvos em: {arquivos_saida[modo]} (registro: {registros[modo].caminho.name})")
     
-    # Relatório final
-    print(f"\n{'='*80}")
-    print(f"✅ PROCESSAMENTO CONCLUÍDO!")
-    print(f"{'='*80}")
-    print(f"📁 Arquivo: {csv_path}")
-    print(f"🎯 Prompt: {prompt_id}")
-    print(f"⚙️  Modo: {modo_nome}")
-    print(f"📊 Total: {len(resultados)}/{total_redacoes} redações")
-    
-    # Contar sucessos e erros
-    sucessos = sum(1 for r in resultados if r.get('status') == 'sucesso')
-    erros = sum(1 for r in resultados if r.get('status') == 'erro')
-    print(f"✅ Sucessos: {sucessos}")
-    print(f"❌ Erros: {erros}")
-    print(f"💾 Resultados salvos em: {output_file}")
-    print(f"{'='*80}")
+    # Tarefas gravadas e reaproveitadas pelo checkpoint por tarefa
+    estatisticas_checkpoint = checkpoint.estatisticas()
+    if estatisticas_checkpoint['reaproveitadas']:
+        log.info(f"\n♻️  Checkpoint por tarefa: {estatisticas_checkpoint['reaproveitadas']} saída(s) "
+                 f"reaproveitada(s), {estatisticas_checkpoint['gravadas']} gravada(s) em {checkpoint.caminho.name}")
     
-    return resultados
+    # Custo de montagem das bancas (feito uma vez por thread, não por redação)
+    estatisticas_bancas = fabrica.estatisticas()
+    log.info(f"\n🏗️  Bancas: {estatisticas_bancas['bancas']} construída(s) em "
+             f"{estatisticas_bancas['construcao_segundos']:.2f}s "
+             f"({estatisticas_bancas['construcao_media_segundos']:.2f}s cada), "
+             f"reutilizadas {estatisticas_bancas['reutilizacoes']} vez(es)")
+    
+    # Prefixo fixo: um por modo em cada tarefa (a recuperação de trechos varia o manual por redação)
+    if 'llm' in llm_compartilhado:
+        imprimir_reuso_prefixos(llm_compartilhado['llm'].reuso.resumo(), None if recuperacao else len(modos))
+    
+    # Aproveitamento do cache de respostas do LLM (se usado)
+    if 'cache' in llm_compartilhado:
+        estatisticas_cache = llm_compartilhado['cache'].estatisticas()
+        log.info(f"\n📦 Cache do LLM: {estatisticas_cache['acertos']} acertos, "
+                 f"{estatisticas_cache['falhas']} falhas "
+                 f"(taxa de acerto: {100 * estatisticas_cache['taxa_acerto']:.1f}%)")
+    
+    log.info(f"{'='*80}")
+    
+    return resultados_por_modo
 
 
 def verificar_api_key_gemini():
     """Verifica se a API Key do Gemini está configurada"""
+    if llm_simulado_selecionado():
+        log.info("🧪 LLM simulado selecionado (MODEL=simulado): API Key não necessária")
+        return
+    
     if "GEMINI_API_KEY" not in os.environ and "GOOGLE_API_KEY" not in os.environ:
-        print("\n" + "="*80)
-        print("⚠️  ATENÇÃO: API Key do Google Gemini não encontrada!")
-        print("="*80)
-        print("\nConfigure uma das seguintes variáveis de ambiente:")
-        print("  - GEMINI_API_KEY")
-        print("  - GOOGLE_API_KEY")
-        print("\nExemplo (Windows PowerShell):")
-        print('  $env:GEMINI_API_KEY="sua-chave-aqui"')
-        print("\nExemplo (Linux/Mac):")
-        print('  export GEMINI_API_KEY="sua-chave-aqui"')
-        print("\nOu crie um arquivo .env com:")
-        print('  GEMINI_API_KEY=sua-chave-aqui')
-        print("="*80)
+        log.warning("\n" + "="*80)
+        log.warning("⚠️  ATENÇÃO: API Key do Google Gemini não encontrada!")
+        log.warning("="*80)
+        log.warning("\nConfigure uma das seguintes variáveis de ambiente:")
+        log.warning("  - GEMINI_API_KEY")
+        log.warning("  - GOOGLE_API_KEY")
+        log.warning("\nExemplo (Windows PowerShell):")
+        log.warning('  $env:GEMINI_API_KEY="sua-chave-aqui"')
+        log.warning("\nExemplo (Linux/Mac):")
+        log.warning('  export GEMINI_API_KEY="sua-chave-aqui"')
+        log.warning("\nOu crie um arquivo .env com:")
+        log.warning('  GEMINI_API_KEY=sua-chave-aqui')
+        log.warning("="*80)
         raise EnvironmentError("API Key do Gemini não configurada")
     
-    print("✅ API Key do Gemini encontrada")
+    log.info("✅ API Key do Gemini encontrada")
 
 
 def main():
@@ -355,6 +965,9 @@ def main():
         python processar_experimento.py --prompt redacoes_prompt_3.csv --no-rag
         python processar_experimento.py --prompt redacoes_prompt_6.csv --rag
         python processar_experimento.py --prompt redacoes_prompt_6.csv --no-rag
+        python processar_experimento.py --prompt redacoes_prompt_3.csv --modes rag,baseline
+        python processar_experimento.py --prompt redacoes_prompt_3.csv --rag --lote 4
+        python processar_experimento.py --prompt redacoes_prompt_3.csv --rag --llm-simulado
     """
     parser = argparse.ArgumentParser(
         description='Processa experimento de avaliação automática de redações',
@@ -365,6 +978,10 @@ Exemplos de uso:
   python processar_experimento.py --prompt redacoes_prompt_3.csv --no-rag
   python processar_experimento.py --prompt redacoes_prompt_6.csv --rag
   python processar_experimento.py --prompt redacoes_prompt_6.csv --no-rag
+  python processar_experimento.py --prompt redacoes_prompt_3.csv --rag --paralelo
+  python processar_experimento.py --prompt redacoes_prompt_3.csv --rag --workers 4
+  python processar_experimento.py --prompt redacoes_prompt_3.csv --modes rag,baseline
+  python processar_experimento.py --prompt redacoes_prompt_3.csv --rag --log lote > eventos.jsonl
 
 Recursos:
   • Salvamento incremental: cada redação é salva após ser processada
@@ -391,25 +1008,132 @@ Recursos:
         action='store_true',
         help='Processar SEM RAG / BASELINE (sem manuais, apenas conhecimento prévio)'
     )
+    rag_group.add_argument(
+        '--modes',
+        type=str,
+        default=None,
+        help='Processar vários modos numa única passada (ex: rag,baseline)'
+    )
+    
+    parser.add_argument(
+        '--paralelo',
+        action='store_true',
+        help='Avaliar as 5 competências simultaneamente (padrão: sequencial)'
+    )
+    
+    parser.add_argument(
+        '--consolidacao-local',
+        action='store_true',
+        help='Consolidar as notas em Python, sem a chamada ao Presidente da Banca'
+    )
+    
+    parser.add_argument(
+        '--recuperacao',
+        action='store_true',
+        help='Modo RAG com recuperação: injeta só os top-k trechos relevantes de cada manual'
+    )
+    
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=None,
+        help='Número máximo de trechos por manual no modo --recuperacao'
+    )
+    
+    parser.add_argument(
+        '--orcamento-tokens',
+        type=int,
+        default=None,
+        help='Orçamento (estimado) de tokens por manual no modo --recuperacao'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Número de redações avaliadas simultaneamente (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--lote',
+        type=int,
+        default=1,
+        help='Máximo de redações por chamada de competência (padrão: 1 = sem lote)'
+    )
+    
+    parser.add_argument(
+        '--llm-simulado',
+        action='store_true',
+        help='Usa o LLM simulado local (sem rede/API key), o mesmo que MODEL=simulado'
+    )
+    
+    parser.add_argument(
+        '--cache-llm',
+        action='store_true',
+        help='Reutiliza respostas do LLM em cache local para prompts idênticos'
+    )
+    
+    parser.add_argument(
+        '--retentativas',
+        type=int,
+        default=1,
+        help='Novas tentativas de uma redação que falhou, reexecutando só as tarefas '
+             'ausentes ou inválidas (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--reprocessar-erros',
+        action='store_true',
+        help='Reavalia as redações registradas com erro numa execução anterior '
+             '(reaproveitando as tarefas já concluídas)'
+    )
+    
+    parser.add_argument(
+        '--log',
+        choices=list(NIVEIS),
+        default=None,
+        help='Nível de saída: detalhado (agentes verbosos), normal (padrão) ou '
+             'lote (uma linha JSON por redação e por tarefa); o mesmo que LOG_NIVEL'
+    )
     
     args = parser.parse_args()
+    configurar_log(args.log)
+    
+    # As opções de LLM valem como as variáveis de ambiente equivalentes: o
+    # LLM da classe BancaExaminadora é montado quando crew.py é importado
+    if args.llm_simulado:
+        os.environ["MODEL"] = "simulado"
+    if args.cache_llm:
+        os.environ["CACHE_LLM"] = "1"
     
-    # Determinar modo RAG
-    modo_rag = args.rag
+    # Determinar modo(s): --rag, --no-rag ou --modes rag,baseline
+    if args.modes:
+        try:
+            modos = interpretar_modos(args.modes)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        modos = [args.rag]
+    descricao_modos = {True: 'RAG (com manuais)', False: 'BASELINE (sem manuais)'}
     
     # Validar arquivo
     csv_path = Path(args.prompt)
     if not csv_path.exists():
-        print(f"❌ Erro: Arquivo não encontrado: {csv_path}")
-        print(f"   Certifique-se de que o arquivo existe no diretório atual")
+        log.error(f"❌ Erro: Arquivo não encontrado: {csv_path}")
+        log.error(f"   Certifique-se de que o arquivo existe no diretório atual")
         return
     
-    print("\n" + "="*80)
-    print("🚀 AVALIADOR AUTOMÁTICO DE REDAÇÕES - ENEM")
-    print("="*80)
-    print(f"📁 Arquivo: {csv_path}")
-    print(f"⚙️  Modo: {'RAG (com manuais)' if modo_rag else 'BASELINE (sem manuais)'}")
-    print("="*80)
+    log.info("\n" + "="*80)
+    log.info("🚀 AVALIADOR AUTOMÁTICO DE REDAÇÕES - ENEM")
+    log.info("="*80)
+    log.info(f"📁 Arquivo: {csv_path}")
+    log.info(f"⚙️  Modo: {' + '.join(descricao_modos[modo] for modo in modos)}")
+    log.info(f"⚡ Execução: {'PARALELA' if args.paralelo else 'SEQUENCIAL'}")
+    log.info(f"🧮 Consolidação: {'LOCAL' if args.consolidacao_local else 'PRESIDENTE DA BANCA (LLM)'}")
+    log.info(f"👷 Workers: {args.workers}")
+    if args.lote > 1:
+        log.info(f"📦 Lote: até {args.lote} redações por chamada de competência")
+    log.info("="*80)
     
     # Verificar API Key
     verificar_api_key_gemini()
@@ -417,24 +1141,34 @@ Recursos:
     # Criar diretório de resultados
     output_dir = Path("resultados_experimento")
     output_dir.mkdir(exist_ok=True)
-    print(f"📂 Diretório de saída: {output_dir.absolute()}")
+    log.info(f"📂 Diretório de saída: {output_dir.absolute()}")
     
     # Processar
     try:
-        processar_experimento(
+        processar_experimento_modos(
             csv_path=str(csv_path),
-            modo_rag=modo_rag,
-            output_dir=output_dir
+            modos=modos,
+            output_dir=output_dir,
+            modo_paralelo=args.paralelo,
+            consolidacao_local=args.consolidacao_local,
+            recuperacao=args.recuperacao,
+            top_k=args.top_k,
+            orcamento_tokens=args.orcamento_tokens,
+            workers=args.workers,
+            cache_llm=args.cache_llm,
+            tamanho_lote=args.lote,
+            retentativas=args.retentativas,
+            reprocessar_erros=args.reprocessar_erros
         )
         
-        print("\n🎉 PROCESSAMENTO FINALIZADO COM SUCESSO!")
+        log.info("\n🎉 PROCESSAMENTO FINALIZADO COM SUCESSO!")
         
     except KeyboardInterrupt:
-        print("\n\n⚠️  INTERROMPIDO PELO USUÁRIO")
-        print("💾 Resultados parciais foram salvos e podem ser retomados")
+        log.warning("\n\n⚠️  INTERROMPIDO PELO USUÁRIO")
+        log.warning("💾 Resultados parciais foram salvos e podem ser retomados")
     except Exception as e:
-        print(f"\n\n❌ ERRO CRÍTICO: {e}")
-        print("💾 Resultados parciais (se houver) foram salvos")
+        log.error(f"\n\n❌ ERRO CRÍTICO: {e}")
+        log.error("💾 Resultados parciais (se houver) foram salvos")
         raise
 
 
@@ -450,16 +1184,14 @@ def processar_teste_individual(idx_redacao: int):
     # Verificar API Key do Gemini
     verificar_api_key_gemini()
     
-    # Carregar apenas a primeira redação do prompt 3
-    df = pd.read_csv("redacoes_prompt_3.csv")
-
-    print(df)
-
-    if idx_redacao < 0 or idx_redacao >= len(df):
-        raise IndexError("Índice da redação inválido (fora dos limites)")
-    row = df.iloc[idx_redacao]
+    from avaliacao_automatica.crew import BancaExaminadora
+    
+    # Carregar apenas a redação pedida do prompt 3 (IndexError se fora dos limites)
+    corpus = abrir_corpus("redacoes_prompt_3.csv")
+    print(f"📚 redacoes_prompt_3.csv: {len(corpus)} redações")
+    redacao = corpus.redacao(idx_redacao)
     
-    redacao_texto = processar_essay(row['essay'])
+    redacao_texto = redacao['texto']
     
     # Obter tema e textos de apoio do prompt 3
     tema, textos_apoio = obter_textos_apoio(3)
@@ -494,14 +1226,14 @@ def processar_teste_individual_baseline(idx_redacao: int):
     # Verificar API Key do Gemini
     verificar_api_key_gemini()
     
-    # Carregar apenas a primeira redação do prompt 3
-    df = pd.read_csv("redacoes_prompt_3.csv")
-    print(df)
-    if idx_redacao < 0 or idx_redacao >= len(df):
-        raise IndexError("Índice da redação inválido (fora dos limites)")
-    row = df.iloc[idx_redacao]
+    from avaliacao_automatica.crew import BancaExaminadora
+    
+    # Carregar apenas a redação pedida do prompt 3 (IndexError se fora dos limites)
+    corpus = abrir_corpus("redacoes_prompt_3.csv")
+    print(f"📚 redacoes_prompt_3.csv: {len(corpus)} redações")
+    redacao = corpus.redacao(idx_redacao)
     
-    redacao_texto = processar_essay(row['essay'])
+    redacao_texto = redacao['texto']
     
     # Obter tema e textos de apoio do prompt 3
     tema, textos_apoio = obter_textos_apoio(3)
@@ -0,0 +1,24 @@
+"""
+Configuração comum dos testes
+
+Os testes importam os módulos a partir da raiz do repositório
+(avaliacao_automatica, analisar_metricas) e desligam a telemetria do CrewAI
+para os que o importam. A banca usa sempre o LLM simulado: nenhum teste chama
+a API.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+# Sem a pergunta interativa sobre traces na primeira execução de uma crew
+os.environ.setdefault("CREWAI_TESTING", "true")
+os.environ["MODEL"] = "simulado"
@@ -0,0 +1,126 @@
+"""Métricas vetorizadas (QWK contra o scikit-learn) e leitura dos resultados"""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import analisar_metricas as am  # noqa: E402
+
+
+NOTAS = np.array([0, 40, 80, 120, 160, 200])
+
+
+def _notas(gerador, n):
+    """Notas reais e preditas (n, 5) com erros de até dois níveis"""
+    reais = gerador.choice(NOTAS, size=(n, 5))
+    preditas = np.clip(reais + gerador.integers(-2, 3, size=(n, 5)) * 40, 0, 200)
+    return reais, preditas
+
+
+@pytest.mark.parametrize("semente, n", [(0, 50), (1, 7), (2, 400)])
+def test_qwk_igual_ao_scikit_learn(semente, n):
+    metrics = pytest.importorskip("sklearn.metrics")
+    reais, preditas = _notas(np.random.default_rng(semente), n)
+
+    qwk = am.calcular_metricas(reais, preditas)['QWK']
+
+    esperado = [metrics.cohen_kappa_score(reais.sum(axis=1) // 40, preditas.sum(axis=1) // 40, weights='quadratic')]
+    esperado += [
+        metrics.cohen_kappa_score(reais[:, i] // 40, preditas[:, i] // 40, weights='quadratic')
+        for i in range(5)
+    ]
+    np.testing.assert_allclose(qwk, esperado, rtol=1e-12, atol=1e-12)
+
+
+def test_qwk_com_niveis_ausentes_igual_ao_scikit_learn():
+    metrics = pytest.importorskip("sklearn.metrics")
+    # Só 0, 120 e 200 aparecem: as posições contam apenas os níveis presentes
+    reais = np.array([[0] * 5, [120] * 5, [200] * 5, [120] * 5])
+    preditas = np.array([[120] * 5, [120] * 5, [200] * 5, [0] * 5])
+
+    qwk = am.calcular_metricas(reais, preditas)['QWK'][1]
+    assert qwk == pytest.approx(metrics.cohen_kappa_score(reais[:, 0], preditas[:, 0], weights='quadratic'))
+
+
+def test_qwk_indefinido_sem_variacao():
+    reais = np.full((5, 5), 120)
+    assert np.isnan(am.calcular_metricas(reais, reais)['QWK']).all()
+
+
+def test_demais_metricas():
+    reais = np.array([[120] * 5, [160] * 5])
+    preditas = np.array([[120] * 5, [80] * 5])
+
+    metricas = am.calcular_metricas(reais, preditas)
+
+    np.testing.assert_allclose(metricas['MAE'], [200, 40, 40, 40, 40, 40])
+    np.testing.assert_allclose(metricas['RMSE'], [np.sqrt(400 ** 2 / 2)] + [np.sqrt(80 ** 2 / 2)] * 5)
+    np.testing.assert_allclose(metricas['Acurácia_Exata'], [0.5] * 6)
+    np.testing.assert_allclose(metricas['Acurácia_Adjacente'], [0.5] * 6)
+
+
+def _registro(indice, reais, preditas, status='sucesso'):
+    return {
+        'prompt_id': 3,
+        'redacao_index': indice,
+        'status': status,
+        'nota_real': sum(nota or 0 for nota in reais),
+        'competencias_reais': reais,
+        'avaliacao_sistema': {
+            'competencias': {f'competencia_{i}': {'nota': nota} for i, nota in enumerate(preditas, 1)},
+        },
+    }
+
+
+def test_matrizes_ignoram_registros_incompletos():
+    resultados = [
+        _registro(0, [120] * 5, [160] * 5),
+        _registro(1, [120, 120, None, 120, 120], [160] * 5),
+        _registro(2, [120] * 5, [160, None, 160, 160, 160]),
+        _registro(3, [120] * 5, [160] * 5, status='erro'),
+        _registro(4, [80] * 5, [40] * 5),
+    ]
+    indices, reais, preditas = am.matrizes_notas(resultados)
+    assert indices.tolist() == [0, 4]
+    assert reais.tolist() == [[120] * 5, [80] * 5]
+    assert preditas.tolist() == [[160] * 5, [40] * 5]
+
+
+def test_tabela_colunar_e_json_dao_as_mesmas_matrizes():
+    pytest.importorskip("pyarrow")
+    from avaliacao_automatica.resultados_colunares import COLUNAS_NOTAS, tabela_resultados
+
+    resultados = [
+        _registro(0, [120] * 5, [160] * 5),
+        _registro(1, [120, 120, None, 120, 120], [160] * 5),
+        _registro(2, [120] * 5, [160, None, 160, 160, 160]),
+        _registro(3, [40, 80, 120, 160, 200], [200, 160, 120, 80, 40]),
+    ]
+    do_json = am.matrizes_notas(resultados, com_prompt=True)
+    da_tabela = am.matrizes_da_tabela(tabela_resultados(resultados).select(list(COLUNAS_NOTAS)), com_prompt=True)
+    for a, b in zip(do_json, da_tabela):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_analise_nao_grava_tabela_sem_pedido(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.delenv("RESULTADOS_COLUNARES", raising=False)
+    arquivo = tmp_path / "resultados_prompt3_rag.json"
+    arquivo.write_text(json.dumps([_registro(0, [120] * 5, [160] * 5)]), encoding='utf-8')
+
+    total, indices, _, _ = am.carregar_matrizes(arquivo)
+    assert (total, indices.tolist()) == (1, [0])
+    assert not arquivo.with_suffix('.parquet').exists()
+
+    am.carregar_matrizes(arquivo, gravar_colunar=True)
+    assert arquivo.with_suffix('.parquet').exists()
+
+
+@pytest.mark.parametrize("conteudo", ['{"a": 1}', '["x"]', 'não é JSON'])
+def test_arquivo_que_nao_e_de_resultados_e_rejeitado(tmp_path, conteudo):
+    arquivo = tmp_path / "resultado_avaliacao_worker1.json"
+    arquivo.write_text(conteudo, encoding='utf-8')
+    with pytest.raises(ValueError, match="resultado_avaliacao_worker1.json"):
+        am.carregar_resultados(arquivo)
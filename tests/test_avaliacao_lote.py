@@ -0,0 +1,79 @@
+"""Avaliação em lote: itens inválidos e reavaliação individual com retentativas"""
+
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from avaliacao_automatica.llm_simulado import LLMSimulado  # noqa: E402
+
+
+REDACAO = "A educação transforma a sociedade. " * 30
+
+
+class LLMLoteDefeituoso(LLMSimulado):
+    """LLM simulado cujas respostas em lote trazem notas inválidas para algumas redações"""
+
+    def __init__(self, notas_invalidas):
+        super().__init__()
+        self.notas_invalidas = notas_invalidas
+
+    def _resposta_lote(self, prompt, gerador):
+        avaliacoes = json.loads(super()._resposta_lote(prompt, gerador))
+        for avaliacao in avaliacoes:
+            if avaliacao["redacao_id"] in self.notas_invalidas:
+                avaliacao["nota"] = self.notas_invalidas[avaliacao["redacao_id"]]
+        return json.dumps(avaliacoes)
+
+
+def test_item_invalido_nao_descarta_o_lote(tmp_path, monkeypatch):
+    from avaliacao_automatica.crew import BancaExaminadora
+
+    monkeypatch.chdir(tmp_path)
+    banca = BancaExaminadora()
+    banca.usar_llm(LLMLoteDefeituoso({"2": None, "3": True}))
+    banca.tamanho_lote = 4
+
+    avaliacoes = banca.avaliar_lote([(i, f"{REDACAO} {i}") for i in range(1, 5)], "Tema X", modo_rag=False)
+
+    # Só as redações com nota inválida ficam de fora (para a reavaliação individual)
+    assert sorted(avaliacoes) == ["1", "4"]
+    for avaliacao in avaliacoes.values():
+        assert avaliacao["lote"] == {"tamanho": 4}
+        assert avaliacao["modo_avaliacao"] == "baseline"
+
+
+class BancaSemLote:
+    """Banca cujo lote não resolve nenhuma redação"""
+
+    metricas_execucao = None
+
+    def avaliar_lote(self, redacoes, **argumentos):
+        return {}
+
+
+def test_reavaliacao_individual_usa_as_retentativas(monkeypatch):
+    import processar_experimento as pe
+
+    chamadas = []
+
+    def avaliar_redacao_completa(banca, **argumentos):
+        chamadas.append(argumentos['idx_redacao'])
+        # Cada redação falha na primeira tentativa
+        status = 'sucesso' if chamadas.count(argumentos['idx_redacao']) > 1 else 'erro'
+        return {"redacao_index": argumentos['idx_redacao'], "status": status}
+
+    monkeypatch.setattr(pe, "avaliar_redacao_completa", avaliar_redacao_completa)
+    redacoes = [
+        {"idx": idx, "texto": REDACAO, "nota_real": 600, "competencias_reais": [120] * 5}
+        for idx in (7, 8)
+    ]
+
+    resultados = pe.avaliar_lote_completo(BancaSemLote(), redacoes, "Tema X", "", 3, False, retentativas=1)
+
+    assert [(r["redacao_index"], r["status"], r.get("tentativas")) for r in resultados] == [
+        (7, "sucesso", 2),
+        (8, "sucesso", 2),
+    ]
+    assert chamadas == [7, 7, 8, 8]
@@ -0,0 +1,72 @@
+"""Execução rápida (uma repetição) da suíte de benchmarks e da comparação de relatórios"""
+
+import importlib
+import json
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def benchmarks(monkeypatch):
+    # O módulo fixa MODEL=simulado ao ser importado; o monkeypatch restaura o valor
+    monkeypatch.setenv("MODEL", "simulado")
+    return importlib.import_module("benchmark_pipeline")
+
+
+def _main(benchmarks, monkeypatch, *argumentos):
+    monkeypatch.setattr(sys, "argv", ["benchmark_pipeline.py", *argumentos])
+    return benchmarks.main()
+
+
+def test_listar_mostra_os_benchmarks_registrados(benchmarks, monkeypatch, capsys):
+    assert _main(benchmarks, monkeypatch, "--listar") == 0
+    assert capsys.readouterr().out.split() == list(benchmarks.BENCHMARKS)
+    assert {nome.split(".")[0] for nome in benchmarks.BENCHMARKS} >= {
+        "manual", "banca", "essay", "json", "registro", "metricas", "e2e", "importacao",
+    }
+
+
+def test_executa_benchmarks_e_grava_relatorio(benchmarks, monkeypatch, tmp_path):
+    saida = tmp_path / "atual.json"
+
+    assert _main(benchmarks, monkeypatch, "--apenas", "json", "registro.exportar_10",
+                 "--repeticoes", "1", "--saida", str(saida)) == 0
+
+    relatorio = json.loads(saida.read_text(encoding='utf-8'))
+    assert relatorio["erros"] == {}
+    # --apenas filtra por prefixo
+    assert sorted(relatorio["resultados"]) == [
+        "json.extrair_saidas_grandes", "json.extrair_saidas_truncadas",
+        "registro.exportar_10", "registro.exportar_100", "registro.exportar_1000",
+    ]
+    for estatisticas in relatorio["resultados"].values():
+        assert estatisticas["repeticoes"] == 1
+        assert estatisticas["min_s"] <= estatisticas["mediana_s"] <= estatisticas["max_s"]
+    assert set(relatorio["metadados"]) >= {"data", "commit", "python", "cpus"}
+    # Os diretórios temporários dos benchmarks são removidos ao final
+    assert not any(diretorio.exists() for diretorio in benchmarks._TEMPORARIOS)
+
+
+def test_erro_de_um_benchmark_nao_interrompe_os_demais(benchmarks, monkeypatch):
+    def _falha():
+        raise RuntimeError("preparo quebrado")
+
+    monkeypatch.setitem(benchmarks.BENCHMARKS, "teste.falha", {"preparo": _falha, "repeticoes": None})
+
+    relatorio = benchmarks.executar_benchmarks(["teste", "json.extrair_saidas_grandes"], 1)
+
+    assert relatorio["erros"] == {"teste.falha": "RuntimeError: preparo quebrado"}
+    assert list(relatorio["resultados"]) == ["json.extrair_saidas_grandes"]
+
+
+def test_comparar_relatorios(benchmarks, monkeypatch, tmp_path, capsys):
+    antes, depois = tmp_path / "antes.json", tmp_path / "depois.json"
+    antes.write_text(json.dumps({"resultados": {"a": {"mediana_s": 0.010}, "b": {"mediana_s": 0.5}}}))
+    depois.write_text(json.dumps({"resultados": {"a": {"mediana_s": 0.015}, "c": {"mediana_s": 0.2}}}))
+
+    assert _main(benchmarks, monkeypatch, "--comparar", str(antes), str(depois)) == 0
+
+    linhas = {linha.split()[0]: linha for linha in capsys.readouterr().out.splitlines()[1:]}
+    assert linhas["a"].split()[1:] == ["10.00", "15.00", "+50.0%"]
+    assert "—" in linhas["b"] and "—" in linhas["c"]
@@ -0,0 +1,88 @@
+"""Cache de respostas do LLM: acertos, remoção e respostas rejeitadas pela tarefa"""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.llms.base_llm import BaseLLM  # noqa: E402
+from crewai.tasks.task_output import TaskOutput  # noqa: E402
+
+from avaliacao_automatica.cache_llm import CacheRespostas, LLMComCache  # noqa: E402
+from avaliacao_automatica.saidas_estruturadas import AvaliacaoCompetencia, guardrail_saida  # noqa: E402
+
+
+class LLMRoteiro(BaseLLM):
+    """Devolve as respostas do roteiro, em ordem, e conta as chamadas"""
+
+    def __init__(self, respostas):
+        super().__init__(model="roteiro", temperature=0.0)
+        self.respostas = list(respostas)
+        self.chamadas = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        self.chamadas += 1
+        return self.respostas.pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheRespostas(tmp_path / "respostas.sqlite3")
+
+
+def test_prompt_repetido_vem_do_cache(cache):
+    real = LLMRoteiro(["primeira", "segunda"])
+    llm = LLMComCache(real, cache)
+
+    assert llm.call("prompt") == "primeira"
+    assert not llm.ultima_chamada_do_cache()
+    assert llm.call("prompt") == "primeira"
+    assert llm.ultima_chamada_do_cache()
+    assert real.chamadas == 1
+    assert llm.call("outro prompt") == "segunda"
+
+
+def test_resposta_descartada_e_pedida_de_novo(cache):
+    real = LLMRoteiro(["ruim", "boa"])
+    llm = LLMComCache(real, cache)
+    llm.call("prompt")
+    llm.call("prompt")  # acerto do cache: é esta resposta que sai
+
+    llm.descartar_ultima_resposta()
+
+    assert llm.call("prompt") == "boa"
+    assert real.chamadas == 2
+    # A nova resposta fica no cache
+    assert llm.call("prompt") == "boa" and llm.ultima_chamada_do_cache()
+
+
+def test_guardrail_rejeitado_tira_a_resposta_do_cache(cache):
+    real = LLMRoteiro(['{"competencia": 1, "nota": 1000}', '{"competencia": 1, "nota": 160}'])
+    llm = LLMComCache(real, cache)
+    guardrail = guardrail_saida(AvaliacaoCompetencia, ao_rejeitar=llm.descartar_ultima_resposta, competencia=1)
+
+    def executar_tarefa():
+        resposta = llm.call("avalie a competência 1")
+        return guardrail(TaskOutput(description="", agent="avaliador", name="tarefa_competencia1", raw=resposta))
+
+    valida, _ = executar_tarefa()
+    assert not valida
+
+    # Nova tentativa da tarefa, com o mesmo prompt: a resposta inválida não volta do cache
+    valida, saida = executar_tarefa()
+    assert valida and saida.pydantic.nota == 160
+    assert real.chamadas == 2
+
+
+def test_banca_descarta_atraves_da_cadeia_de_llms(cache, tmp_path, monkeypatch):
+    from avaliacao_automatica.crew import BancaExaminadora
+
+    monkeypatch.chdir(tmp_path)
+    real = LLMRoteiro(["ruim", "boa"])
+    banca = BancaExaminadora()
+    banca.usar_llm(LLMComCache(real, cache))
+    banca._iniciar_medicao()  # envolve o LLM num LLMInstrumentado
+
+    assert banca.llm.call("prompt") == "ruim"
+    banca._descartar_resposta_em_cache()
+    assert banca.llm.call("prompt") == "boa"
@@ -0,0 +1,91 @@
+"""Chave do checkpoint por tarefa, retomada e compactação do arquivo"""
+
+import json
+
+from avaliacao_automatica.checkpoint_tarefas import (
+    TAREFA_CONSOLIDACAO,
+    CheckpointTarefas,
+    assinatura_execucao,
+    chave_redacao,
+)
+
+
+SAIDA_C1 = '{"competencia": 1, "nota": 160, "justificativa": "ok"}'
+SAIDA_C2 = '{"competencia": 2, "nota": 120, "justificativa": "ok"}'
+
+
+def _linhas(caminho):
+    return [json.loads(linha) for linha in caminho.read_text(encoding='utf-8').splitlines() if linha.strip()]
+
+
+def test_chave_depende_da_execucao():
+    execucao = assinatura_execucao("gemini-2.5-flash", "LLM temperature=0", "abc")
+    base = chave_redacao("tema", "texto", execucao)
+
+    assert base == chave_redacao("tema", "texto", execucao)
+    assert base != chave_redacao("tema", "outro texto", execucao)
+    assert base != chave_redacao("outro tema", "texto", execucao)
+    for outra in (
+        assinatura_execucao("simulado", "LLM temperature=0", "abc"),
+        assinatura_execucao("gemini-2.5-flash", "LLMSimulado", "abc"),
+        assinatura_execucao("gemini-2.5-flash", "LLM temperature=0", "def"),
+    ):
+        assert base != chave_redacao("tema", "texto", outra)
+
+
+def test_retomada_reaproveita_saidas_validas(tmp_path):
+    caminho = tmp_path / "tarefas.jsonl"
+    chave = chave_redacao("tema", "texto", assinatura_execucao("modelo", "backend", "t"))
+
+    checkpoint = CheckpointTarefas(caminho)
+    assert checkpoint.registrar(chave, "baseline", "tarefa_competencia_1", SAIDA_C1)
+    assert checkpoint.registrar(chave, "baseline", "tarefa_competencia_2", SAIDA_C2)
+    # Saídas sem nota interpretável (ou fora da escala) não são gravadas
+    assert not checkpoint.registrar(chave, "baseline", "tarefa_competencia_3", "sem JSON")
+    assert not checkpoint.registrar(chave, "baseline", "tarefa_competencia_4", '{"nota": 1000}')
+    assert not checkpoint.registrar(chave, "baseline", TAREFA_CONSOLIDACAO, '{"competencia_1": 160}')
+
+    # Nova execução (novo processo): só as tarefas válidas voltam
+    retomado = CheckpointTarefas(caminho)
+    assert retomado.obter(chave, "baseline") == {
+        "tarefa_competencia_1": SAIDA_C1,
+        "tarefa_competencia_2": SAIDA_C2,
+    }
+    assert retomado.obter(chave, "com_rag") == {}
+    assert retomado.estatisticas() == {"gravadas": 0, "reaproveitadas": 2}
+
+
+def test_outra_execucao_nao_reaproveita_saidas(tmp_path):
+    caminho = tmp_path / "tarefas.jsonl"
+    real = chave_redacao("tema", "texto", assinatura_execucao("gemini-2.5-flash", "LLM", "t"))
+    simulada = chave_redacao("tema", "texto", assinatura_execucao("simulado", "LLMSimulado", "t"))
+
+    CheckpointTarefas(caminho).registrar(simulada, "baseline", "tarefa_competencia_1", SAIDA_C1)
+    assert CheckpointTarefas(caminho).obter(real, "baseline") == {}
+
+
+def test_redacao_concluida_sai_do_arquivo_na_compactacao(tmp_path):
+    caminho = tmp_path / "tarefas.jsonl"
+    concluida = chave_redacao("tema", "texto 1")
+    pendente = chave_redacao("tema", "texto 2")
+
+    checkpoint = CheckpointTarefas(caminho)
+    checkpoint.registrar(concluida, "baseline", "tarefa_competencia_1", SAIDA_C1)
+    checkpoint.registrar(concluida, "baseline", "tarefa_competencia_2", SAIDA_C2)
+    checkpoint.registrar(pendente, "baseline", "tarefa_competencia_1", SAIDA_C1)
+    checkpoint.liberar(concluida, "baseline")
+    assert checkpoint.obter(concluida, "baseline") == {}
+    assert len(_linhas(caminho)) == 4
+
+    # A próxima leitura compacta: só a saída da redação pendente permanece
+    retomado = CheckpointTarefas(caminho)
+    assert retomado.obter(pendente, "baseline") == {"tarefa_competencia_1": SAIDA_C1}
+    assert retomado.obter(concluida, "baseline") == {}
+    assert [(item["redacao"], item["tarefa"]) for item in _linhas(caminho)] == [
+        (pendente, "tarefa_competencia_1"),
+    ]
+
+    # Arquivo já compacto não é regravado
+    conteudo = caminho.read_bytes()
+    CheckpointTarefas(caminho).obter(pendente, "baseline")
+    assert caminho.read_bytes() == conteudo
@@ -0,0 +1,114 @@
+"""Corpus compilado contra a leitura direta do CSV"""
+
+import ast
+import csv
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from avaliacao_automatica import corpus  # noqa: E402
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def cache_temporario(tmp_path, monkeypatch):
+    """Compilados em diretório temporário e memo vazio em cada teste"""
+    monkeypatch.setattr(corpus, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.delenv("CORPUS_COMPILADO", raising=False)
+    corpus._memo.clear()
+    yield
+    corpus._memo.clear()
+
+
+def _escrever_csv(caminho, linhas):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['prompt', 'title', 'essay', 'competence', 'score'])
+        escritor.writerows(linhas)
+    return caminho
+
+
+def _redacoes_do_csv(caminho):
+    """Leitura direta do CSV, como antes do corpus compilado"""
+    redacoes = []
+    for idx, linha in pd.read_csv(caminho).iterrows():
+        paragrafos = [str(paragrafo) for paragrafo in ast.literal_eval(linha['essay'])]
+        redacoes.append({
+            "idx": idx,
+            "texto": "\n\n".join(paragrafos),
+            "paragrafos": paragrafos,
+            "competencias": [int(nota) for nota in ast.literal_eval(linha['competence'])],
+            "nota": int(linha['score']),
+        })
+    return redacoes
+
+
+def _campos(redacoes):
+    return [
+        {campo: redacao[campo] for campo in ("idx", "texto", "paragrafos", "competencias", "nota")}
+        for redacao in redacoes
+    ]
+
+
+@pytest.mark.parametrize("nome", ["redacoes_prompt_3.csv", "redacoes_prompt_6.csv"])
+def test_compilado_igual_ao_csv(nome):
+    caminho = RAIZ / nome
+    if not caminho.exists():
+        pytest.skip(f"{nome} ausente")
+
+    compilado = corpus.abrir_corpus(caminho)
+    assert compilado.compilado
+
+    esperadas = _redacoes_do_csv(caminho)
+    assert len(compilado) == len(esperadas)
+    assert _campos(compilado.iterar(tamanho_bloco=7)) == _campos(esperadas)
+    # Leitura sem compilado (CSV em blocos) dá o mesmo resultado
+    assert list(compilado.iterar()) == list(corpus.CorpusRedacoes(caminho).iterar())
+
+
+def test_ignorar_e_acesso_por_indice(tmp_path):
+    caminho = _escrever_csv(tmp_path / "redacoes.csv", [
+        [1, f"Título {i}", repr([f"Parágrafo {i}.1", f"Parágrafo {i}.2"]), repr([40 * (i % 6)] * 5), 200 * (i % 6)]
+        for i in range(12)
+    ])
+    compilado = corpus.abrir_corpus(caminho)
+    direto = corpus.CorpusRedacoes(caminho)
+
+    ignorar = {0, 3, 4, 11}
+    assert [redacao['idx'] for redacao in compilado.iterar(ignorar, tamanho_bloco=5)] == [
+        i for i in range(12) if i not in ignorar
+    ]
+    assert list(compilado.iterar(ignorar)) == list(direto.iterar(ignorar))
+    assert compilado.redacao(5) == direto.redacao(5)
+    assert compilado.redacao(5)['texto'] == "Parágrafo 5.1\n\nParágrafo 5.2"
+    assert compilado.coluna('titulo') == direto.coluna('titulo')
+    with pytest.raises(IndexError):
+        compilado.redacao(12)
+
+
+def test_csv_alterado_gera_nova_compilacao(tmp_path):
+    caminho = _escrever_csv(tmp_path / "redacoes.csv", [[1, "A", repr(["um"]), repr([40] * 5), 200]])
+    assert corpus.abrir_corpus(caminho).coluna('nota') == [200]
+    assert corpus.status_cache([caminho]) == {caminho: "compilado"}
+
+    _escrever_csv(caminho, [[1, "A", repr(["um"]), repr([80] * 5), 400], [2, "B", repr(["dois"]), repr([0] * 5), 0]])
+    atualizado = corpus.abrir_corpus(caminho)
+    assert atualizado.coluna('nota') == [400, 0]
+    # O compilado antigo é removido
+    assert len(list(corpus.CACHE_DIR.glob("*.arrow"))) == 1
+
+
+def test_campos_invalidos_como_na_leitura_direta(tmp_path):
+    caminho = _escrever_csv(tmp_path / "redacoes.csv", [
+        ["", "", "texto solto, não é lista", "[sem notas", 520],
+    ])
+    compilado = corpus.abrir_corpus(caminho).redacao(0)
+    assert compilado == corpus.CorpusRedacoes(caminho).redacao(0)
+    assert compilado['paragrafos'] == ["texto solto, não é lista"]
+    assert compilado['competencias'] == []
+    assert compilado['tema_id'] is None
@@ -0,0 +1,213 @@
+"""Extrator tolerante de JSON, ajuste de notas e validação da consolidação"""
+
+import math
+
+import pytest
+
+from avaliacao_automatica.extracao_json import (
+    ajustar_nota,
+    extrair_json_tolerante,
+    validar_consolidacao,
+)
+
+
+# ============================================================================
+# EXTRAÇÃO
+# ============================================================================
+
+def test_extrai_objeto_com_texto_e_markdown_ao_redor():
+    texto = 'Segue a avaliação:\n```json\n{"competencia": 1, "nota": 160}\n```\nObrigado.'
+    assert extrair_json_tolerante(texto) == {"competencia": 1, "nota": 160}
+
+
+def test_corrige_virgulas_sobrando_quebras_de_linha_e_literais_python():
+    texto = '{"nota": 120, "justificativa": "linha 1\nlinha 2", "completa": True, "erro": None,}'
+    assert extrair_json_tolerante(texto) == {
+        "nota": 120,
+        "justificativa": "linha 1\nlinha 2",
+        "completa": True,
+        "erro": None,
+    }
+
+
+def test_ignora_chaves_citadas_antes_do_objeto():
+    texto = 'Use o formato {nota} pedido. {"nota": 80}'
+    assert extrair_json_tolerante(texto) == {"nota": 80}
+
+
+def test_saida_truncada_descarta_numero_incompleto():
+    # "16" é o começo de 160: o item cortado não é aproveitado
+    dados = extrair_json_tolerante('{"competencia": 2, "justificativa": "ok", "nota": 16')
+    assert dados == {"competencia": 2, "justificativa": "ok"}
+
+
+def test_saida_truncada_dentro_de_string_fecha_a_string():
+    dados = extrair_json_tolerante('{"nota": 200, "justificativa": "texto cortado')
+    assert dados == {"nota": 200, "justificativa": "texto cortado"}
+
+
+def test_sem_json_retorna_none():
+    assert extrair_json_tolerante("nenhum objeto aqui") is None
+    assert extrair_json_tolerante(None) is None
+
+
+def test_extrai_array():
+    assert extrair_json_tolerante('itens: [1, 2, 3,]', abertura='[') == [1, 2, 3]
+
+
+# ============================================================================
+# AJUSTE DE NOTAS
+# ============================================================================
+
+@pytest.mark.parametrize("nota, esperada", [
+    (160, 160),
+    (155, 160),
+    (130, 120),
+    (210, 200),
+    (-10, 0),
+    (10, 0),
+    (80.0, 80),
+    ("160", 160),
+    ("160 pontos", 160),
+    ("120,0", 120),
+    ("nota: 40.", 40),
+])
+def test_ajusta_notas_proximas_da_escala(nota, esperada):
+    assert ajustar_nota(nota) == esperada
+
+
+@pytest.mark.parametrize("nota", [1000, 500, 211, -11, "1.000", "1,000", "1.000,5", math.nan, math.inf, "sem nota"])
+def test_rejeita_notas_fora_da_escala(nota):
+    with pytest.raises(ValueError):
+        ajustar_nota(nota)
+
+
+@pytest.mark.parametrize("nota", [20, 100, 140, 145, -20, 220, "100"])
+def test_rejeita_pontos_medios_ambiguos(nota):
+    # A meio caminho (ou quase) entre duas notas válidas: a tarefa é reperguntada
+    with pytest.raises(ValueError):
+        ajustar_nota(nota)
+
+
+@pytest.mark.parametrize("nota", [True, False, None, [160], {"nota": 160}])
+def test_rejeita_valores_nao_numericos(nota):
+    with pytest.raises(ValueError, match="sem valor numérico"):
+        ajustar_nota(nota)
+
+
+# ============================================================================
+# VALIDAÇÃO DA CONSOLIDAÇÃO
+# ============================================================================
+
+def _consolidacao(notas):
+    return {
+        "competencias": {
+            f"competencia_{i}": {"nota": nota, "justificativa": f"c{i}"}
+            for i, nota in enumerate(notas, 1)
+        },
+        "nota_final": 999,
+    }
+
+
+def test_nota_final_recalculada_como_soma():
+    avaliacao, faltando = validar_consolidacao(_consolidacao([160, 120, 155, 200, 80]))
+    assert faltando == []
+    assert avaliacao["nota_final"] == 160 + 120 + 160 + 200 + 80
+    assert avaliacao["notas_ajustadas"] == [{"competencia": 3, "nota_original": 155, "nota_ajustada": 160}]
+    assert any("nota_final recalculada" in reparo for reparo in avaliacao["reparos"])
+
+
+def test_chaves_variantes_de_competencia():
+    dados = {"Competência 1": 40, "C2": {"nota": "80"}, "comp3": 120, "competencia-4": 160, "c_5": 200}
+    avaliacao, faltando = validar_consolidacao(dados)
+    assert faltando == []
+    assert [item["nota"] for item in avaliacao["competencias"].values()] == [40, 80, 120, 160, 200]
+
+
+def test_nota_fora_da_escala_conta_como_faltando():
+    avaliacao, faltando = validar_consolidacao(_consolidacao([160, 1000, 120, 120, 120]))
+    assert faltando == [2]
+    assert "competencia_2" not in avaliacao["competencias"]
+
+
+def test_nota_nula_ou_booleana_conta_como_faltando():
+    avaliacao, faltando = validar_consolidacao(_consolidacao([160, None, True, 120, 120]))
+    assert faltando == [2, 3]
+    assert sorted(avaliacao["competencias"]) == ["competencia_1", "competencia_4", "competencia_5"]
+
+
+def test_modo_da_execucao_prevalece_sobre_o_da_saida():
+    dados = {**_consolidacao([160] * 5), "modo_avaliacao": "com_rag"}
+    avaliacao, _ = validar_consolidacao(dados, modo_avaliacao="baseline")
+    assert avaliacao["modo_avaliacao"] == "baseline"
+    assert "modo_avaliacao corrigido (com_rag -> baseline)" in avaliacao["reparos"]
+
+    # Sem o modo da execução, vale o da saída
+    assert validar_consolidacao(dados)[0]["modo_avaliacao"] == "com_rag"
+
+
+def test_recupera_notas_citadas_no_texto_bruto():
+    texto = 'competencia_1 "nota": 120 ... Competência 2: {"nota": 80} ... competencia_3 nota: 1000'
+    avaliacao, faltando = validar_consolidacao(None, texto)
+    assert avaliacao["competencias"]["competencia_1"]["nota"] == 120
+    assert avaliacao["competencias"]["competencia_2"]["nota"] == 80
+    # "1000" não é lido como "100" (nem ajustado para 200)
+    assert faltando == [3, 4, 5]
+
+
+# ============================================================================
+# SAÍDAS ESTRUTURADAS
+# ============================================================================
+
+def test_saida_de_competencia_valida_nota_e_campos_fixos():
+    pytest.importorskip("crewai")
+    from avaliacao_automatica.saidas_estruturadas import AvaliacaoCompetencia, validar_saida
+
+    instancia, erro = validar_saida('{"nota": 155, "justificativa": "ok"}', AvaliacaoCompetencia, competencia=2)
+    assert erro == ""
+    assert (instancia.competencia, instancia.nota, instancia.nota_original) == (2, 160, 155)
+
+    instancia, erro = validar_saida('{"competencia": 3, "nota": 160}', AvaliacaoCompetencia, competencia=2)
+    assert instancia is None and "competencia" in erro
+
+    instancia, erro = validar_saida('{"competencia": 2, "nota": 1000}', AvaliacaoCompetencia, competencia=2)
+    assert instancia is None and "nota" in erro
+
+
+def test_conversor_local_aplica_campos_fixos_da_tarefa():
+    pytest.importorskip("crewai")
+    from crewai.utilities.converter import ConverterError
+
+    from avaliacao_automatica.saidas_estruturadas import AvaliacaoCompetencia, ConversorLocal
+
+    conversor_cls = ConversorLocal.com_fixos(competencia=4)
+
+    def converter(texto):
+        return conversor_cls(llm=None, text=texto, model=AvaliacaoCompetencia, instructions="").to_pydantic()
+
+    assert converter('{"nota": 80}').competencia == 4
+    assert isinstance(converter('{"competencia": 1, "nota": 80}'), ConverterError)
+    assert ConversorLocal.fixos == {}
+
+
+def test_consolidacao_valida_o_modo_da_execucao():
+    pytest.importorskip("crewai")
+    from avaliacao_automatica.saidas_estruturadas import AvaliacaoConsolidada, validar_saida
+
+    modo = {"atual": "baseline"}
+    texto = '{"modo_avaliacao": "%s", "competencias": {%s}}'
+    competencias = ", ".join(f'"competencia_{i}": {{"nota": 120}}' for i in range(1, 6))
+
+    instancia, erro = validar_saida(texto % ("com_rag", competencias), AvaliacaoConsolidada,
+                                    modo_avaliacao=lambda: modo["atual"])
+    assert instancia is None and "modo_avaliacao" in erro
+
+    # O modo é lido a cada validação (a mesma tarefa serve aos dois modos)
+    modo["atual"] = "com_rag"
+    instancia, erro = validar_saida(texto % ("com_rag", competencias), AvaliacaoConsolidada,
+                                    modo_avaliacao=lambda: modo["atual"])
+    assert erro == "" and instancia.modo_avaliacao == "com_rag"
+
+    instancia, _ = validar_saida('{"competencias": {%s}}' % competencias, AvaliacaoConsolidada,
+                                 modo_avaliacao=lambda: "baseline")
+    assert (instancia.modo_avaliacao, instancia.nota_final) == ("baseline", 600)
@@ -0,0 +1,76 @@
+"""Tokens e latência por tarefa com chamadas simultâneas no mesmo LLM"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.llms.base_llm import BaseLLM  # noqa: E402
+
+from avaliacao_automatica.instrumentacao import LLMInstrumentado, MedidorTarefas  # noqa: E402
+
+
+class ProvedorFalso(BaseLLM):
+    """Registra o uso de cada resposta e espera a outra chamada antes de devolvê-la"""
+
+    def __init__(self, usos, barreira=None):
+        super().__init__(model="falso", temperature=0.0)
+        self.usos = usos
+        self.barreira = barreira
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        self._track_token_usage_internal(self.usos[messages])
+        if self.barreira is not None:
+            # As duas chamadas registram o uso antes de qualquer uma retornar
+            self.barreira.wait(timeout=5)
+        return f"resposta de {messages}"
+
+
+def _tarefa(nome):
+    return SimpleNamespace(name=nome)
+
+
+def test_chamadas_simultaneas_recebem_o_proprio_uso():
+    usos = {
+        "a": {"prompt_tokens": 1500, "completion_tokens": 150, "successful_requests": 1},
+        "b": {"prompt_tokens": 500, "completion_tokens": 50, "successful_requests": 1},
+    }
+    provedor = ProvedorFalso(usos, threading.Barrier(2))
+    medidor = MedidorTarefas()
+    # Duas bancas (ex: modos RAG e baseline) sobre o mesmo LLM real
+    instrumentados = [LLMInstrumentado(provedor, medidor), LLMInstrumentado(provedor, medidor)]
+
+    threads = [
+        threading.Thread(target=llm.call, args=(prompt,), kwargs={"from_task": _tarefa(f"tarefa_{prompt}")})
+        for llm, prompt in zip(instrumentados, ("a", "b"))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    resumo = medidor.resumo()
+    for prompt, uso in usos.items():
+        metricas = resumo["tarefas"][f"tarefa_{prompt}"]
+        assert (metricas["prompt_tokens"], metricas["completion_tokens"]) == (
+            uso["prompt_tokens"], uso["completion_tokens"]
+        )
+        assert not metricas.get("tokens_estimados")
+
+    total = provedor.get_token_usage_summary()
+    assert resumo["total"]["prompt_tokens"] == total.prompt_tokens == 2000
+    assert resumo["total"]["completion_tokens"] == total.completion_tokens == 200
+
+
+def test_provedor_sem_uso_tem_tokens_estimados():
+    provedor = ProvedorFalso({"a": {}})
+    medidor = MedidorTarefas()
+
+    LLMInstrumentado(provedor, medidor).call("a", from_task=_tarefa("tarefa_a"))
+
+    metricas = medidor.resumo()["tarefas"]["tarefa_a"]
+    assert metricas.get("tokens_estimados")
+    assert metricas["prompt_tokens"] > 0 and metricas["completion_tokens"] > 0
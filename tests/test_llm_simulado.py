@@ -0,0 +1,52 @@
+"""Respostas do LLM simulado e avaliação simulada de ponta a ponta"""
+
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from avaliacao_automatica.llm_simulado import LLMSimulado  # noqa: E402
+
+
+REDACAO = "A educação transforma a sociedade. " * 30
+
+
+def _consolidacao(modo):
+    prompt = (
+        "Você recebeu as avaliações individuais das 5 competências de uma redação do ENEM.\n"
+        f"TEMA DA REDAÇÃO: Tema X\nMODO DE AVALIAÇÃO: {modo}\n"
+        '{"avaliacao_id": "UUID gerado", "modo_avaliacao": "com_rag ou baseline"}\n'
+        '{"competencia": 1, "nota": 160}'
+    )
+    return json.loads(LLMSimulado().call(prompt))
+
+
+@pytest.mark.parametrize("modo", ["com_rag", "baseline"])
+def test_consolidacao_informa_o_modo_do_prompt(modo):
+    consolidado = _consolidacao(modo)
+    assert consolidado["modo_avaliacao"] == modo
+    assert consolidado["tema"] == "Tema X"
+    assert consolidado["competencias"]["competencia_1"]["nota"] == 160
+
+
+def test_respostas_deterministicas():
+    prompt = 'Avalie a Competência III. {"competencia": 3, "nota": ...}'
+    assert LLMSimulado().call(prompt) == LLMSimulado().call(prompt)
+    assert json.loads(LLMSimulado().call(prompt))["competencia"] == 3
+
+
+def test_avaliacao_baseline_simulada_registra_baseline(tmp_path, monkeypatch):
+    from avaliacao_automatica.crew import BancaExaminadora
+
+    # O CrewAI grava o arquivo de saída da consolidação relativo ao diretório atual
+    monkeypatch.chdir(tmp_path)
+    banca = BancaExaminadora()
+    banca.usar_llm(LLMSimulado())
+
+    avaliacao = banca.avaliar_redacao(REDACAO, "Tema X", modo_rag=False)
+
+    assert avaliacao["modo_avaliacao"] == "baseline"
+    # A saída do Presidente foi aceita (sem consolidação local de reparo)
+    assert "consolidacao" not in avaliacao
+    assert avaliacao["nota_final"] == sum(item["nota"] for item in avaliacao["competencias"].values())
@@ -0,0 +1,110 @@
+"""Bootstrap pareado e teste de permutação pareado contra a reamostragem direta"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# teste_permutacao_pareado é acessado pelo módulo: importado pelo nome, o pytest
+# o coletaria como um teste
+from avaliacao_automatica import reamostragem  # noqa: E402
+from avaliacao_automatica.reamostragem import bootstrap_pareado  # noqa: E402
+
+
+def _media(somas, n):
+    """Métrica de teste: média de cada estatística"""
+    return {'media': somas / n}
+
+
+def _erros(semente=0, n=40):
+    gerador = np.random.default_rng(semente)
+    erros_a = gerador.integers(0, 5, size=(n, 2)).astype(np.float64) * 40
+    erros_b = erros_a + gerador.integers(0, 3, size=(n, 2)) * 40
+    return erros_a, erros_b
+
+
+def test_bootstrap_igual_a_reamostragem_direta():
+    erros_a, erros_b = _erros()
+    n = erros_a.shape[0]
+    reamostras = reamostragem.REAMOSTRAS_POR_LOTE  # um único lote
+
+    resultado = bootstrap_pareado(erros_a, erros_b, _media, reamostras, confianca=0.9, semente=7)
+
+    # Mesmo sorteio do lote: as mesmas redações para A e para B (pareado)
+    semente_lote = np.random.SeedSequence(7).spawn(1)[0]
+    sorteadas = np.random.default_rng(semente_lote).integers(0, n, size=(reamostras, n))
+    medias_a = erros_a[sorteadas].mean(axis=1)
+    medias_b = erros_b[sorteadas].mean(axis=1)
+
+    media = resultado['media']
+    np.testing.assert_allclose(media['a'], erros_a.mean(axis=0))
+    np.testing.assert_allclose(media['diferenca'], erros_a.mean(axis=0) - erros_b.mean(axis=0))
+    np.testing.assert_allclose(media['ic_a'], np.percentile(medias_a, [5, 95], axis=0).T)
+    np.testing.assert_allclose(media['ic_b'], np.percentile(medias_b, [5, 95], axis=0).T)
+    np.testing.assert_allclose(media['ic_diferenca'], np.percentile(medias_a - medias_b, [5, 95], axis=0).T)
+
+
+def test_bootstrap_reprodutivel_e_independente_dos_processos(monkeypatch):
+    erros_a, erros_b = _erros(1)
+    base = bootstrap_pareado(erros_a, erros_b, _media, 1200, semente=3, processos=1)
+
+    # Força a execução dos lotes em processos separados
+    monkeypatch.setattr(reamostragem, "VOLUME_MINIMO_PROCESSOS", 0)
+    paralelo = bootstrap_pareado(erros_a, erros_b, _media, 1200, semente=3, processos=2)
+
+    for chave, valor in base['media'].items():
+        np.testing.assert_allclose(paralelo['media'][chave], valor)
+
+
+def test_bootstrap_de_variantes_iguais_tem_diferenca_nula():
+    erros_a, _ = _erros(2)
+    resultado = bootstrap_pareado(erros_a, erros_a.copy(), _media, 300)
+    np.testing.assert_array_equal(resultado['media']['ic_diferenca'], np.zeros((2, 2)))
+
+
+def test_permutacao_igual_a_permutacao_direta():
+    erros_a, erros_b = _erros(3)
+    reamostras = reamostragem.REAMOSTRAS_POR_LOTE
+
+    resultado = reamostragem.teste_permutacao_pareado(erros_a, erros_b, _media, reamostras, semente=11)
+
+    semente_lote = np.random.SeedSequence(11).spawn(1)[0]
+    trocadas = np.random.default_rng(semente_lote).random((reamostras, erros_a.shape[0])) < 0.5
+    observada = erros_a.mean(axis=0) - erros_b.mean(axis=0)
+    extremas = 0
+    for troca in trocadas:
+        a = np.where(troca[:, None], erros_b, erros_a)
+        b = np.where(troca[:, None], erros_a, erros_b)
+        extremas += np.abs(a.mean(axis=0) - b.mean(axis=0)) >= np.abs(observada) - 1e-9
+
+    np.testing.assert_allclose(resultado['media']['diferenca'], observada)
+    np.testing.assert_allclose(resultado['media']['p_valor'], (1 + extremas) / (1 + reamostras))
+
+
+def test_permutacao_detecta_diferenca_e_aceita_igualdade():
+    erros_a, _ = _erros(4, n=60)
+    piores = erros_a + 80
+
+    diferentes = reamostragem.teste_permutacao_pareado(erros_a, piores, _media, 999)
+    np.testing.assert_allclose(diferentes['media']['p_valor'], 1 / 1000)
+
+    iguais = reamostragem.teste_permutacao_pareado(erros_a, erros_a.copy(), _media, 999)
+    np.testing.assert_allclose(iguais['media']['p_valor'], 1.0)
+
+
+def test_incerteza_das_metricas_do_relatorio():
+    am = pytest.importorskip("analisar_metricas")
+    gerador = np.random.default_rng(5)
+    reais = gerador.choice([0, 40, 80, 120, 160, 200], size=(30, 5))
+    preditas_a = np.clip(reais + gerador.integers(-1, 2, size=(30, 5)) * 40, 0, 200)
+    preditas_b = np.clip(reais + gerador.integers(-3, 4, size=(30, 5)) * 40, 0, 200)
+
+    incerteza = am.analisar_incerteza(reais, preditas_a, preditas_b, 400, semente=0, processos=1)
+
+    # Valores observados iguais aos de calcular_metricas
+    for nome, metrica in am.calcular_metricas(reais, preditas_a).items():
+        np.testing.assert_allclose(incerteza[nome]['a'], metrica)
+    for nome in am.METRICAS:
+        intervalo = incerteza[nome]['ic_diferenca']
+        assert intervalo.shape == (len(am.ESCALAS), 2)
+        assert (intervalo[:, 0] <= intervalo[:, 1]).all()
+        assert ((incerteza[nome]['p_valor'] > 0) & (incerteza[nome]['p_valor'] <= 1)).all()
@@ -41,19 +41,20 @@ def verificar_csv_estrutura():
     print("=" * 80)
     
     try:
-        import pandas as pd
+        from avaliacao_automatica.corpus import abrir_corpus
         
         for prompt_id, arquivo in [(3, "redacoes_prompt_3.csv"), (6, "redacoes_prompt_6.csv")]:
             print(f"\n📄 {arquivo}:")
             
-            df = pd.read_csv(arquivo)
+            # Compila o CSV na primeira vez; depois lê do cache em .cache/corpus
+            corpus = abrir_corpus(arquivo)
             
             # Verificar colunas
             colunas_esperadas = {'prompt', 'title', 'essay', 'competence', 'score'}
-            colunas_presentes = set(df.columns)
+            colunas_presentes = set(corpus.colunas_origem)
             
             if colunas_esperadas == colunas_presentes:
-                print(f"   ✅ Colunas corretas: {list(df.columns)}")
+                print(f"   ✅ Colunas corretas: {corpus.colunas_origem}")
             else:
                 print("   ❌ Colunas incorretas!")
                 print(f"      Esperado: {colunas_esperadas}")
@@ -61,24 +62,25 @@ def verificar_csv_estrutura():
                 return False
             
             # Verificar quantidade
-            print(f"   ✅ Quantidade de redações: {len(df)}")
+            print(f"   ✅ Quantidade de redações: {len(corpus)}")
             
             # Verificar prompt_id
-            prompts_unicos = df['prompt'].unique()
-            if len(prompts_unicos) == 1 and prompts_unicos[0] == prompt_id:
+            prompts_unicos = sorted(set(corpus.coluna('tema_id')), key=str)
+            if prompts_unicos == [prompt_id]:
                 print(f"   ✅ Prompt ID correto: {prompt_id}")
             else:
                 print(f"   ❌ Prompt ID incorreto: {prompts_unicos}")
                 return False
             
             # Verificar temas
-            temas_unicos = df['title'].nunique()
+            temas_unicos = len({titulo for titulo in corpus.coluna('titulo') if titulo is not None})
             print(f"   ℹ️  Temas únicos: {temas_unicos}")
             
             # Verificar notas
-            print(f"   ℹ️  Nota mínima: {df['score'].min()}")
-            print(f"   ℹ️  Nota máxima: {df['score'].max()}")
-            print(f"   ℹ️  Nota média: {df['score'].mean():.2f}")
+            notas = [nota for nota in corpus.coluna('nota') if nota is not None]
+            print(f"   ℹ️  Nota mínima: {min(notas)}")
+            print(f"   ℹ️  Nota máxima: {max(notas)}")
+            print(f"   ℹ️  Nota média: {sum(notas) / len(notas):.2f}")
         
         return True
         
@@ -219,6 +221,11 @@ def verificar_ambiente():
     
     import os
     
+    # LLM simulado (MODEL=simulado) roda offline, sem API Key
+    if os.environ.get("MODEL", "").split("/", 1)[0].lower() == "simulado":
+        print("🧪 MODEL=simulado: LLM local, API Key não necessária")
+        return True
+    
     # Verificar API Key do Gemini (prioritário para o experimento)
     gemini_keys = ["GEMINI_API_KEY", "GOOGLE_API_KEY"]
     